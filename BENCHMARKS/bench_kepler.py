@@ -0,0 +1,83 @@
+"""
+Camino analítico de dos cuerpos (SOURCES/kepler.py) frente al integrador
+numérico del motor nativo: tiempo de cada uno y error del analítico en
+los pasos del numérico (compare_kepler_numerical), en órbitas LEO,
+excéntrica, GEO e hiperbólica.
+
+Si el error de algún caso supera --tolerance-km / --tolerance-kms, lo
+marca y sale con código 1 (sirve de comprobación antes de confiar en
+el modo de motor "analytic").
+
+Uso (desde la raíz del proyecto):
+    python BENCHMARKS/bench_kepler.py
+    python BENCHMARKS/bench_kepler.py --days 5 --accuracy 1e-12
+"""
+from pathlib import Path
+import argparse
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from SOURCES.kepler import propagate_kepler  # noqa: E402
+from SOURCES.propagator import BODIES, compare_kepler_numerical, propagate_segment  # noqa: E402
+
+
+MU = BODIES["Earth"]["mu"]
+
+# Nombre -> estado inicial [km, km/s]
+CASES = {
+    "LEO":         [7000.0, 0.0, 0.0, 0.0, 7.546, 1.0],
+    "excéntrica":  [7000.0, 0.0, 0.0, 0.0, 9.8, 1.5],
+    "GEO":         [42164.0, 0.0, 0.0, 0.0, 3.0747, 0.0],
+    "hiperbólica": [7000.0, 0.0, 0.0, 0.0, 11.5, 0.5],
+}
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=float, default=1.0, help="duración de cada arco")
+    parser.add_argument("--accuracy", type=float, default=1e-13,
+                        help="precisión del integrador numérico de referencia")
+    parser.add_argument("--tolerance-km", type=float, default=1e-3)
+    parser.add_argument("--tolerance-kms", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    fm = {"mu": MU, "radius": BODIES["Earth"]["radius"], "j2": 0.0}
+    settings = {"integrator": "RungeKutta89", "init_step": 60.0, "accuracy": args.accuracy,
+                "min_step": 1e-3, "max_step": 300.0, "max_step_attempts": 50}
+    t1 = args.days * 86400.0
+
+    print(f"{'caso':12s} {'pasos':>7s} {'numérico':>10s} {'Kepler':>10s} "
+          f"{'err r [km]':>12s} {'err v [km/s]':>13s}")
+    failed = []
+    for name, state0 in CASES.items():
+        state0 = np.array(state0)
+        t_num, (times, _) = timed(propagate_segment, state0, 0.0, t1, fm, settings)
+        t_kep, _ = timed(propagate_kepler, state0, np.array(times), MU)
+        err = compare_kepler_numerical(state0, t1, fm, settings)
+
+        ok = err["max_pos_err_km"] <= args.tolerance_km and err["max_vel_err_kms"] <= args.tolerance_kms
+        if not ok:
+            failed.append(name)
+        print(f"{name:12s} {err['n_points']:7d} {t_num:9.3f}s {t_kep:9.4f}s "
+              f"{err['max_pos_err_km']:12.2e} {err['max_vel_err_kms']:13.2e} {'' if ok else '❌'}")
+
+    if failed:
+        print(f"❌ Error por encima de la tolerancia en: {', '.join(failed)}")
+        return 1
+    print(f"✅ Kepler dentro de la tolerancia ({args.tolerance_km} km, {args.tolerance_kms} km/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Benchmark de extremo a extremo con el GMAT simulado (BENCHMARKS/fake_gmat),
+sin GMAT instalado. Todo se hace en una carpeta temporal:
+
+1. Pipeline incremental (SOURCES/pipeline.py) con motor GMAT:
+   - en frío: todas las etapas;
+   - sin cambios: ninguna etapa;
+   - config nueva: fallo de caché (GMAT + parse + plots);
+   - vuelta a la config anterior: acierto de caché (sin GMAT ni plots).
+2. Concurrencia: Batch.run_batch con --jobs escenarios y cada nº de
+   procesos de --workers. "Sobrecoste" es lo que no es GMAT (total - run).
+3. Backends: --runs ejecuciones seguidas de run_gmat con GmatConsole
+   (arranca el motor cada vez) y con gmatpy (motor cargado una vez, ver
+   SOURCES/gmat_api.py).
+4. Lotes: los --jobs escenarios en un proceso, con K escenarios por
+   script para cada K de --packs (un arranque de GMAT por lote).
+
+Uso (desde la raíz del proyecto):
+    python BENCHMARKS/bench_pipeline_e2e.py
+    python BENCHMARKS/bench_pipeline_e2e.py --rows 1000000 --latency 2 --jobs 8 --workers 1 2 4
+    python BENCHMARKS/bench_pipeline_e2e.py --jobs 32 --packs 1 8 32
+
+Con --gmat se usa el GMAT que encuentre find_gmat en vez del simulado.
+"""
+from contextlib import redirect_stdout
+from pathlib import Path
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+FAKE_GMAT = ROOT / "BENCHMARKS" / "fake_gmat" / "GmatConsole.py"
+FAKE_GMATPY_DIR = FAKE_GMAT.parent
+
+sys.path.insert(0, str(ROOT))
+
+from synthetic import write_datos_guardados  # noqa: E402
+
+
+STAGES = ["transpile", "run", "parse", "plots"]
+
+# Misma misión con otro burn: otro script, otra entrada de caché
+ALT_CONFIG = {"IMPULSIVE BURN": {"Delta V Element 1": "0.2"}}
+
+
+def bench_pipeline(tmp: Path):
+    from SOURCES.cache import ResultCache
+    from SOURCES.pipeline import build_pipeline
+
+    datos = tmp / "datos_guardados.txt"
+    kwargs = dict(
+        engine="gmat",
+        data_file=datos,
+        report=tmp / "DefaultReportFile.txt",
+        plots_dir=tmp / "plots",
+        state_path=tmp / "pipeline_state.json",
+        cache=ResultCache(tmp / "cache"),
+        script_path=tmp / "demo.script",
+    )
+
+    steps = [
+        ("en frío", {}),
+        ("sin cambios", None),
+        ("config nueva", ALT_CONFIG),
+        ("config anterior (caché)", {}),
+    ]
+
+    print(f"{'pipeline':26s} {'total':>8s}" + "".join(f"{s:>11s}" for s in STAGES))
+    for label, overrides in steps:
+        if overrides is not None:
+            write_datos_guardados(datos, overrides)
+
+        t0 = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            results = build_pipeline(**kwargs).run()
+        total = time.perf_counter() - t0
+
+        seconds = {r["stage"]: r["seconds"] for r in results if r["ran"]}
+        cells = "".join(
+            f"{seconds[s]:10.3f}s" if s in seconds else f"{'-':>11s}" for s in STAGES
+        )
+        print(f"{label:26s} {total:7.3f}s{cells}")
+
+
+def scenario_files(tmp: Path, jobs: int) -> list:
+    """Escenarios distintos (otro ΔV cada uno)."""
+    files = []
+    for i in range(jobs):
+        dv = f"{0.05 + 0.01 * i:.3f}"
+        files.append(write_datos_guardados(
+            tmp / f"escenario_{i:03d}.txt", {"IMPULSIVE BURN": {"Delta V Element 1": dv}},
+        ))
+    return files
+
+
+def bench_batch(tmp: Path, jobs: int, workers_list: list, plots: bool):
+    from Batch import run_batch
+
+    files = scenario_files(tmp, jobs)
+
+    print()
+    print(f"{'procesos':>8s} {'total':>9s} {'escen./s':>9s} {'GMAT medio':>11s} "
+          f"{'sobrecoste':>11s} {'errores':>8s}")
+    for workers in workers_list:
+        with redirect_stdout(io.StringIO()):
+            summary = run_batch(files, tmp / f"batch_{workers}", workers=workers,
+                                engine="gmat", plots=plots)
+
+        ok = [s for s in summary["scenarios"] if s["status"] == "ok"]
+        run_s = statistics.mean(s["timings"]["run"] for s in ok) if ok else float("nan")
+        overhead = (statistics.mean(s["timings"]["total"] - s["timings"]["run"] for s in ok)
+                    if ok else float("nan"))
+        print(f"{workers:8d} {summary['total_s']:8.3f}s {jobs / summary['total_s']:9.2f} "
+              f"{run_s:10.3f}s {overhead:10.3f}s {summary['n_error']:8d}")
+        for s in summary["scenarios"]:
+            if s["status"] != "ok":
+                print("  ❌", s["name"], s["error"])
+
+
+def bench_pack(tmp: Path, jobs: int, packs: list):
+    from Batch import run_batch
+
+    files = scenario_files(tmp, jobs)
+
+    print()
+    print(f"{'lote':>6s} {'arranques':>10s} {'total':>9s} {'escen./s':>9s} {'errores':>8s}")
+    for pack in packs:
+        with redirect_stdout(io.StringIO()):
+            summary = run_batch(files, tmp / f"pack_{pack}", workers=1,
+                                engine="gmat", plots=False, pack=pack)
+        launches = -(-jobs // pack)
+        print(f"{pack:6d} {launches:10d} {summary['total_s']:8.3f}s "
+              f"{jobs / summary['total_s']:9.2f} {summary['n_error']:8d}")
+        for s in summary["scenarios"]:
+            if s["status"] != "ok":
+                print("  ❌", s["name"], s["error"])
+
+
+def bench_backends(tmp: Path, runs: int):
+    from SOURCES.GMAT_exec import run_gmat
+    from SOURCES.Transpiler import build_gmat_script, parse_gui_txt
+
+    script = tmp / "backends.script"
+    with redirect_stdout(io.StringIO()):
+        build_gmat_script(parse_gui_txt(write_datos_guardados(tmp / "backends.txt")), script)
+
+    print()
+    print(f"{'backend':12s} {'1ª ejecución':>13s} {'siguientes':>11s} {'total':>9s}")
+    previous = os.environ.get("AM1_GMAT_BACKEND")
+    try:
+        for label, backend in (("GmatConsole", "console"), ("gmatpy", "api")):
+            os.environ["AM1_GMAT_BACKEND"] = backend
+            times = []
+            for _ in range(runs):
+                t0 = time.perf_counter()
+                with redirect_stdout(io.StringIO()):
+                    run_gmat(script, tmp / f"report_{backend}.txt")
+                times.append(time.perf_counter() - t0)
+            rest = statistics.mean(times[1:]) if runs > 1 else float("nan")
+            print(f"{label:12s} {times[0]:12.3f}s {rest:10.3f}s {sum(times):8.3f}s")
+    finally:
+        if previous is None:
+            os.environ.pop("AM1_GMAT_BACKEND", None)
+        else:
+            os.environ["AM1_GMAT_BACKEND"] = previous
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000,
+                        help="filas del report del GMAT simulado")
+    parser.add_argument("--latency", type=float, default=0.5,
+                        help="arranque del GMAT simulado [s]")
+    parser.add_argument("--jobs", type=int, default=8, help="escenarios del batch")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--no-plots", action="store_true", help="batch sin PNG")
+    parser.add_argument("--runs", type=int, default=4,
+                        help="ejecuciones seguidas por backend (GmatConsole / gmatpy)")
+    parser.add_argument("--packs", type=int, nargs="+", default=[1, 4],
+                        help="escenarios por script en la prueba de lotes")
+    parser.add_argument("--gmat", action="store_true", help="usar el GMAT real")
+    args = parser.parse_args()
+
+    # Los subprocesos (GMAT simulado y procesos del batch) heredan el entorno
+    if not args.gmat:
+        os.environ["AM1_GMAT"] = str(FAKE_GMAT)
+        os.environ["AM1_GMATPY_PATH"] = str(FAKE_GMATPY_DIR)
+    # El pipeline y el batch se miden con GmatConsole; gmatpy, en bench_backends
+    os.environ.setdefault("AM1_GMAT_BACKEND", "console")
+    os.environ["AM1_FAKE_GMAT_ROWS"] = str(args.rows)
+    os.environ["AM1_FAKE_GMAT_LATENCY"] = str(args.latency)
+
+    from SOURCES.GMAT_exec import find_gmat
+    print("GMAT:", find_gmat())
+    print(f"{args.rows} filas por ejecución, {args.latency} s de arranque")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        bench_pipeline(tmp)
+        bench_batch(tmp, args.jobs, args.workers, plots=not args.no_plots)
+        bench_backends(tmp, args.runs)
+        bench_pack(tmp, args.jobs, args.packs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Benchmark del parser de reports: pandas (engine="python" + to_numeric)
+frente a SOURCES.report_parser.parse_report y su versión en paralelo.
+
+Uso (desde la raíz del proyecto):
+    python BENCHMARKS/bench_report_parser.py
+    python BENCHMARKS/bench_report_parser.py --rows 100000 1000000 10000000
+
+El camino antiguo solo se mide hasta --legacy-max-rows filas (con 10^7
+tarda minutos).
+"""
+from pathlib import Path
+import argparse
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from SOURCES.report_parser import parse_report, parse_report_parallel  # noqa: E402
+from synthetic import write_synthetic_report  # noqa: E402
+
+
+def legacy_load(path: Path) -> pd.DataFrame:
+    df = pd.read_csv(path, sep=r"\s+", engine="python")
+    return df.apply(pd.to_numeric, errors="coerce").dropna()
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=float, nargs="+", default=[1e5, 1e6])
+    parser.add_argument("--legacy-max-rows", type=float, default=1e6)
+    parser.add_argument("--workers", type=int, nargs="*", default=[2, 4],
+                        help="nº de procesos para parse_report_parallel")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (int(r) for r in args.rows):
+            path = Path(tmp) / f"report_{n}.txt"
+            write_synthetic_report(path, n)
+            size_mb = path.stat().st_size / 1e6
+
+            t_new, (_, data) = timed(parse_report, path)
+            assert data.shape == (n, 7), data.shape
+
+            line = f"{n:>10d} filas  {size_mb:8.1f} MB   nuevo {t_new:8.3f} s"
+            for w in args.workers:
+                t_par, (_, data_par) = timed(parse_report_parallel, path, w)
+                assert np.array_equal(data_par, data)
+                line += f"   {w} procs {t_par:7.3f} s"
+            if n <= args.legacy_max_rows:
+                t_old, df = timed(legacy_load, path)
+                assert df.shape[0] == n
+                line += f"   pandas {t_old:8.3f} s   x{t_old / t_new:6.1f}"
+            print(line)
+
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark de arranque: tiempo desde el intérprete vacío hasta la ventana
+principal visible (import de Main + QApplication + MainWindow.show()).
+
+Cada medida se hace en un proceso nuevo (los imports no se reutilizan).
+Falla (código de salida 1) si la mediana supera el presupuesto o si al
+mostrar la ventana ya están cargados los módulos pesados.
+
+Uso (desde la raíz del proyecto):
+    python BENCHMARKS/bench_startup.py
+    python BENCHMARKS/bench_startup.py --budget 1.0 --repeat 7
+"""
+from pathlib import Path
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+DEFAULT_BUDGET_S = 1.5
+
+# No deben cargarse antes de que aparezca la ventana
+HEAVY_MODULES = ["numpy", "pandas", "matplotlib", "mpl_toolkits.mplot3d"]
+
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from PySide6.QtWidgets import QApplication
+import Main
+t_import = time.perf_counter() - t0
+app = QApplication(sys.argv)
+window = Main.MainWindow()
+window.show()
+app.processEvents()
+t_window = time.perf_counter() - t0
+heavy = [m for m in json.loads(sys.argv[1]) if m in sys.modules]
+print(json.dumps({"import_s": t_import, "window_s": t_window, "heavy": heavy}))
+"""
+
+
+def measure_once() -> dict:
+    env = dict(os.environ)
+    # Sin pantalla (servidores, CI) se usa la plataforma offscreen de Qt
+    if sys.platform.startswith("linux") and not env.get("DISPLAY") and not env.get("WAYLAND_DISPLAY"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE, json.dumps(HEAVY_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_S,
+                        help="máximo para la mediana hasta ventana visible [s]")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.repeat)]
+    imp = statistics.median(r["import_s"] for r in runs)
+    win = statistics.median(r["window_s"] for r in runs)
+    heavy = sorted({m for r in runs for m in r["heavy"]})
+
+    print(f"import Main      {imp:7.3f} s (mediana de {args.repeat})")
+    print(f"ventana visible  {win:7.3f} s   presupuesto {args.budget:.3f} s")
+
+    ok = True
+    if win > args.budget:
+        print(f"❌ Arranque por encima del presupuesto ({win:.3f} s > {args.budget:.3f} s)")
+        ok = False
+    if heavy:
+        print("❌ Módulos pesados cargados al arrancar:", ", ".join(heavy))
+        ok = False
+    if ok:
+        print("✅ Arranque dentro del presupuesto")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
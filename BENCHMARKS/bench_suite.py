@@ -0,0 +1,356 @@
+"""
+Suite de benchmarks de los caminos calientes del pipeline, con entradas
+sintéticas (BENCHMARKS/synthetic.py), sin GMAT:
+
+    parse_gui_txt, build_gmat_script,           (config de la GUI)
+      ScriptTemplate.write                      (un punto de barrido)
+      sample_config, montecarlo.update          (una muestra Monte Carlo)
+    load_report (plot_results y GUI), en frío   (sin sidecar .npy)
+      y en caliente (con sidecar)
+    make_plots, make_figures, hover             (por nº de filas)
+
+Cada grupo de casos y tamaño corre en un proceso nuevo. De cada caso se
+guarda el mejor tiempo de --repeat ejecuciones y el pico de memoria de
+Python/NumPy (tracemalloc) en una ejecución aparte, para que la medida
+de memoria no infle la de tiempo.
+
+Con --baseline se compara contra un JSON guardado antes y se marca como
+regresión lo que empeore más de --tolerance (código de salida 1). Los
+tiempos muy pequeños se ignoran (--min-delta): son puro ruido.
+
+Uso (desde la raíz del proyecto):
+    python BENCHMARKS/bench_suite.py
+    python BENCHMARKS/bench_suite.py --sizes 1e3 1e5 1e7 --only load_report
+    python BENCHMARKS/bench_suite.py --save-baseline BENCHMARKS/baseline.json
+    python BENCHMARKS/bench_suite.py --baseline BENCHMARKS/baseline.json
+
+La línea base de BENCHMARKS/baseline.json solo vale para la máquina en
+la que se generó (se guarda su descripción): hay que regenerarla al
+cambiar de máquina.
+"""
+from contextlib import redirect_stdout
+from pathlib import Path
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Sin pantalla (servidores, CI) se usa la plataforma offscreen de Qt
+if sys.platform.startswith("linux") and not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from synthetic import orbit_frame, write_datos_guardados, write_synthetic_report  # noqa: E402
+
+
+DEFAULT_SIZES = [1e3, 1e4, 1e5, 1e6]
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_MIN_DELTA_S = 0.005
+
+# Eventos de ratón simulados por medida del hover
+HOVER_EVENTS = 500
+# Pestaña con hover que se mide (Órbita XY: la única sin ordenar en x)
+HOVER_TAB = 1
+
+
+# ---------- casos ----------
+#
+# Cada caso es (nombre, setup, fn): setup() prepara el estado (p.ej. borra
+# el sidecar para medir en frío) y no entra en la medida.
+
+def _noop():
+    pass
+
+
+# Las ventanas Qt de los casos tienen que seguir vivas mientras se miden
+_windows = []
+
+
+def config_cases(tmp: Path) -> list:
+    from SOURCES.Transpiler import ScriptTemplate, build_gmat_script, parse_gui_txt
+    from SOURCES.montecarlo import RunningMoments, StreamingHistogram, sample_config
+    from SOURCES.sweep import with_fields
+
+    datos = write_datos_guardados(tmp / "datos_guardados.txt")
+    cfg = parse_gui_txt(datos)
+    script = tmp / "bench.script"
+
+    # Un punto de barrido: otro estado inicial y otro ΔV
+    template = ScriptTemplate(cfg)
+    point = with_fields(cfg, {("spacecraft", "x"): 7100.0,
+                              ("impulsive_burn", "Delta V Element 1"): 0.15})
+
+    # Una muestra Monte Carlo: estado y burns perturbados, y su historia
+    # (200 instantes) sumada a las estadísticas ya calentadas
+    spec = {"seed": 0, "fields": {"SPACECRAFT.x": {"sigma": 1.0}},
+            "burns": {"magnitude_sigma": 0.01, "pointing_sigma_deg": 0.5}}
+    rng = np.random.default_rng(0)
+    history = 7000.0 + rng.normal(size=(200, 6))
+    state, hist = RunningMoments(200, 6), StreamingHistogram(200)
+    for _ in range(hist.warmup):
+        hist.update(np.linalg.norm(history[:, :3] + rng.normal(size=(200, 3)), axis=1))
+
+    def mc_update():
+        state.update(history)
+        hist.update(np.linalg.norm(history[:, :3], axis=1))
+
+    return [
+        ("parse_gui_txt", _noop, lambda: parse_gui_txt(datos)),
+        ("build_gmat_script", _noop, lambda: build_gmat_script(cfg, script)),
+        ("ScriptTemplate.write", _noop, lambda: template.write(point, script)),
+        ("sample_config", _noop, lambda: sample_config(cfg, spec, 1)),
+        ("montecarlo.update", _noop, mc_update),
+    ]
+
+
+def report_cases(tmp: Path, n: int) -> list:
+    from SOURCES import GUI_plots, plot_results
+    from SOURCES.report_parser import sidecar_paths
+
+    report = tmp / f"report_{n}.txt"
+    write_synthetic_report(report, n)
+
+    def drop_sidecar():
+        for p in sidecar_paths(report):
+            p.unlink(missing_ok=True)
+
+    def warm_sidecar():
+        plot_results.load_report(report)
+
+    cases = []
+    for label, load in (("plot_results", plot_results.load_report),
+                        ("GUI", GUI_plots.load_report)):
+        cases.append((f"load_report[{label},frío]", drop_sidecar, lambda load=load: load(report)))
+        cases.append((f"load_report[{label},caliente]", warm_sidecar, lambda load=load: load(report)))
+    return cases
+
+
+def plot_cases(tmp: Path, n: int) -> list:
+    from SOURCES.GUI_plots import make_figures
+    from SOURCES.plot_results import make_plots
+    import matplotlib.pyplot as plt
+
+    df = orbit_frame(n)
+    datos = write_datos_guardados(tmp / "datos_guardados.txt")
+    plots_dir = tmp / "plots"
+
+    def figures():
+        # Las figuras se dibujan para medir también el render, no solo su construcción
+        figs = make_figures(df, datos)
+        for fig in figs:
+            fig.canvas.draw()
+        plt.close("all")
+
+    return [
+        # Un solo proceso: en un pool no se vería ni el tiempo de CPU ni la memoria
+        ("make_plots", _noop, lambda: make_plots(df, plots_dir, datos, workers=1)),
+        ("make_figures", _noop, figures),
+    ]
+
+
+def hover_cases(tmp: Path, n: int) -> list:
+    from PySide6.QtWidgets import QApplication
+    from matplotlib.backend_bases import MouseEvent
+    from SOURCES.GUI_plots import PlotsWindow, figure_factories
+
+    app = QApplication.instance() or QApplication([])
+
+    df = orbit_frame(n)
+    datos = write_datos_guardados(tmp / "datos_guardados.txt")
+    window = PlotsWindow(figure_factories(df, datos))
+    _windows.append(window)
+    window._ensure_tab(HOVER_TAB)
+    canvas = window._canvases[-1]
+    ax = canvas.figure.get_axes()[0]
+    app.processEvents()
+
+    # Cerca de los puntos dibujados (aciertos) con algo de ruido (fallos)
+    line = ax.lines[0]
+    xy = np.column_stack([line.get_xdata(), line.get_ydata()])
+    xy = xy[np.isfinite(xy).all(axis=1)]
+    rng = np.random.default_rng(0)
+    pick = xy[rng.integers(0, len(xy), HOVER_EVENTS)]
+    pixels = ax.transData.transform(pick) + rng.normal(scale=8.0, size=(HOVER_EVENTS, 2))
+    events = [MouseEvent("motion_notify_event", canvas, px, py) for px, py in pixels]
+
+    def hover():
+        for ev in events:
+            canvas.callbacks.process("motion_notify_event", ev)
+
+    return [(f"hover[x{HOVER_EVENTS}]", _noop, hover)]
+
+
+CASE_GROUPS = {
+    "config": (config_cases, False),   # (generador, depende del nº de filas)
+    "report": (report_cases, True),
+    "plots": (plot_cases, True),
+    "hover": (hover_cases, True),
+}
+
+
+# ---------- medida ----------
+
+def measure(setup, fn, repeat: int) -> dict:
+    times = []
+    with redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            setup()
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+
+        setup()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {"time_s": round(min(times), 6), "peak_mb": round(peak / 1e6, 3)}
+
+
+def run_group(group: str, n: int | None, repeat: int, only: list) -> dict:
+    """Mide en este proceso los casos de un grupo para un nº de filas."""
+    make_cases, sized = CASE_GROUPS[group]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        with redirect_stdout(io.StringIO()):
+            cases = make_cases(Path(tmp), n) if sized else make_cases(Path(tmp))
+        for name, setup, fn in cases:
+            key = name if n is None else f"{name}@{n:.0e}"
+            if only and not any(s in key for s in only):
+                continue
+            results[key] = measure(setup, fn, repeat)
+    return results
+
+
+def run_suite(sizes: list, repeat: int, only: list) -> tuple[dict, list]:
+    """
+    Cada grupo y tamaño se mide en un proceso nuevo: las cachés (sidecars,
+    fuentes de matplotlib) y la memoria de un caso no afectan al siguiente.
+    Además PySide6 6.12 con Python < 3.12 pierde una referencia a None en
+    cada repintado; miles de blits en un solo proceso acaban abortándolo.
+    """
+    results, failed = {}, []
+    for group, (_, sized) in CASE_GROUPS.items():
+        for n in (sizes if sized else [0]):
+            cmd = [sys.executable, __file__, "--worker", group, str(n),
+                   "--repeat", str(repeat), "--only", *only]
+            out = subprocess.run(cmd, capture_output=True, text=True)
+            if out.returncode != 0:
+                print(f"❌ {group}@{n:.0e} falló (código {out.returncode}):")
+                print(out.stderr.strip()[-2000:])
+                failed.append(f"{group}@{n:.0e}")
+                continue
+
+            group_results = json.loads(out.stdout.strip().splitlines()[-1])
+            for key, r in group_results.items():
+                print(f"{key:45s} {r['time_s']:10.4f} s {r['peak_mb']:10.1f} MB")
+            results.update(group_results)
+    return results, failed
+
+
+def machine() -> dict:
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+# ---------- línea base ----------
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta: float) -> list:
+    """Casos que empeoran más de `tolerance` (en tiempo o en memoria)."""
+    regressions = []
+    print()
+    print(f"{'caso':45s} {'tiempo':>10s} {'base':>10s} {'ratio':>7s} "
+          f"{'MB':>9s} {'base':>9s} {'ratio':>7s}")
+
+    for key, cur in results.items():
+        ref = baseline.get("results", {}).get(key)
+        if ref is None:
+            print(f"{key:45s} {cur['time_s']:10.4f} {'(nuevo)':>10s}")
+            continue
+
+        t_ratio = cur["time_s"] / ref["time_s"] if ref["time_s"] else 1.0
+        m_ratio = cur["peak_mb"] / ref["peak_mb"] if ref["peak_mb"] else 1.0
+
+        slow = t_ratio > 1 + tolerance and cur["time_s"] - ref["time_s"] > min_delta
+        fat = m_ratio > 1 + tolerance and cur["peak_mb"] - ref["peak_mb"] > 1.0
+        mark = ""
+        if slow or fat:
+            regressions.append(key)
+            mark = "  ❌ " + " y ".join(w for w, bad in (("tiempo", slow), ("memoria", fat)) if bad)
+
+        print(f"{key:45s} {cur['time_s']:10.4f} {ref['time_s']:10.4f} {t_ratio:7.2f} "
+              f"{cur['peak_mb']:9.1f} {ref['peak_mb']:9.1f} {m_ratio:7.2f}{mark}")
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=float, nargs="+", default=DEFAULT_SIZES,
+                        help="nº de filas de los reports/órbitas (hasta 1e7)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", default=[],
+                        help="solo los casos cuyo nombre contenga alguno de estos textos")
+    parser.add_argument("--baseline", type=Path, help="JSON con el que comparar")
+    parser.add_argument("--save-baseline", type=Path, help="guarda los resultados como línea base")
+    parser.add_argument("--json", type=Path, help="guarda los resultados en este JSON")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="empeoramiento relativo permitido (0.25 = +25%%)")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA_S,
+                        help="diferencias de tiempo menores que esto no cuentan [s]")
+    parser.add_argument("--worker", nargs=2, metavar=("GRUPO", "FILAS"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        group, n = args.worker[0], int(args.worker[1])
+        results = run_group(group, n if CASE_GROUPS[group][1] else None, args.repeat, args.only)
+        print(json.dumps(results))
+        return 0
+
+    sizes = [int(s) for s in args.sizes]
+    results, failed = run_suite(sizes, args.repeat, args.only)
+    doc = {"machine": machine(), "repeat": args.repeat, "results": results}
+
+    for out in (args.json, args.save_baseline):
+        if out is not None:
+            out.write_text(json.dumps(doc, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+            print("✅ Resultados guardados en:", out)
+
+    if args.baseline is None:
+        return 1 if failed else 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("machine") != doc["machine"]:
+        print("⚠ La línea base es de otra máquina:", baseline.get("machine"))
+
+    regressions = compare(results, baseline, args.tolerance, args.min_delta) + failed
+    if regressions:
+        print(f"❌ {len(regressions)} regresiones respecto a {args.baseline}")
+        return 1
+    print("✅ Sin regresiones respecto a", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""
+Sustituto de GmatConsole para ejecutar el pipeline completo sin GMAT
+(Linux, CI, benchmarks de extremo a extremo):
+
+    AM1_GMAT=BENCHMARKS/fake_gmat/GmatConsole.py python Main.py
+    PATH=$PWD/BENCHMARKS/fake_gmat:$PATH python Batch.py escenarios/ --engine gmat
+
+Lee el script que genera el Transpiler (Spacecraft cartesiano o
+kepleriano, FM.CentralBody, ImpulsiveBurn, ReportFile y la secuencia
+Propagate / Maneuver / Report / Toggle), propaga con dos cuerpos (Kepler
+analítico, sin J2 ni arrastre) y escribe cada ReportFile con el formato
+de GMAT: columnas de 26 caracteres, Precision = 16 y una fila por paso.
+Admite varios Spacecraft con su propio propagador (scripts por lotes de
+build_gmat_batch_script).
+
+Opciones (o variables de entorno, para cuando lo lanza el pipeline):
+    --latency  AM1_FAKE_GMAT_LATENCY  segundos de arranque antes de propagar
+    --rows     AM1_FAKE_GMAT_ROWS     filas de propagación por nave
+                                      (por defecto, una cada Prop.MaxStep)
+    --rate     AM1_FAKE_GMAT_RATE     filas por segundo al escribir (0 = sin
+                                      límite): el report crece poco a poco
+                                      como con GMAT
+    --exit     AM1_FAKE_GMAT_EXIT     termina con este código sin propagar
+"""
+from pathlib import Path
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from SOURCES.kepler import propagate_kepler  # noqa: E402
+from SOURCES.propagator import BODIES, burn_delta_v, kepler_to_cartesian  # noqa: E402
+
+
+WIDTH = 26
+CHUNK_ROWS = 100_000
+
+CARTESIAN = ["X", "Y", "Z", "VX", "VY", "VZ"]
+KEPLERIAN = ["SMA", "ECC", "INC", "RAAN", "AOP", "TA"]
+
+_CREATE_RE = re.compile(r"^Create\s+(\w+)\s+(\w+)\s*;")
+_ASSIGN_RE = re.compile(r"^([\w.]+)\s*=\s*(.+?)\s*;")
+_PROPAGATE_RE = re.compile(
+    r"^Propagate\s+(\w+)\((\w+)\)\s*\{\s*\w+\.(ElapsedDays|ElapsedSecs)\s*=\s*([^}\s]+)\s*\}\s*;"
+)
+_MANEUVER_RE = re.compile(r"^Maneuver\s+(\w+)\((\w+)\)\s*;")
+_REPORT_RE = re.compile(r"^Report\s+(\w+)\s+(.+?)\s*;")
+_TOGGLE_RE = re.compile(r"^Toggle\s+(\w+)\s+(On|Off)\s*;")
+
+
+class ScriptError(Exception):
+    pass
+
+
+def parse_script(text: str) -> dict:
+    """Objetos creados, asignaciones `Obj.Campo = valor;` y secuencia de misión."""
+    objects, fields, sequence = {}, {}, []
+    in_mission = False
+
+    for raw in text.splitlines():
+        line = raw.split("%", 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith("BeginMissionSequence"):
+            in_mission = True
+            continue
+
+        if not in_mission:
+            m = _CREATE_RE.match(line)
+            if m:
+                objects[m.group(2)] = m.group(1)
+                continue
+            m = _ASSIGN_RE.match(line)
+            if m:
+                fields[m.group(1)] = m.group(2).strip("'")
+            continue
+
+        m = _PROPAGATE_RE.match(line)
+        if m:
+            t = float(m.group(4))
+            t = t * 86400.0 if m.group(3) == "ElapsedDays" else t
+            sequence.append(("propagate", (m.group(1), m.group(2), t)))
+            continue
+        m = _MANEUVER_RE.match(line)
+        if m:
+            sequence.append(("maneuver", (m.group(1), m.group(2))))
+            continue
+        m = _REPORT_RE.match(line)
+        if m:
+            sequence.append(("report", (m.group(1), m.group(2).split())))
+            continue
+        m = _TOGGLE_RE.match(line)
+        if m:
+            sequence.append(("toggle", (m.group(1), m.group(2) == "On")))
+            continue
+        raise ScriptError(f"Comando no soportado por el simulador: {line}")
+
+    return {"objects": objects, "fields": fields, "sequence": sequence}
+
+
+def _field(fields: dict, name: str, default=None) -> str:
+    if name in fields:
+        return fields[name]
+    if default is None:
+        raise ScriptError(f"Falta {name} en el script")
+    return default
+
+
+def initial_state(script: dict, sat: str, mu: float) -> np.ndarray:
+    f = script["fields"]
+    if f.get(f"{sat}.DisplayStateType", "Cartesian") == "Keplerian":
+        return kepler_to_cartesian(*(float(_field(f, f"{sat}.{k}")) for k in KEPLERIAN), mu)
+    return np.array([float(_field(f, f"{sat}.{k}")) for k in CARTESIAN])
+
+
+def column_values(var: str, t: np.ndarray, states: np.ndarray) -> np.ndarray:
+    field = var.split(".", 1)[-1]
+    if field == "ElapsedDays":
+        return t / 86400.0
+    if field == "ElapsedSecs":
+        return t
+    if field in CARTESIAN:
+        return states[:, CARTESIAN.index(field)]
+    raise ScriptError(f"Variable de report no soportada por el simulador: {var}")
+
+
+class Ship:
+    """Estado actual de un Spacecraft: tiempo transcurrido [s] y vector de estado."""
+
+    def __init__(self, script: dict, name: str, mu: float):
+        self.t = 0.0
+        self.state = initial_state(script, name, mu)
+
+    def sample(self, n: int) -> tuple[np.ndarray, np.ndarray]:
+        return np.full(n, self.t), np.broadcast_to(self.state, (n, 6))
+
+
+class Report:
+    """Un ReportFile abierto; las filas se escriben y se vuelcan enseguida."""
+
+    def __init__(self, path: Path, columns: list, rate: float):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.f = path.open("w", encoding="utf-8")
+        self.columns = columns
+        self.rate = rate
+        self.rows = 0
+        self.t0 = time.perf_counter()
+        # Al menos un espacio entre columnas aunque el nombre no quepa en WIDTH
+        self.f.write("".join(c.ljust(WIDTH - 1) + " " for c in columns) + "\n")
+        self.f.flush()
+
+    def write(self, values, n: int, columns: list | None = None):
+        """`values(var, n)` da la columna de la variable `var` (n filas)."""
+        cols = columns or self.columns
+        block = np.column_stack([values(c, n) for c in cols])
+        np.savetxt(self.f, block, fmt=f"%-{WIDTH}.16g", delimiter="")
+        self.f.flush()
+
+        self.rows += len(block)
+        if self.rate > 0:
+            ahead = self.rows / self.rate - (time.perf_counter() - self.t0)
+            if ahead > 0:
+                time.sleep(ahead)
+
+    def close(self):
+        self.f.close()
+
+
+def _propagator_mu(fields: dict, prop: str) -> float:
+    fm = _field(fields, f"{prop}.FM", "FM")
+    body = _field(fields, f"{fm}.CentralBody", "Earth")
+    if body not in BODIES:
+        raise ScriptError(f"Cuerpo central no soportado por el simulador: {body}")
+    return BODIES[body]["mu"]
+
+
+def run_script(script_path: Path, rows: int | None, rate: float) -> int:
+    script = parse_script(script_path.read_text(encoding="utf-8"))
+    objects, fields, sequence = script["objects"], script["fields"], script["sequence"]
+
+    sat_names = [name for name, kind in objects.items() if kind == "Spacecraft"]
+    if not sat_names:
+        raise ScriptError("El script no crea ningún Spacecraft")
+
+    # mu de cada nave: la del primer propagador con el que se propaga
+    mus = {}
+    for kind, arg in sequence:
+        if kind == "propagate":
+            prop, sat, _ = arg
+            if sat not in objects:
+                raise ScriptError(f"Spacecraft no creado: {sat}")
+            mus.setdefault(sat, _propagator_mu(fields, prop))
+    ships = {sat: Ship(script, sat, mus.get(sat, BODIES["Earth"]["mu"])) for sat in sat_names}
+
+    # Paso de salida: el máximo del propagador, o el que da `rows` filas por nave
+    t_end = {}
+    for kind, arg in sequence:
+        if kind == "propagate":
+            t_end[arg[1]] = max(t_end.get(arg[1], 0.0), arg[2])
+
+    reports = {}
+    active = {}
+    for name, kind in objects.items():
+        if kind != "ReportFile":
+            continue
+        path = Path(_field(fields, f"{name}.Filename", f"{name}.txt"))
+        columns = [c.strip() for c in _field(fields, f"{name}.Add", "{}").strip("{}").split(",") if c.strip()]
+        for c in columns:
+            if c.split(".", 1)[0] not in ships:   # valida antes de propagar
+                raise ScriptError(f"Variable de report no soportada por el simulador: {c}")
+            column_values(c, np.zeros(1), np.zeros((1, 6)))
+        reports[name] = Report(path, columns, rate)
+        active[name] = True
+
+    # Con límite de velocidad se escribe en trozos pequeños para que el report crezca poco a poco
+    chunk = min(CHUNK_ROWS, max(1, int(rate / 10))) if rate > 0 else CHUNK_ROWS
+
+    def values_at(current: dict):
+        """Columnas con las naves de `current` (tiempos, estados) y las demás quietas."""
+        def values(var, n):
+            sat = var.split(".", 1)[0]
+            t, states = current[sat] if sat in current else ships[sat].sample(n)
+            return column_values(var, t, states)
+        return values
+
+    try:
+        for kind, arg in sequence:
+            if kind == "propagate":
+                prop, sat, t_stop = arg
+                ship, mu = ships[sat], mus[sat]
+                step = float(_field(fields, f"{prop}.MaxStep", "60"))
+                if rows:
+                    step = max(t_end[sat] / rows, 1e-6)
+                times = np.append(np.arange(ship.t, t_stop, step), t_stop)
+                for i in range(0, len(times), chunk):
+                    tt = times[i:i + chunk]
+                    states = propagate_kepler(ship.state, tt - ship.t, mu)
+                    values = values_at({sat: (tt, states)})
+                    for name, rep in reports.items():
+                        if rep.columns and active[name]:
+                            rep.write(values, len(tt))
+                ship.state, ship.t = states[-1].copy(), t_stop
+
+            elif kind == "maneuver":
+                burn, sat = arg
+                ship = ships[sat]
+                dv = [float(_field(fields, f"{burn}.Element{k}", "0")) for k in (1, 2, 3)]
+                ship.state[3:] += burn_delta_v(ship.state, _field(fields, f"{burn}.Axes", "VNB"), dv)
+
+            elif kind == "toggle":
+                name, on = arg
+                if name not in reports:
+                    raise ScriptError(f"ReportFile no creado: {name}")
+                active[name] = on
+
+            else:
+                name, columns = arg
+                if name not in reports:
+                    raise ScriptError(f"ReportFile no creado: {name}")
+                reports[name].write(values_at({}), 1, columns)
+    finally:
+        for rep in reports.values():
+            rep.close()
+
+    return sum(rep.rows for rep in reports.values())
+
+
+def main(argv=None) -> int:
+    env = os.environ.get
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("script", type=Path)
+    parser.add_argument("--latency", type=float, default=float(env("AM1_FAKE_GMAT_LATENCY", "0")))
+    parser.add_argument("--rows", type=int, default=int(env("AM1_FAKE_GMAT_ROWS", "0")))
+    parser.add_argument("--rate", type=float, default=float(env("AM1_FAKE_GMAT_RATE", "0")))
+    parser.add_argument("--exit", type=int, default=int(env("AM1_FAKE_GMAT_EXIT", "0")))
+    # GmatConsole admite más opciones (--run, --exit_after_run...): se ignoran
+    args, _ = parser.parse_known_args(argv)
+
+    print("GMAT simulado (dos cuerpos) —", args.script)
+    time.sleep(args.latency)
+
+    if args.exit:
+        print(f"Terminando con código {args.exit} (AM1_FAKE_GMAT_EXIT)")
+        return args.exit
+    if not args.script.exists():
+        print(f"**** ERROR **** No existe el script: {args.script}", file=sys.stderr)
+        return 1
+
+    t0 = time.perf_counter()
+    try:
+        n = run_script(args.script, args.rows or None, args.rate)
+    except (ScriptError, RuntimeError, ValueError) as e:
+        print(f"**** ERROR **** {e}", file=sys.stderr)
+        return 1
+
+    print(f"Mission run completed: {n} filas en {time.perf_counter() - t0:.3f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
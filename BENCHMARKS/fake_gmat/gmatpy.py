@@ -0,0 +1,69 @@
+"""
+Sustituto de gmatpy (API de Python de GMAT) con el mismo simulador de dos
+cuerpos que GmatConsole.py, para probar y medir SOURCES/gmat_api.py sin
+GMAT:
+
+    AM1_GMATPY_PATH=BENCHMARKS/fake_gmat python Main.py
+
+Solo implementa lo que usa el backend: LoadScript, RunScript y Clear.
+AM1_FAKE_GMAT_LATENCY se paga una vez al importar (la carga del motor),
+no en cada ejecución; AM1_FAKE_GMAT_ROWS y AM1_FAKE_GMAT_RATE funcionan
+igual que en GmatConsole.py. Con AM1_FAKE_GMAT_LOG=<fichero> se anota una
+línea por llamada ("LoadScript <ruta>", "RunScript"), para comprobar
+desde fuera del worker qué se ha llamado.
+"""
+from pathlib import Path
+import os
+import time
+
+from GmatConsole import ScriptError, run_script
+
+
+# Carga del motor, efemérides y plugins
+time.sleep(float(os.environ.get("AM1_FAKE_GMAT_LATENCY", "0")))
+
+_script = None
+
+
+def _log(line: str):
+    path = os.environ.get("AM1_FAKE_GMAT_LOG", "").strip()
+    if path:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def LoadScript(path) -> bool:
+    global _script
+    path = Path(path)
+    _log(f"LoadScript {path}")
+    if not path.exists():
+        print(f"**** ERROR **** No existe el script: {path}")
+        return False
+    _script = path
+    return True
+
+
+def RunScript() -> bool:
+    _log("RunScript")
+    if _script is None:
+        print("**** ERROR **** No hay ningún script cargado")
+        return False
+    try:
+        run_script(_script, int(os.environ.get("AM1_FAKE_GMAT_ROWS", "0")) or None,
+                   float(os.environ.get("AM1_FAKE_GMAT_RATE", "0")))
+    except (ScriptError, RuntimeError, ValueError) as e:
+        print(f"**** ERROR **** {e}")
+        return False
+    return True
+
+
+def Clear():
+    global _script
+    _script = None
+
+
+def _log(line: str):
+    path = os.environ.get("AM1_FAKE_GMAT_LOG", "").strip()
+    if path:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
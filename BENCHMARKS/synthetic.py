@@ -0,0 +1,142 @@
+"""
+Generadores de entradas sintéticas para los benchmarks (no hace falta GMAT):
+
+- write_datos_guardados: un datos_guardados.txt con el formato de la GUI.
+- write_synthetic_report: un report con formato GMAT (columnas de 26
+  caracteres) y la cabecera repetida cada `header_every` filas.
+- orbit_frame: una tabla (t, X, Y, Z, VX, VY, VZ) con forma de órbita
+  elíptica de varias vueltas, para las figuras y el hover.
+"""
+from pathlib import Path
+import io
+
+import numpy as np
+import pandas as pd
+
+
+COLUMNS = ["Sat.ElapsedDays", "Sat.X", "Sat.Y", "Sat.Z", "Sat.VX", "Sat.VY", "Sat.VZ"]
+
+# Valores por defecto de cada sección (mismas claves que escribe la GUI)
+DATOS_DEFAULTS = {
+    "GENERAL": {
+        "Nombre nave": "Sat",
+        "Cuerpo central": "Tierra",
+        "Sistema de referencia": "Ecuatorial",
+        "Formato de tiempo": "UTC",
+    },
+    "SPACECRAFT": {
+        "Sistema de coordenadas": "Cartesianas",
+        "x": "7000", "y": "0", "z": "0",
+        "vx": "0", "vy": "7.5", "vz": "1",
+        "Masa seca": "850",
+        "Masa combustible": "150",
+        "Formato epoch": "UTC",
+    },
+    "TIEMPO": {
+        "Fecha inicio": "01/01/2030",
+        "Fecha final": "02/01/2030",
+    },
+    "PROPAGATE": {
+        "Tipo de integrador": "RungeKutta89",
+        "Tamano de paso inicial": "60",
+        "Precision (accuracy)": "1e-11",
+        "Paso minimo": "0.001",
+        "Paso maximo": "2700",
+        "Intentos max. paso": "50",
+        "Cuerpo central": "Tierra",
+        "Cuerpo primario": "Tierra",
+        "Modelo gravitatorio": "JGM-2",
+        "Grado": "4",
+        "Orden": "4",
+        "STM Limit": "100",
+        "Atmosfera": "None",
+        "Modelo de arrastre": "Spherical",
+    },
+    "IMPULSIVE BURN": {
+        "Sistema de coordenadas": "Local",
+        "Origen": "Tierra",
+        "Axes": "VNB",
+        "Delta V Element 1": "0.1",
+        "Delta V Element 2": "0",
+        "Delta V Element 3": "0",
+        "Tiempo burn": "0.3",
+    },
+    "IMPULSIVE BURN 2": {
+        "Sistema de coordenadas": "Local",
+        "Origen": "Tierra",
+        "Axes": "VNB",
+        "Delta V Element 1": "-0.05",
+        "Delta V Element 2": "0",
+        "Delta V Element 3": "0",
+        "Tiempo burn": "0.6",
+    },
+    "REPORTFILE": {
+        "Nombre del archivo de reporte": "ReportFile",
+    },
+}
+
+
+def write_datos_guardados(path: Path, overrides: dict | None = None) -> Path:
+    """
+    datos_guardados.txt con DATOS_DEFAULTS; `overrides` es
+    {sección: {clave: valor}} para cambiar campos concretos.
+    """
+    sections = {name: dict(fields) for name, fields in DATOS_DEFAULTS.items()}
+    for name, fields in (overrides or {}).items():
+        sections.setdefault(name, {}).update(fields)
+
+    lines = []
+    for name, fields in sections.items():
+        if lines:
+            lines.append("")
+        lines.append(f"=== {name} ===")
+        lines.extend(f"{k}: {v}" for k, v in fields.items())
+
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def write_synthetic_report(path: Path, n_rows: int, header_every: int = 50_000):
+    """Report con formato GMAT y la cabecera repetida cada `header_every` filas."""
+    header = ("".join(c.ljust(26) for c in COLUMNS) + "\n").encode()
+    block_rows = min(n_rows, 10_000)
+
+    rng = np.random.default_rng(0)
+    block = rng.normal(scale=7000.0, size=(block_rows, 7))
+    buf = io.BytesIO()
+    np.savetxt(buf, block, fmt="%-26.16g", delimiter="")
+    block_bytes = buf.getvalue()
+    line_len = len(block_bytes) // block_rows
+
+    with path.open("wb") as f:
+        f.write(header)
+        written = 0
+        while written < n_rows:
+            k = min(block_rows, n_rows - written)
+            f.write(block_bytes[:k * line_len])
+            written += k
+            if written < n_rows and written % header_every < block_rows:
+                f.write(header)
+
+
+def orbit_frame(n_rows: int, revs: float = 20.0, sma: float = 20000.0,
+                ecc: float = 0.6, days: float = 10.0) -> pd.DataFrame:
+    """Órbita elíptica inclinada muestreada uniformemente en anomalía excéntrica."""
+    mu = 398600.4418
+    E = np.linspace(0.0, 2.0 * np.pi * revs, n_rows)
+    b = sma * np.sqrt(1.0 - ecc**2)
+    x = sma * (np.cos(E) - ecc)
+    y = b * np.sin(E)
+
+    n = np.sqrt(mu / sma**3)
+    dE = n / (1.0 - ecc * np.cos(E))
+    vx = -sma * np.sin(E) * dE
+    vy = b * np.cos(E) * dE
+
+    inc = np.radians(30.0)
+    data = np.column_stack([
+        np.linspace(0.0, days, n_rows),
+        x, y * np.cos(inc), y * np.sin(inc),
+        vx, vy * np.cos(inc), vy * np.sin(inc),
+    ])
+    return pd.DataFrame(data, columns=COLUMNS)
@@ -0,0 +1,342 @@
+"""
+Ejecución por lotes sin interfaz gráfica (no importa PySide6).
+
+Cada escenario es un fichero con el formato de datos_guardados.txt. Para
+cada uno se genera el script, se ejecuta GMAT (o el motor nativo), se
+leen los resultados y se guardan los PNG en su propia carpeta:
+
+    DATA/batch/<ejecución>/<escenario>/{<escenario>.script, DefaultReportFile.txt, plots/}
+
+Al final se escribe summary.json con el estado y los tiempos de cada
+escenario.
+
+Con --pack K los escenarios que van a GMAT se agrupan de K en K en un
+solo script (build_gmat_batch_script), así GMAT arranca una vez por lote
+y no una vez por escenario. El script y los reports de cada lote quedan
+en DATA/batch/<ejecución>/_lotes/lote_<n>/ hasta que demux_report pasa
+cada report a la carpeta de su escenario.
+
+Uso (desde la raíz del proyecto):
+    python Batch.py DATA/input/escenarios/ -j 4
+    python Batch.py "casos/*.txt" --engine native --no-plots
+    python Batch.py DATA/input/escenarios/ --engine gmat --pack 50 -j 2
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+from SOURCES.Transpiler import (
+    parse_gui_txt, normalize_config, build_gmat_script, build_gmat_batch_script, unique_names,
+)
+from SOURCES.GMAT_exec import demux_report, run_gmat_job, select_engine
+from SOURCES.propagator import run_native
+from SOURCES.plot_results import load_report, make_plots
+from SOURCES.utils import BATCH_DIR
+
+
+def collect_scenarios(patterns: list) -> list:
+    """Ficheros de escenario a partir de carpetas, ficheros o globs."""
+    files = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.txt")))
+        elif path.is_file():
+            files.append(path)
+        else:
+            files.extend(sorted(Path(p) for p in glob.glob(pattern) if Path(p).is_file()))
+
+    # Sin duplicados y en el orden dado
+    seen = set()
+    unique = []
+    for f in files:
+        key = f.resolve()
+        if key not in seen:
+            seen.add(key)
+            unique.append(f)
+    return unique
+
+
+def scenario_names(files: list) -> list:
+    """Nombre de carpeta por escenario (el nombre del fichero, sin repetir)."""
+    return unique_names([f.stem for f in files], default="escenario")
+
+
+def _new_result(scenario: Path, out_dir: Path) -> dict:
+    return {
+        "name": out_dir.name,
+        "file": str(scenario),
+        "out_dir": str(out_dir),
+        "engine": None,
+        "status": "ok",
+        "error": None,
+        "rows": None,
+        "timings": {},
+    }
+
+
+def _set_error(result: dict, e: Exception):
+    result["status"] = "error"
+    result["error"] = f"{type(e).__name__}: {e}"
+    result["traceback"] = traceback.format_exc()
+
+
+def run_scenario(scenario: Path, out_dir: Path, engine: str | None = None,
+                 plots: bool = True) -> dict:
+    """Pipeline completo de un escenario. Nunca lanza: los errores van al resultado."""
+    result = _new_result(scenario, out_dir)
+    timings = result["timings"]
+    t_start = time.perf_counter()
+
+    def lap(stage, t0):
+        timings[stage] = round(time.perf_counter() - t0, 4)
+
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        report = out_dir / "DefaultReportFile.txt"
+
+        t0 = time.perf_counter()
+        cfg = parse_gui_txt(scenario)
+        p = normalize_config(cfg)
+        result["engine"] = engine = select_engine(p, engine)
+        lap("parse", t0)
+
+        if engine == "native":
+            t0 = time.perf_counter()
+            df = run_native(scenario, report)
+            lap("run", t0)
+        else:
+            t0 = time.perf_counter()
+            script_path = out_dir / f"{out_dir.name}.script"
+            build_gmat_script(cfg, script_path)
+            lap("transpile", t0)
+
+            # GMAT escribe el report directamente en la carpeta del escenario
+            t0 = time.perf_counter()
+            run_gmat_job(script_path, out_dir)
+            lap("run", t0)
+
+            t0 = time.perf_counter()
+            df = load_report(report)
+            lap("load", t0)
+
+        result["rows"] = int(df.shape[0])
+
+        if plots:
+            t0 = time.perf_counter()
+            # Un proceso por escenario: las figuras se hacen en serie dentro
+            make_plots(df, out_dir / "plots", scenario, workers=1)
+            lap("plots", t0)
+
+    except Exception as e:
+        _set_error(result, e)
+
+    timings["total"] = round(time.perf_counter() - t_start, 4)
+    return result
+
+
+def run_pack(jobs: list, pack_dir: Path, plots: bool = True) -> list:
+    """
+    Varios escenarios (lista de (fichero, carpeta)) con una sola ejecución
+    de GMAT: un script con todos (build_gmat_batch_script) y después cada
+    report a la carpeta de su escenario (demux_report), donde sigue igual
+    que en run_scenario. Nunca lanza: los errores van a cada resultado;
+    si falla GMAT, a todos los del lote.
+
+    "transpile" y "run" son los del lote entero y se repiten en cada
+    escenario; "total" es la suma de sus etapas.
+    """
+    t_start = time.perf_counter()
+    results = [_new_result(s, d) for s, d in jobs]
+    for r in results:
+        r["engine"] = "gmat"
+        r["pack"] = {"name": pack_dir.name, "size": len(jobs)}
+
+    def lap(result, stage, t0):
+        result["timings"][stage] = round(time.perf_counter() - t0, 4)
+
+    cases = []   # (resultado, nombre, cfg) de los que se pudieron leer
+    for (scenario, out_dir), r in zip(jobs, results):
+        t0 = time.perf_counter()
+        try:
+            cases.append((r, out_dir.name, parse_gui_txt(scenario)))
+        except Exception as e:
+            _set_error(r, e)
+        lap(r, "parse", t0)
+
+    if cases:
+        shared, infos = {}, []
+        try:
+            pack_dir.mkdir(parents=True, exist_ok=True)
+            t0 = time.perf_counter()
+            script_path = pack_dir / f"{pack_dir.name}.script"
+            infos = build_gmat_batch_script([(name, cfg) for _, name, cfg in cases], script_path)
+            shared["transpile"] = round(time.perf_counter() - t0, 4)
+
+            t0 = time.perf_counter()
+            run_gmat_job(script_path, pack_dir, infos[0]["report"])
+            shared["run"] = round(time.perf_counter() - t0, 4)
+        except Exception as e:
+            for r, _, _ in cases:
+                _set_error(r, e)
+                r["timings"].update(shared)
+            cases = []
+
+        for (r, _, _), info in zip(cases, infos):
+            r["timings"].update(shared)
+            out_dir = Path(r["out_dir"])
+            try:
+                t0 = time.perf_counter()
+                src = pack_dir / info["report"]
+                report = demux_report(src, out_dir / "DefaultReportFile.txt",
+                                      info["sat"], info["sat_name"])
+                src.unlink()
+                df = load_report(report)
+                lap(r, "load", t0)
+                r["rows"] = int(df.shape[0])
+
+                if plots:
+                    t0 = time.perf_counter()
+                    make_plots(df, out_dir / "plots", Path(r["file"]), workers=1)
+                    lap(r, "plots", t0)
+            except Exception as e:
+                _set_error(r, e)
+
+    pack_s = round(time.perf_counter() - t_start, 4)
+    for r in results:
+        r["timings"]["total"] = round(sum(r["timings"].values()), 4)
+        r["pack"]["total_s"] = pack_s
+    return results
+
+
+def _plan(jobs: list, engine: str | None, pack: int) -> list:
+    """
+    Trabajos para el pool: ("scenario", (fichero, carpeta)) o, con
+    pack > 1, ("pack", [(fichero, carpeta), ...]) con hasta `pack`
+    escenarios que van a GMAT.
+    """
+    if pack <= 1:
+        return [("scenario", job) for job in jobs]
+
+    single, to_gmat = [], []
+    for scenario, out_dir in jobs:
+        try:
+            p = normalize_config(parse_gui_txt(scenario))
+            to_gmat_case = select_engine(p, engine) == "gmat"
+        except Exception:
+            to_gmat_case = False   # run_scenario deja el error en su resultado
+        (to_gmat if to_gmat_case else single).append((scenario, out_dir))
+
+    packs = [("pack", to_gmat[i:i + pack]) for i in range(0, len(to_gmat), pack)]
+    return packs + [("scenario", job) for job in single]
+
+
+def _run_task(kind: str, arg, out_root: Path, index: int, engine: str | None,
+              plots: bool) -> list:
+    if kind == "pack":
+        return run_pack(arg, out_root / "_lotes" / f"lote_{index:03d}", plots)
+    return [run_scenario(*arg, engine, plots)]
+
+
+def run_batch(files: list, out_root: Path, workers: int = 1,
+              engine: str | None = None, plots: bool = True, pack: int = 1) -> dict:
+    """
+    Ejecuta todos los escenarios y escribe out_root/summary.json. Con
+    pack > 1 los que van a GMAT se ejecutan en lotes de `pack` (run_pack).
+    """
+    out_root.mkdir(parents=True, exist_ok=True)
+    jobs = list(zip(files, (out_root / n for n in scenario_names(files))))
+    tasks = _plan(jobs, engine, pack)
+
+    started = datetime.now().isoformat(timespec="seconds")
+    t0 = time.perf_counter()
+    results = []
+    if workers <= 1:
+        for i, (kind, arg) in enumerate(tasks):
+            for r in _run_task(kind, arg, out_root, i, engine, plots):
+                results.append(r)
+                _print_result(r)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_run_task, kind, arg, out_root, i, engine, plots)
+                       for i, (kind, arg) in enumerate(tasks)]
+            for f in as_completed(futures):
+                for r in f.result():
+                    results.append(r)
+                    _print_result(r)
+
+    # El resumen sigue el orden de entrada, no el de finalización
+    order = {str(d): i for i, (_, d) in enumerate(jobs)}
+    results.sort(key=lambda r: order[r["out_dir"]])
+
+    n_ok = sum(r["status"] == "ok" for r in results)
+    summary = {
+        "started": started,
+        "workers": workers,
+        "pack": pack,
+        "engine": engine or os.environ.get("AM1_ENGINE", "auto"),
+        "plots": plots,
+        "total_s": round(time.perf_counter() - t0, 4),
+        "n_scenarios": len(results),
+        "n_ok": n_ok,
+        "n_error": len(results) - n_ok,
+        "scenarios": results,
+    }
+
+    summary_path = out_root / "summary.json"
+    summary_path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    return summary
+
+
+def _print_result(r: dict):
+    if r["status"] == "ok":
+        print(f"✅ {r['name']}: {r['engine']}, {r['rows']} filas, {r['timings']['total']:.2f} s")
+    else:
+        print(f"❌ {r['name']}: {r['error']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Ejecuta varios escenarios sin interfaz gráfica.")
+    parser.add_argument("scenarios", nargs="+",
+                        help="ficheros, carpetas (se toman sus *.txt) o globs")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="nº de escenarios en paralelo")
+    parser.add_argument("-o", "--out", type=Path, default=None,
+                        help="carpeta de salida (por defecto DATA/batch/<fecha>)")
+    parser.add_argument("--engine", choices=["auto", "analytic", "gmat", "native"], default=None,
+                        help="motor a usar (por defecto AM1_ENGINE o auto)")
+    parser.add_argument("--no-plots", action="store_true", help="no generar los PNG")
+    parser.add_argument("--pack", type=int, default=1, metavar="K",
+                        help="escenarios de GMAT por script (un arranque de GMAT por lote)")
+    args = parser.parse_args(argv)
+
+    files = collect_scenarios(args.scenarios)
+    if not files:
+        print("❌ No se encontró ningún escenario en:", " ".join(args.scenarios))
+        return 2
+
+    out_root = args.out or BATCH_DIR / datetime.now().strftime("%Y%m%d_%H%M%S")
+    workers = max(1, min(args.workers, len(files)))
+    pack = max(1, args.pack)
+    print(f"▶ {len(files)} escenarios, {workers} en paralelo"
+          + (f", lotes de {pack}" if pack > 1 else "") + f" -> {out_root}")
+
+    summary = run_batch(files, out_root, workers, args.engine, not args.no_plots, pack)
+
+    print(f"Resumen: {summary['n_ok']} ok, {summary['n_error']} con error, "
+          f"{summary['total_s']:.2f} s -> {out_root / 'summary.json'}")
+    return 0 if summary["n_error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('MISCELANEA', 'MISCELANEA'), ('DATA', 'DATA')],
-    hiddenimports=['matplotlib.backends.backend_qtagg', 'matplotlib.backends.backend_qt', 'PySide6.QtCore', 'PySide6.QtGui', 'PySide6.QtWidgets'],
+    hiddenimports=['SOURCES.GUI_plots', 'SOURCES.pipeline', 'SOURCES.gmat_api', 'matplotlib.backends.backend_qtagg', 'matplotlib.backends.backend_qt', 'PySide6.QtCore', 'PySide6.QtGui', 'PySide6.QtWidgets'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -1,57 +1,250 @@
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QObject, QThread, Signal
+from PySide6.QtCore import QObject, QThread, QTimer, Signal, Slot
+from shutil import copy2, rmtree
+import importlib
+import multiprocessing
 import sys
+import threading
+import time
+import uuid
 
+# Al arrancar solo se carga PySide6 y el formulario. El pipeline y las
+# figuras (NumPy, pandas, matplotlib) se importan al usarlos o en segundo
+# plano en cuanto se ve la ventana (precargar_modulos).
 from SOURCES.GUI import MainWindow
-from SOURCES.Transpiler import run_transpiler
-from SOURCES.GMAT_exec import run_gmat
-from SOURCES.plot_results import load_report, make_plots
-from SOURCES.utils import ensure_dirs, OUTPUT_DIR
+from SOURCES.Transpiler import DATA_FILE
+from SOURCES.run_queue import RunQueue, config_key
+from SOURCES.trace import span
+from SOURCES.utils import ensure_dirs, SCRATCH_DIR
 
 
-class PipelineWorker(QObject):
-    finished = Signal()
-    error = Signal(str)
+# Cada cuánto se mira si GMAT ha escrito filas nuevas [s]
+POLL_INTERVAL = 0.2
+
+# Copia de la config de cada ejecución: la GUI puede guardar otra mientras tanto
+QUEUE_DIR = SCRATCH_DIR / "cola"
+
+# Módulos pesados que se precargan tras mostrar la ventana
+PRELOAD_MODULES = ["SOURCES.GUI_plots", "SOURCES.pipeline", "SOURCES.report_stream"]
+
+
+class PipelineExecutor(QObject):
+    """
+    Ejecutor único y de larga vida del pipeline. Vive en su propio QThread
+    y va sacando ejecuciones de una RunQueue (acotada y con agrupación de
+    configs idénticas), así que nunca hay dos pipelines a la vez peleando
+    por los ficheros de DATA/. cancel() mata el GMAT en curso.
+    """
+
+    run_started = Signal()
+    run_finished = Signal()
+    run_failed = Signal(str)
+    run_cancelled = Signal()
+    status = Signal(int, str)   # profundidad de la cola, texto de progreso
+    rows = Signal(object)       # filas nuevas del report (np.ndarray) durante GMAT
+
+    def __init__(self):
+        super().__init__()
+        self.queue = RunQueue()
+        self._cancel = threading.Event()
+        self._proc = None
+        self._proc_lock = threading.Lock()
+
+    # ---------- llamadas desde el hilo de la GUI ----------
+
+    def submit(self, config_text: str):
+        result = self.queue.submit(config_key(config_text), config_text)
+        if result == "agrupado":
+            print("⏭ Config idéntica a una ya en cola: no se vuelve a ejecutar")
+        elif result == "sustituido":
+            print("⏭ Cola llena: se descarta la ejecución pendiente más antigua")
+        self.status.emit(self.queue.depth(), f"en cola ({result})")
+
+    def cancel(self):
+        """Cancela la ejecución en curso (mata GMAT si está corriendo) y las pendientes."""
+        dropped = self.queue.clear()
+        if dropped:
+            print(f"⏹ Se descartan {dropped} ejecuciones pendientes")
+        self._cancel.set()
+        with self._proc_lock:
+            if self._proc is not None and self._proc.poll() is None:
+                self._proc.kill()
+
+    def stop(self):
+        self.queue.close()
+        self.cancel()
+
+    # ---------- hilo del pipeline ----------
+
+    @Slot()
+    def loop(self):
+        from SOURCES.pipeline import PipelineCancelled
+
+        while True:
+            config_text = self.queue.take()
+            if config_text is None:
+                return
+
+            self._cancel.clear()
+            self.run_started.emit()
+            try:
+                self.run_one(config_text)
+                print("✅ Pipeline completo")
+                self.run_finished.emit()
+            except PipelineCancelled:
+                print("⏹ Ejecución cancelada")
+                self.run_cancelled.emit()
+            except Exception as e:
+                self.run_failed.emit(str(e))
+            finally:
+                self.queue.done()
+                self.status.emit(self.queue.depth(), "listo")
+
+    def run_one(self, config_text: str):
+        # Se ejecuta sobre una copia: datos_guardados.txt puede cambiar mientras tanto
+        QUEUE_DIR.mkdir(parents=True, exist_ok=True)
+        data_file = QUEUE_DIR / DATA_FILE.name
+        data_file.write_text(config_text, encoding="utf-8")
+
+        from SOURCES.pipeline import build_pipeline
+
+        def on_stage(i, n, name):
+            self.status.emit(self.queue.depth(), f"{name} ({i}/{n})")
+
+        # Solo se repiten las etapas cuyas entradas cambiaron (ver SOURCES/pipeline.py)
+        pipeline = build_pipeline(run_gmat_fn=self.run_gmat_streaming, data_file=data_file)
+        pipeline.run(on_stage=on_stage, should_cancel=self._cancel.is_set)
+
+    def run_gmat_streaming(self, script_path, report):
+        """
+        Ejecuta GMAT leyendo el report mientras se escribe: las filas nuevas
+        se emiten por `rows` y al terminar ya está todo parseado.
+        """
+        from SOURCES.gmat_api import api_enabled
+
+        workdir = SCRATCH_DIR / f"job_{uuid.uuid4().hex[:12]}"
+        with span("run_gmat", streaming=True) as sp:
+            df = self._run_gmat_api(script_path, report) if api_enabled() else None
+            if df is None:
+                df = self._run_gmat_streaming(script_path, report, workdir)
+            sp.set(rows=len(df))
+        return df
+
+    def _run_gmat_api(self, script_path, report):
+        """
+        Con gmatpy el motor ya está cargado y no hay report que ir leyendo:
+        las filas llegan todas al final. None si hay que usar GmatConsole.
+        """
+        from SOURCES.gmat_api import GmatApiUnavailable, get_engine, run_gmat_api
+        from SOURCES.pipeline import PipelineCancelled
 
-    def run(self):
         try:
-            print("▶ Ejecutando Transpiler...")
-            script_path = run_transpiler()
+            engine = get_engine()
+        except GmatApiUnavailable as e:
+            print("⚠ gmatpy no disponible, se usa GmatConsole:", e)
+            return None
 
-            print("▶ Ejecutando GMAT...")
-            run_gmat(script_path)
+        # cancel() mata el proceso del motor igual que a un GmatConsole
+        with self._proc_lock:
+            self._proc = engine
+        try:
+            if self._cancel.is_set():
+                raise PipelineCancelled("GMAT cancelado")
+            df = run_gmat_api(script_path, report, engine)
+        except RuntimeError:
+            if self._cancel.is_set():
+                raise PipelineCancelled("GMAT cancelado")
+            raise
+        finally:
+            with self._proc_lock:
+                self._proc = None
 
-            print("▶ Generando plots...")
-            report = OUTPUT_DIR / "DefaultReportFile.txt"
-            df = load_report(report)
-            make_plots(df)
+        self.rows.emit(df.to_numpy())
+        return df
 
-            print("✅ Pipeline completo")
-            self.finished.emit()
+    def _run_gmat_streaming(self, script_path, report, workdir):
+        import pandas as pd
+        from SOURCES.GMAT_exec import start_gmat_job, check_gmat_job
+        from SOURCES.pipeline import PipelineCancelled
+        from SOURCES.report_stream import ReportTailer
 
-        except Exception as e:
-            self.error.emit(str(e))
+        try:
+            proc, job_report = start_gmat_job(script_path, workdir)
+            with self._proc_lock:
+                self._proc = proc
+            # Por si se canceló justo antes de guardar el proceso
+            if self._cancel.is_set():
+                proc.kill()
 
+            tailer = ReportTailer(job_report)
 
-def ejecutar_pipeline_async(window):
-    window.pipeline_thread = QThread()
-    window.pipeline_worker = PipelineWorker()
+            while proc.poll() is None:
+                new_rows = tailer.poll()
+                if new_rows is not None:
+                    self.rows.emit(new_rows)
+                time.sleep(POLL_INTERVAL)
+
+            if self._cancel.is_set():
+                raise PipelineCancelled("GMAT cancelado")
+
+            new_rows = tailer.finish()
+            if new_rows is not None:
+                self.rows.emit(new_rows)
+
+            check_gmat_job(proc, job_report)
+            copy2(job_report, report)
+        finally:
+            with self._proc_lock:
+                self._proc = None
+            rmtree(workdir, ignore_errors=True)
 
-    window.pipeline_worker.moveToThread(window.pipeline_thread)
+        print("✅ ReportFile copiado a:", report)
+        return pd.DataFrame(tailer.data().copy(), columns=tailer.columns)
 
-    window.pipeline_thread.started.connect(window.pipeline_worker.run)
 
-    window.pipeline_worker.finished.connect(window.pipeline_thread.quit)
-    window.pipeline_worker.finished.connect(window.pipeline_worker.deleteLater)
-    window.pipeline_thread.finished.connect(window.pipeline_thread.deleteLater)
+def precargar_modulos():
+    """
+    Importa en un hilo aparte lo que se va a necesitar al ejecutar o al
+    ver gráficas, para que el primer clic no pague la importación.
+    """
+    def worker():
+        for name in PRELOAD_MODULES:
+            with span("precarga", module=name):
+                importlib.import_module(name)
 
-    window.pipeline_worker.error.connect(
-        lambda e: print("❌ Error en pipeline:", e)
-    )
+    threading.Thread(target=worker, name="precarga", daemon=True).start()
+
+
+def start_pipeline_executor(window):
+    """Crea el ejecutor y su hilo una sola vez y lo conecta a la ventana."""
+    window.pipeline_thread = QThread()
+    window.pipeline_executor = executor = PipelineExecutor()
+
+    executor.moveToThread(window.pipeline_thread)
+    window.pipeline_thread.started.connect(executor.loop)
+
+    executor.run_started.connect(window.reset_live_plot)
+    executor.rows.connect(window.append_live_rows)
+    executor.status.connect(window.set_pipeline_status)
+    executor.run_failed.connect(lambda e: print("❌ Error en pipeline:", e))
+
+    # Llamada directa (lambda): el hilo del ejecutor está ocupado en loop()
+    # y no atendería una llamada encolada hasta terminar la ejecución
+    window.btn_cancelar.clicked.connect(lambda: executor.cancel())
 
     window.pipeline_thread.start()
+    return executor
+
+
+def ejecutar_pipeline_async(window):
+    config_text = DATA_FILE.read_text(encoding="utf-8")
+    window.pipeline_executor.submit(config_text)
 
 
+def parar_pipeline(window):
+    window.pipeline_executor.stop()
+    window.pipeline_thread.quit()
+    window.pipeline_thread.wait()
 
 
 def main():
@@ -60,12 +253,17 @@ def main():
     app = QApplication(sys.argv)
     window = MainWindow()
 
+    start_pipeline_executor(window)
     window.datos_guardados.connect(lambda: ejecutar_pipeline_async(window))
+    app.aboutToQuit.connect(lambda: parar_pipeline(window))
 
     window.show()
+    QTimer.singleShot(0, precargar_modulos)
     sys.exit(app.exec())
 
 
 
 if __name__ == "__main__":
+    # Necesario para los pools de procesos en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,109 @@
+"""
+Análisis de dispersión Monte Carlo sin interfaz gráfica (ver
+SOURCES/montecarlo.py).
+
+Cada muestra es datos_guardados.txt con el estado inicial y los burns
+perturbados; se ejecutan en paralelo y solo se guardan sus estadísticas
+por instante (media, covarianza y percentiles de r y |V|):
+
+    DATA/batch/montecarlo_<fecha>/{montecarlo.npz, summary.json, plots/}
+
+plots/ tiene las gráficas del caso nominal y las envolventes
+dispersion_radio_vs_tiempo.png y dispersion_velocidad_vs_tiempo.png.
+
+Uso (desde la raíz del proyecto):
+    python MonteCarlo.py dispersion.json -j 4
+    python MonteCarlo.py -n 2000 --seed 7 --sigma "SPACECRAFT.x=1" --sigma "SPACECRAFT.vy=0.001"
+    python MonteCarlo.py -n 5000 --burn-mag 0.01 --burn-pointing 0.5 --burn-time 0.001 --engine native
+
+dispersion.json:
+    {"base": "DATA/input/datos_guardados.txt", "samples": 1000, "seed": 1,
+     "fields": {"SPACECRAFT.x": {"sigma": 1.0}, "SPACECRAFT.TA": {"uniform": [-0.5, 0.5]}},
+     "burns": {"magnitude_sigma": 0.01, "pointing_sigma_deg": 0.5, "time_sigma_days": 0.001}}
+"""
+from datetime import datetime
+from pathlib import Path
+import argparse
+import multiprocessing
+import os
+import sys
+
+from SOURCES.montecarlo import load_spec, run_montecarlo
+from SOURCES.utils import BATCH_DIR
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Dispersión Monte Carlo alrededor de datos_guardados.txt.")
+    parser.add_argument("spec", nargs="?", type=Path, default=None,
+                        help="fichero JSON con base, samples, seed, fields y burns")
+    parser.add_argument("-n", "--runs", type=int, default=None,
+                        help="nº de muestras (por defecto la del JSON o 1000)")
+    parser.add_argument("--seed", type=int, default=None, help="semilla del muestreo")
+    parser.add_argument("--sigma", action="append", default=[], metavar="SECCIÓN.Campo=SIGMA",
+                        help="error normal sumado a un campo (se puede repetir)")
+    parser.add_argument("--burn-mag", type=float, default=None,
+                        help="error relativo (sigma) en |ΔV| de cada burn")
+    parser.add_argument("--burn-pointing", type=float, default=None,
+                        help="error de apuntamiento (sigma) de cada burn [grados]")
+    parser.add_argument("--burn-time", type=float, default=None,
+                        help="error (sigma) en el tiempo de cada burn [días]")
+    parser.add_argument("--base", type=Path, default=None,
+                        help="config nominal (por defecto la del JSON o DATA/input/datos_guardados.txt)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="nº de muestras en paralelo")
+    parser.add_argument("-o", "--out", type=Path, default=None,
+                        help="carpeta de salida (por defecto DATA/batch/montecarlo_<fecha>)")
+    parser.add_argument("--engine", choices=["auto", "analytic", "gmat", "native"], default=None,
+                        help="motor a usar (por defecto AM1_ENGINE o auto)")
+    parser.add_argument("--samples", type=int, default=200,
+                        help="instantes de la rejilla común de tiempos")
+    parser.add_argument("--keep-reports", action="store_true",
+                        help="conservar el script y el report de cada muestra (motor GMAT)")
+    parser.add_argument("--no-plots", action="store_true", help="sin PNG")
+    args = parser.parse_args(argv)
+
+    try:
+        spec = load_spec(args.spec) if args.spec else {}
+        spec.setdefault("fields", {})
+        spec.setdefault("burns", {})
+        for item in args.sigma:
+            name, sep, sigma = item.partition("=")
+            if not sep:
+                raise ValueError(f"Error sin sigma: {item!r} (SECCIÓN.Campo=SIGMA)")
+            spec["fields"][name.strip()] = {"sigma": float(sigma)}
+        for key, value in (("magnitude_sigma", args.burn_mag),
+                           ("pointing_sigma_deg", args.burn_pointing),
+                           ("time_sigma_days", args.burn_time)):
+            if value is not None:
+                spec["burns"][key] = value
+        if args.base:
+            spec["base"] = str(args.base)
+        if args.seed is not None:
+            spec["seed"] = args.seed
+        if not spec["fields"] and not spec["burns"]:
+            parser.error("indica un fichero de dispersión, algún --sigma o algún --burn-*")
+
+        out_dir = args.out or BATCH_DIR / datetime.now().strftime("montecarlo_%Y%m%d_%H%M%S")
+
+        def progress(done, total):
+            if done == total or done % max(1, total // 10) == 0:
+                print(f"  {done}/{total}")
+
+        summary = run_montecarlo(spec, out_dir, args.engine, max(1, args.workers),
+                                 args.runs, args.samples, args.keep_reports,
+                                 not args.no_plots, progress)
+    except (OSError, ValueError) as e:
+        print("❌", e)
+        return 2
+
+    for err in summary["errors"][:10]:
+        print(f"❌ muestra {err['sample']}: {err['error']}")
+    print(f"Resumen: {summary['n_ok']} ok, {summary['n_error']} con error, "
+          f"{summary['timings']['total']:.2f} s -> {out_dir / 'montecarlo.npz'}")
+    return 0 if summary["n_error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -1,48 +1,292 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from functools import lru_cache
+import os
+import re
 import subprocess
+import sys
+import uuid
 from pathlib import Path
-from shutil import copy2
+from shutil import copy2, rmtree, which
 
-from SOURCES.utils import OUTPUT_DIR
+import pandas as pd
 
+from SOURCES.gmat_api import GmatApiUnavailable, api_enabled, api_version, run_gmat_api
+from SOURCES.propagator import is_two_body
+from SOURCES.report_parser import CHUNK_BYTES, load_report_array, read_header
+from SOURCES.utils import OUTPUT_DIR, PROJECT_ROOT, SCRATCH_DIR
+from SOURCES.trace import traced
 
-def find_gmat():
-    posibles = [
-        Path(r"C:\Program Files (x86)\GMAT-R2019aBeta-Windows-x64-public\bin\GmatConsole.exe"),
-        Path(r"C:\Program Files\GMAT-R2019aBeta-Windows-x64-public\bin\GmatConsole.exe"),
-    ]
 
-    for p in posibles:
+# Ruta de GmatConsole: variable de entorno o fichero de configuración
+# (primera línea no vacía que no empiece por "#")
+GMAT_ENV = "AM1_GMAT"
+GMAT_CONFIG = PROJECT_ROOT / "gmat_path.txt"
+
+# Nombres que se buscan en el PATH
+GMAT_NAMES = ["GmatConsole", "GmatConsole.exe"]
+
+# Instalaciones por defecto en Windows
+GMAT_DEFAULT_PATHS = [
+    Path(r"C:\Program Files (x86)\GMAT-R2019aBeta-Windows-x64-public\bin\GmatConsole.exe"),
+    Path(r"C:\Program Files\GMAT-R2019aBeta-Windows-x64-public\bin\GmatConsole.exe"),
+]
+
+
+def _read_gmat_config(path: Path) -> str | None:
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return None
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            return line
+    return None
+
+
+@lru_cache(maxsize=None)
+def _locate_gmat(configured: str | None) -> Path | None:
+    """Búsqueda en el PATH y en las rutas por defecto (el resultado se guarda)."""
+    if configured:
+        return Path(configured).expanduser().resolve()
+
+    for name in GMAT_NAMES:
+        found = which(name)
+        if found:
+            return Path(found).resolve()
+
+    for p in GMAT_DEFAULT_PATHS:
         if p.exists():
             return p
+    return None
+
+
+def find_gmat() -> Path:
+    """
+    Ruta de GmatConsole, por orden: variable de entorno AM1_GMAT, fichero
+    gmat_path.txt en la raíz del proyecto, PATH y rutas por defecto de
+    Windows. La búsqueda se hace una vez por configuración; si el ejecutable
+    encontrado desaparece se vuelve a buscar.
+    """
+    configured = os.environ.get(GMAT_ENV, "").strip() or _read_gmat_config(GMAT_CONFIG)
+
+    exe = _locate_gmat(configured)
+    if exe is not None and not exe.exists():
+        _locate_gmat.cache_clear()
+        exe = _locate_gmat(configured)
+
+    if exe is None:
+        raise FileNotFoundError("GMAT R2019aBeta Console no encontrado")
+    if not exe.exists():
+        origen = GMAT_ENV if os.environ.get(GMAT_ENV, "").strip() else GMAT_CONFIG
+        raise FileNotFoundError(f"GmatConsole configurado en {origen} no existe: {exe}")
+    return exe
+
+
+def gmat_command(exe: Path) -> list:
+    """
+    Orden para lanzar `exe`. Un .py (p.ej. el simulador de
+    BENCHMARKS/fake_gmat) se ejecuta con el mismo intérprete.
+    """
+    if exe.suffix == ".py":
+        return [sys.executable, str(exe)]
+    return [str(exe)]
+
+
+def gmat_version() -> str:
+    """Identificador del ejecutable de GMAT (ruta, tamaño y fecha) para la caché."""
+    if api_enabled():
+        return api_version()
+    exe = find_gmat()
+    st = exe.stat()
+    return f"gmat:{exe}:{st.st_size}:{int(st.st_mtime)}"
+
+
+def select_engine(p: dict | None = None, preferred: str | None = None) -> str:
+    """
+    Decide qué motor usar: "gmat" o "native".
+    Se puede forzar con la variable de entorno AM1_ENGINE
+    (gmat/native/auto/analytic). En "auto" se usa GMAT si está instalado
+    (GmatConsole o gmatpy) y si no el propagador nativo. "analytic" es
+    como "auto" salvo que los casos de dos cuerpos puros (p de
+    normalize_config) van al camino analítico del motor nativo.
+    """
+    engine = (preferred or os.environ.get("AM1_ENGINE", "auto")).strip().lower()
+
+    if engine in ("gmat", "native"):
+        return engine
+
+    if engine == "analytic" and p is not None and is_two_body(p):
+        return "native"
+
+    try:
+        find_gmat()
+        return "gmat"
+    except FileNotFoundError:
+        return "gmat" if api_enabled() else "native"
+
+
+_FILENAME_RE = re.compile(r"^(\s*\w+\.Filename\s*=\s*)'([^']*)'\s*;", re.MULTILINE)
+
 
-    raise FileNotFoundError("GMAT R2019aBeta Console no encontrado")
+def rewrite_report_paths(script_text: str, workdir: Path) -> str:
+    """
+    Redirige todos los `X.Filename = '...'` del script a `workdir`
+    (mismo nombre de fichero, ruta absoluta), para que cada trabajo
+    escriba sus reports en su propia carpeta.
+    """
+    def repl(m):
+        name = Path(m.group(2)).name
+        return f"{m.group(1)}'{(workdir / name).as_posix()}';"
 
+    return _FILENAME_RE.sub(repl, script_text)
 
-def run_gmat(script_path: Path):
 
+def start_gmat_job(script_path: Path, workdir: Path,
+                   report_name: str = "DefaultReportFile.txt") -> tuple[subprocess.Popen, Path]:
+    """
+    Lanza GMAT sin esperar, con una copia del script cuyo ReportFile apunta
+    a `workdir`. Devuelve el proceso y la ruta donde se escribirá el report
+    `report_name`.
+    """
     gmat_exe = find_gmat()
-    gmat_bin = gmat_exe.parent
 
     script_path = script_path.resolve()
     if not script_path.exists():
         raise FileNotFoundError(f"No existe el script de GMAT: {script_path}")
 
-    #Ejecutar GMAT
-    subprocess.run(
-        [str(gmat_exe), str(script_path)],
-        check=True
-    )
+    workdir = workdir.resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
 
-    #Copiar el ReportFile desde GMAT/bin al proyecto
-    src = gmat_bin.parent / "output" / "DefaultReportFile.txt"
-    if not src.exists():
+    text = script_path.read_text(encoding="utf-8")
+    job_script = workdir / script_path.name
+    job_script.write_text(rewrite_report_paths(text, workdir), encoding="utf-8")
+
+    proc = subprocess.Popen(gmat_command(gmat_exe) + [str(job_script)], cwd=workdir)
+    return proc, workdir / report_name
+
+
+def check_gmat_job(proc: subprocess.Popen, report: Path):
+    """Errores al terminar un trabajo: código de salida o report ausente."""
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+    if not report.exists():
         raise FileNotFoundError(
-            f"GMAT terminó pero no se generó el report file: {src}"
+            f"GMAT terminó pero no se generó el report file: {report}"
         )
 
-    dst = OUTPUT_DIR / "DefaultReportFile.txt"
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    copy2(src, dst)
+def run_gmat_job(script_path: Path, workdir: Path,
+                 report_name: str = "DefaultReportFile.txt") -> Path:
+    """
+    Ejecuta GMAT con una copia del script cuyo ReportFile apunta a
+    `workdir`. Devuelve la ruta del report `report_name` generado allí.
+    """
+    proc, report = start_gmat_job(script_path, workdir, report_name)
+    proc.wait()
+    check_gmat_job(proc, report)
+    return report
+
+
+def demux_report(src: Path, dst: Path, sat: str, sat_name: str):
+    """
+    Copia a `dst` el report de un caso de un script por lotes
+    (build_gmat_batch_script) con las columnas `<sat>.X` renombradas a
+    `<sat_name>.X`: queda igual que si el caso se hubiera ejecutado solo.
+    Se copia por bloques de líneas completas, así que también se cambian
+    las cabeceras que GMAT repite a mitad de fichero.
+    """
+    if not src.exists():
+        raise FileNotFoundError(f"GMAT terminó pero no se generó el report file: {src}")
+
+    columns, _, _, header = read_header(src)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if not header or sat == sat_name:
+        copy2(src, dst)
+        return dst
+
+    prefix = f"{sat}."
+    renamed = [f"{sat_name}.{c[len(prefix):]}" if c.startswith(prefix) else c for c in columns]
+    text = header.rstrip(b"\r\n")
+    width = max(len(text) // len(columns), max(len(c) for c in renamed) + 1)
+    new_header = "".join(c.ljust(width) for c in renamed).encode("utf-8") + header[len(text):]
+
+    with src.open("rb") as fin, dst.open("wb") as fout:
+        while True:
+            block = fin.read(CHUNK_BYTES)
+            if not block:
+                break
+            block += fin.readline()
+            fout.write(block.replace(header, new_header))
+    return dst
+
+
+@traced("run_gmat")
+def run_gmat(script_path: Path, dst: Path = OUTPUT_DIR / "DefaultReportFile.txt") -> pd.DataFrame:
+    """
+    Ejecuta el script, deja el report (y su sidecar) en `dst` y devuelve
+    la tabla. Con gmatpy disponible (ver gmat_api.py) usa el motor ya
+    cargado, que manda el report ya parseado; si no, lanza un GmatConsole
+    y parsea el report copiado.
+    """
+    if api_enabled():
+        try:
+            return run_gmat_api(script_path, dst)
+        except GmatApiUnavailable as e:
+            print("⚠ gmatpy no disponible, se usa GmatConsole:", e)
+
+    workdir = SCRATCH_DIR / f"job_{uuid.uuid4().hex[:12]}"
+
+    try:
+        src = run_gmat_job(script_path, workdir)
+
+        #Copiar el ReportFile desde la carpeta del trabajo al proyecto
+        dst.parent.mkdir(parents=True, exist_ok=True)
+
+        copy2(src, dst)
+    finally:
+        rmtree(workdir, ignore_errors=True)
 
     print("✅ ReportFile copiado a:", dst)
+    columns, data = load_report_array(dst)
+    return pd.DataFrame(data, columns=columns, copy=False)
+
+
+class GmatPool:
+    """
+    Pool de trabajos GMAT concurrentes. Cada trabajo tiene su carpeta
+    DATA/scratch/<nombre>/ y el resultado (ruta del report) llega por un
+    Future. Cada trabajo ya es un proceso GmatConsole independiente, así
+    que basta un pool de hilos para lanzarlos y esperar por ellos.
+    """
+
+    def __init__(self, max_workers: int | None = None, scratch_root: Path = SCRATCH_DIR,
+                 cleanup: bool = False):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.scratch_root = scratch_root
+        self.cleanup = cleanup
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._workdirs = []
+
+    def submit(self, script_path: Path, job_name: str | None = None) -> Future:
+        job_name = job_name or f"job_{uuid.uuid4().hex[:12]}"
+        workdir = self.scratch_root / job_name
+        self._workdirs.append(workdir)
+        return self._executor.submit(run_gmat_job, script_path, workdir)
+
+    def map(self, script_paths: list) -> list:
+        """Ejecuta todos los scripts y devuelve las rutas de report en orden."""
+        futures = [self.submit(s) for s in script_paths]
+        return [f.result() for f in futures]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+        if self.cleanup:
+            for d in self._workdirs:
+                rmtree(d, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
@@ -5,260 +5,28 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Signal
 
 from pathlib import Path
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qtagg import NavigationToolbar2QT
 
 from SOURCES.utils import INPUT_DIR, OUTPUT_DIR
+from SOURCES.trace import span
 from PySide6.QtWidgets import QLabel, QHBoxLayout
 from PySide6.QtGui import QPixmap
 from PySide6.QtCore import Qt
 
 
-DARK_BG = "#121212"
+# Las figuras (NumPy, pandas, matplotlib) viven en GUI_plots y se importan
+# al usarlas, para que la ventana principal aparezca sin cargarlas.
+_PLOTS_NAMES = {
+    "DARK_BG", "style_dark_2d", "style_dark_3d", "load_report", "leer_tiempos_burn",
+    "figure_arrays", "figure_factories", "make_figures", "HoverIndex",
+    "PlotsWindow", "LivePlotWindow",
+}
 
 
-def style_dark_2d(ax, fig):
-    fig.patch.set_facecolor(DARK_BG)
-    ax.set_facecolor(DARK_BG)
-
-    ax.tick_params(colors="white")
-    ax.xaxis.label.set_color("white")
-    ax.yaxis.label.set_color("white")
-    ax.title.set_color("white")
-
-    for spine in ax.spines.values():
-        spine.set_color("white")
-
-    ax.grid(True, alpha=0.25)
-
-
-def style_dark_3d(ax, fig):
-    fig.patch.set_facecolor(DARK_BG)
-    ax.set_facecolor(DARK_BG)
-
-    ax.tick_params(colors="white")
-    ax.xaxis.label.set_color("white")
-    ax.yaxis.label.set_color("white")
-    ax.zaxis.label.set_color("white")
-    ax.title.set_color("white")
-
-    try:
-        ax.xaxis.pane.set_facecolor((0.07, 0.07, 0.07, 1.0))
-        ax.yaxis.pane.set_facecolor((0.07, 0.07, 0.07, 1.0))
-        ax.zaxis.pane.set_facecolor((0.07, 0.07, 0.07, 1.0))
-        ax.xaxis.pane.set_edgecolor("white")
-        ax.yaxis.pane.set_edgecolor("white")
-        ax.zaxis.pane.set_edgecolor("white")
-    except Exception:
-        pass
-
-
-def load_report(path: Path) -> pd.DataFrame:
-    if not path.exists():
-        raise FileNotFoundError(f"No se encuentra el report: {path}")
-
-    df = pd.read_csv(path, sep=r"\s+", engine="python")
-    df = df.apply(pd.to_numeric, errors="coerce").dropna()
-
-    if df.shape[1] < 7:
-        raise ValueError(
-            f"El report tiene {df.shape[1]} columnas, pero se esperaban al menos 7."
-        )
-
-    return df
-
-
-def leer_tiempos_burn(datos_path: Path):
-    tiempos = []
-    if not datos_path.exists():
-        return tiempos
-
-    with datos_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            s = line.strip().lower()
-            if s.startswith("tiempo burn"):
-                if ":" in s:
-                    _, val = s.split(":", 1)
-                    val = val.strip().replace(",", ".")
-                    try:
-                        tiempos.append(float(val))
-                    except ValueError:
-                        pass
-    return tiempos
-
-
-def make_figures(df: pd.DataFrame, datos_path: Path):
-    plt.close("all")
-
-    cols = df.columns.tolist()
-    t = df[cols[0]].values
-    x = df[cols[1]].values
-    y = df[cols[2]].values
-    z = df[cols[3]].values
-    vx = df[cols[4]].values
-    vy = df[cols[5]].values
-    vz = df[cols[6]].values
-
-    speed = np.sqrt(vx**2 + vy**2 + vz**2)
-    r = np.sqrt(x**2 + y**2 + z**2)
-
-    burn_times = leer_tiempos_burn(datos_path)
-
-    figures = []
-
-    # 1) Trayectoria 3D
-    fig1 = plt.figure()
-    ax1 = fig1.add_subplot(111, projection="3d")
-    ax1.plot(x, y, z, color="cyan")
-    ax1.set_title("Trayectoria 3D")
-    ax1.set_xlabel("X [km]")
-    ax1.set_ylabel("Y [km]")
-    ax1.set_zlabel("Z [km]")
-    ax1.set_box_aspect([1, 1, 1])
-    style_dark_3d(ax1, fig1)
-    figures.append(fig1)
-
-    # 2) Órbita XY
-    fig2, ax2 = plt.subplots()
-    ax2.plot(x, y, color="cyan")
-    ax2.set_title("Órbita en el plano XY")
-    ax2.set_xlabel("X [km]")
-    ax2.set_ylabel("Y [km]")
-    ax2.axis("equal")
-    style_dark_2d(ax2, fig2)
-    figures.append(fig2)
-
-    # 3) Componentes velocidad vs tiempo
-    fig3, ax3 = plt.subplots()
-    ax3.plot(t, vx, label="Vx", color="cyan")
-    ax3.plot(t, vy, label="Vy", color="orange")
-    ax3.plot(t, vz, label="Vz", color="lime")
-    for tb in burn_times:
-        ax3.axvline(tb, color="white", linestyle="--", alpha=0.6)
-    ax3.set_title("Componentes de velocidad vs Tiempo")
-    ax3.set_xlabel("Tiempo [días]")
-    ax3.set_ylabel("Velocidad [km/s]")
-    ax3.legend()
-    style_dark_2d(ax3, fig3)
-    figures.append(fig3)
-
-    # 4) |V| vs tiempo
-    fig4, ax4 = plt.subplots()
-    ax4.plot(t, speed, label="|V|", color="cyan")
-    for tb in burn_times:
-        ax4.axvline(tb, color="white", linestyle="--", alpha=0.6)
-    ax4.set_title("Módulo de la velocidad vs Tiempo")
-    ax4.set_xlabel("Tiempo [días]")
-    ax4.set_ylabel("|V| [km/s]")
-    ax4.legend()
-    style_dark_2d(ax4, fig4)
-    figures.append(fig4)
-
-    # 5) r vs tiempo
-    fig5, ax5 = plt.subplots()
-    ax5.plot(t, r, label="r", color="cyan")
-    for tb in burn_times:
-        ax5.axvline(tb, color="white", linestyle="--", alpha=0.6)
-    ax5.set_title("Distancia al cuerpo central vs Tiempo")
-    ax5.set_xlabel("Tiempo [días]")
-    ax5.set_ylabel("r [km]")
-    ax5.legend()
-    style_dark_2d(ax5, fig5)
-    figures.append(fig5)
-
-    return figures
-
-
-class PlotsWindow(QWidget):
-    def __init__(self, figures, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Resultados de la simulación")
-        self.resize(1100, 800)
-
-        layout = QVBoxLayout(self)
-        self.tabs = QTabWidget()
-        layout.addWidget(self.tabs)
-
-        tab_names = [
-            "Trayectoria 3D",
-            "Órbita XY",
-            "Velocidades",
-            "|V| vs tiempo",
-            "Distancia r",
-        ]
-
-        self._canvases = []
-        self._hover_ann = {}
-
-        for fig, name in zip(figures, tab_names):
-            tab = QWidget()
-            tab_layout = QVBoxLayout(tab)
-
-            canvas = FigureCanvas(fig)
-            toolbar = NavigationToolbar2QT(canvas, self)
-
-            tab_layout.addWidget(toolbar)
-            tab_layout.addWidget(canvas)
-            self.tabs.addTab(tab, name)
-
-            self._canvases.append(canvas)
-            self._enable_hover(canvas)
-
-            canvas.draw()
-
-    def _enable_hover(self, canvas: FigureCanvas):
-        fig = canvas.figure
-        axes = fig.get_axes()
-        if not axes:
-            return
-        ax = axes[0]
-
-        if ax.name == "3d":
-            return
-
-        ann = ax.annotate(
-            "",
-            xy=(0, 0),
-            xytext=(10, 10),
-            textcoords="offset points",
-            color="white",
-            bbox=dict(boxstyle="round", fc="black", ec="white", alpha=0.7),
-        )
-        ann.set_visible(False)
-        self._hover_ann[canvas] = ann
-
-        def on_move(event):
-            if event.inaxes != ax:
-                ann.set_visible(False)
-                canvas.draw_idle()
-                return
-
-            for line in ax.lines:
-                if hasattr(line.get_xdata(), "size") and line.get_xdata().size <= 2 and line.get_linestyle() == "--":
-                    continue
-
-                contains, info = line.contains(event)
-                if contains:
-                    idx = info["ind"][0]
-                    xd = line.get_xdata()
-                    yd = line.get_ydata()
-                    if idx < len(xd) and idx < len(yd):
-                        x0 = float(xd[idx])
-                        y0 = float(yd[idx])
-                        ann.xy = (x0, y0)
-                        ann.set_text(f"x={x0:.4g}\ny={y0:.4g}")
-                        ann.set_visible(True)
-                        canvas.draw_idle()
-                        return
-
-            ann.set_visible(False)
-            canvas.draw_idle()
-
-        canvas.mpl_connect("motion_notify_event", on_move)
-
+def __getattr__(name):
+    if name in _PLOTS_NAMES:
+        from SOURCES import GUI_plots
+        return getattr(GUI_plots, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Main Window
@@ -503,12 +271,23 @@ class MainWindow(QWidget):
         self.btn_plots = QPushButton("Ver gráficas")
         self.btn_plots.clicked.connect(self.mostrar_graficas)
 
+        # Estado de la cola del pipeline (ver PipelineExecutor en Main.py)
+        self.lbl_pipeline = QLabel("Pipeline: listo")
+        self.btn_cancelar = QPushButton("Cancelar ejecución")
+        self.btn_cancelar.setEnabled(False)
+
+        fila_pipeline = QHBoxLayout()
+        fila_pipeline.addWidget(self.lbl_pipeline, 1)
+        fila_pipeline.addWidget(self.btn_cancelar)
+
         layout.addWidget(tabs)
         layout.addWidget(self.btn_guardar)
         layout.addWidget(self.btn_plots)
+        layout.addLayout(fila_pipeline)
         self.setLayout(layout)
 
         self.plots_window = None
+        self.live_window = None
 
 
     def actualizar_formato_tiempo(self):
@@ -660,6 +439,23 @@ class MainWindow(QWidget):
         self.datos_guardados.emit()
 
 
+    def set_pipeline_status(self, depth: int, text: str):
+        self.lbl_pipeline.setText(f"Pipeline: {text} | en cola: {depth}")
+        self.btn_cancelar.setEnabled(depth > 0)
+
+    # Gráficas en vivo
+    def reset_live_plot(self):
+        if self.live_window is not None:
+            self.live_window.clear()
+
+    def append_live_rows(self, rows):
+        if self.live_window is None:
+            from SOURCES.GUI_plots import LivePlotWindow
+            self.live_window = LivePlotWindow(parent=None)
+        if not self.live_window.isVisible():
+            self.live_window.show()
+        self.live_window.append_rows(rows)
+
     # Gráficas
     def mostrar_graficas(self):
         report_path = OUTPUT_DIR / "DefaultReportFile.txt"
@@ -669,12 +465,15 @@ class MainWindow(QWidget):
             print("❌ El report de GMAT no existe todavía:", report_path)
             return
 
-        try:
-            df = load_report(report_path)
-            figures = make_figures(df, datos_path)
-        except Exception as e:
-            print("❌ Error generando figuras:", e)
-            return
+        with span("mostrar_graficas") as sp:
+            from SOURCES.GUI_plots import load_report, figure_factories, PlotsWindow
+            try:
+                df = load_report(report_path)
+                figures = figure_factories(df, datos_path)
+            except Exception as e:
+                print("❌ Error generando figuras:", e)
+                return
 
-        self.plots_window = PlotsWindow(figures, parent=None)
-        self.plots_window.show()
+            sp.set(rows=len(df))
+            self.plots_window = PlotsWindow(figures, parent=None)
+            self.plots_window.show()
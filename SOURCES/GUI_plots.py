@@ -0,0 +1,541 @@
+"""
+Parte gráfica de la interfaz: figuras de resultados (PlotsWindow) y
+gráficas en vivo (LivePlotWindow).
+
+Está separada de GUI.py para que el arranque solo cargue PySide6 y el
+formulario: NumPy, pandas y matplotlib se importan la primera vez que se
+usan (o en segundo plano tras mostrar la ventana, ver Main.py).
+"""
+from PySide6.QtWidgets import QWidget, QTabWidget, QVBoxLayout
+from PySide6.QtCore import QTimer
+
+from functools import partial
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qtagg import NavigationToolbar2QT
+
+from SOURCES.report_stream import GrowableArray
+from SOURCES.report_parser import load_report_array
+from SOURCES.decimation import orbit_indices, series_indices
+from SOURCES.trace import span, traced
+
+
+DARK_BG = "#121212"
+
+
+def style_dark_2d(ax, fig):
+    fig.patch.set_facecolor(DARK_BG)
+    ax.set_facecolor(DARK_BG)
+
+    ax.tick_params(colors="white")
+    ax.xaxis.label.set_color("white")
+    ax.yaxis.label.set_color("white")
+    ax.title.set_color("white")
+
+    for spine in ax.spines.values():
+        spine.set_color("white")
+
+    ax.grid(True, alpha=0.25)
+
+
+def style_dark_3d(ax, fig):
+    fig.patch.set_facecolor(DARK_BG)
+    ax.set_facecolor(DARK_BG)
+
+    ax.tick_params(colors="white")
+    ax.xaxis.label.set_color("white")
+    ax.yaxis.label.set_color("white")
+    ax.zaxis.label.set_color("white")
+    ax.title.set_color("white")
+
+    try:
+        ax.xaxis.pane.set_facecolor((0.07, 0.07, 0.07, 1.0))
+        ax.yaxis.pane.set_facecolor((0.07, 0.07, 0.07, 1.0))
+        ax.zaxis.pane.set_facecolor((0.07, 0.07, 0.07, 1.0))
+        ax.xaxis.pane.set_edgecolor("white")
+        ax.yaxis.pane.set_edgecolor("white")
+        ax.zaxis.pane.set_edgecolor("white")
+    except Exception:
+        pass
+
+
+@traced("load_report", rows=True)
+def load_report(path: Path) -> pd.DataFrame:
+    columns, data = load_report_array(path)
+    df = pd.DataFrame(data, columns=columns, copy=False)
+
+    if df.shape[1] < 7:
+        raise ValueError(
+            f"El report tiene {df.shape[1]} columnas, pero se esperaban al menos 7."
+        )
+
+    return df
+
+
+def leer_tiempos_burn(datos_path: Path):
+    tiempos = []
+    if not datos_path.exists():
+        return tiempos
+
+    with datos_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            s = line.strip().lower()
+            if s.startswith("tiempo burn"):
+                if ":" in s:
+                    _, val = s.split(":", 1)
+                    val = val.strip().replace(",", ".")
+                    try:
+                        tiempos.append(float(val))
+                    except ValueError:
+                        pass
+    return tiempos
+
+
+def plot_lod_series(ax, t, series, styles, burn_times, r):
+    """
+    Dibuja varias series y(t) submuestreadas y, al hacer zoom/pan con la
+    NavigationToolbar, vuelve a submuestrear solo el intervalo visible.
+    """
+    idx = series_indices(t, series, burn_times, r)
+    lines = [ax.plot(t[idx], y[idx], **st)[0] for y, st in zip(series, styles)]
+
+    def on_xlim(ax):
+        lo, hi = ax.get_xlim()
+        i0 = max(int(np.searchsorted(t, lo)) - 1, 0)
+        i1 = min(int(np.searchsorted(t, hi, side="right")) + 1, len(t))
+        if i1 - i0 < 2:
+            return
+        sub = i0 + series_indices(t[i0:i1], [y[i0:i1] for y in series],
+                                  burn_times, r[i0:i1])
+        for line, y in zip(lines, series):
+            line.set_data(t[sub], y[sub])
+
+    ax.callbacks.connect("xlim_changed", on_xlim)
+    return lines
+
+
+def plot_lod_orbit_xy(ax, x, y, t, burn_times, r, **style):
+    """
+    Órbita XY submuestreada por curvatura. Al hacer zoom se submuestrean solo
+    los puntos visibles; donde la órbita sale de la vista se corta la línea
+    (NaN) para no unir tramos que no son consecutivos.
+    """
+    idx = orbit_indices(np.column_stack([x, y]), t, burn_times, r)
+    (line,) = ax.plot(x[idx], y[idx], **style)
+
+    def on_lim(ax):
+        (x0, x1), (y0, y1) = ax.get_xlim(), ax.get_ylim()
+        visible = (x >= min(x0, x1)) & (x <= max(x0, x1)) & \
+                  (y >= min(y0, y1)) & (y <= max(y0, y1))
+        # Un punto más a cada lado para que la línea llegue al borde
+        inside = visible.copy()
+        inside[:-1] |= visible[1:]
+        inside[1:] |= visible[:-1]
+        vis = np.flatnonzero(inside)
+        if len(vis) < 2:
+            return
+
+        sub = vis[orbit_indices(np.column_stack([x[vis], y[vis]]), t[vis],
+                                burn_times, r[vis])]
+        # Hueco si entre dos índices consecutivos hay puntos fuera de la vista
+        outside = np.concatenate([[0], np.cumsum(~inside)])
+        gap = outside[sub[1:]] - outside[sub[:-1] + 1] > 0
+
+        xs, ys = x[sub].astype(float), y[sub].astype(float)
+        if gap.any():
+            cut = np.flatnonzero(gap) + 1
+            xs = np.insert(xs, cut, np.nan)
+            ys = np.insert(ys, cut, np.nan)
+        line.set_data(xs, ys)
+
+    ax.callbacks.connect("xlim_changed", on_lim)
+    ax.callbacks.connect("ylim_changed", on_lim)
+    return line
+
+
+def figure_arrays(df: pd.DataFrame, datos_path: Path) -> dict:
+    """Arrays del report que usan las figuras (se calculan una sola vez)."""
+    cols = df.columns.tolist()
+    d = {
+        "t":  df[cols[0]].values,
+        "x":  df[cols[1]].values,
+        "y":  df[cols[2]].values,
+        "z":  df[cols[3]].values,
+        "vx": df[cols[4]].values,
+        "vy": df[cols[5]].values,
+        "vz": df[cols[6]].values,
+    }
+    d["speed"] = np.sqrt(d["vx"]**2 + d["vy"]**2 + d["vz"]**2)
+    d["r"] = np.sqrt(d["x"]**2 + d["y"]**2 + d["z"]**2)
+    d["burn_times"] = leer_tiempos_burn(datos_path)
+    return d
+
+
+# 1) Trayectoria 3D (submuestreada una vez; el zoom 3D no cambia el rango)
+def build_trayectoria_3d(d: dict):
+    x, y, z = d["x"], d["y"], d["z"]
+    idx3d = orbit_indices(np.column_stack([x, y, z]), d["t"], d["burn_times"], d["r"])
+    fig1 = plt.figure()
+    ax1 = fig1.add_subplot(111, projection="3d")
+    ax1.plot(x[idx3d], y[idx3d], z[idx3d], color="cyan")
+    ax1.set_title("Trayectoria 3D")
+    ax1.set_xlabel("X [km]")
+    ax1.set_ylabel("Y [km]")
+    ax1.set_zlabel("Z [km]")
+    ax1.set_box_aspect([1, 1, 1])
+    style_dark_3d(ax1, fig1)
+    return fig1
+
+
+# 2) Órbita XY
+def build_orbita_xy(d: dict):
+    fig2, ax2 = plt.subplots()
+    plot_lod_orbit_xy(ax2, d["x"], d["y"], d["t"], d["burn_times"], d["r"], color="cyan")
+    ax2.set_title("Órbita en el plano XY")
+    ax2.set_xlabel("X [km]")
+    ax2.set_ylabel("Y [km]")
+    ax2.axis("equal")
+    style_dark_2d(ax2, fig2)
+    return fig2
+
+
+# 3) Componentes velocidad vs tiempo
+def build_velocidades(d: dict):
+    fig3, ax3 = plt.subplots()
+    plot_lod_series(ax3, d["t"], [d["vx"], d["vy"], d["vz"]], [
+        dict(label="Vx", color="cyan"),
+        dict(label="Vy", color="orange"),
+        dict(label="Vz", color="lime"),
+    ], d["burn_times"], d["r"])
+    for tb in d["burn_times"]:
+        ax3.axvline(tb, color="white", linestyle="--", alpha=0.6)
+    ax3.set_title("Componentes de velocidad vs Tiempo")
+    ax3.set_xlabel("Tiempo [días]")
+    ax3.set_ylabel("Velocidad [km/s]")
+    ax3.legend()
+    style_dark_2d(ax3, fig3)
+    return fig3
+
+
+# 4) |V| vs tiempo
+def build_velocidad_modulo(d: dict):
+    fig4, ax4 = plt.subplots()
+    plot_lod_series(ax4, d["t"], [d["speed"]], [dict(label="|V|", color="cyan")],
+                    d["burn_times"], d["r"])
+    for tb in d["burn_times"]:
+        ax4.axvline(tb, color="white", linestyle="--", alpha=0.6)
+    ax4.set_title("Módulo de la velocidad vs Tiempo")
+    ax4.set_xlabel("Tiempo [días]")
+    ax4.set_ylabel("|V| [km/s]")
+    ax4.legend()
+    style_dark_2d(ax4, fig4)
+    return fig4
+
+
+# 5) r vs tiempo
+def build_radio(d: dict):
+    fig5, ax5 = plt.subplots()
+    plot_lod_series(ax5, d["t"], [d["r"]], [dict(label="r", color="cyan")],
+                    d["burn_times"], d["r"])
+    for tb in d["burn_times"]:
+        ax5.axvline(tb, color="white", linestyle="--", alpha=0.6)
+    ax5.set_title("Distancia al cuerpo central vs Tiempo")
+    ax5.set_xlabel("Tiempo [días]")
+    ax5.set_ylabel("r [km]")
+    ax5.legend()
+    style_dark_2d(ax5, fig5)
+    return fig5
+
+
+FIGURE_BUILDERS = [
+    build_trayectoria_3d,
+    build_orbita_xy,
+    build_velocidades,
+    build_velocidad_modulo,
+    build_radio,
+]
+
+
+# Figuras de resultados creadas por figure_factories (las de la ventana en
+# vivo no: siguen abiertas mientras se cargan los resultados)
+_result_figures = []
+
+
+def _build_figure(builder, d: dict):
+    fig = builder(d)
+    _result_figures.append(fig)
+    return fig
+
+
+def figure_factories(df: pd.DataFrame, datos_path: Path) -> list:
+    """
+    Una función sin argumentos por pestaña que construye su figura. Los
+    arrays se calculan aquí una vez y las figuras se crean al pedirlas.
+    Se cierran las figuras de resultados anteriores.
+    """
+    for fig in _result_figures:
+        plt.close(fig)
+    _result_figures.clear()
+    d = figure_arrays(df, datos_path)
+    return [partial(_build_figure, builder, d) for builder in FIGURE_BUILDERS]
+
+
+@traced("make_figures")
+def make_figures(df: pd.DataFrame, datos_path: Path):
+    return [factory() for factory in figure_factories(df, datos_path)]
+
+
+HOVER_TOL_PX = 10
+
+
+class HoverIndex:
+    """
+    Puntos dibujados de una línea ordenados por x. El punto más cercano al
+    cursor se busca con searchsorted en la franja |x - x_cursor| <= tol
+    (O(log n) + los pocos puntos de esa franja) en vez de recorrer la línea.
+    """
+
+    def __init__(self, xd, yd):
+        x = np.asarray(xd, dtype=float)
+        y = np.asarray(yd, dtype=float)
+        ok = np.isfinite(x) & np.isfinite(y)
+        x, y = x[ok], y[ok]
+
+        # Las series temporales ya vienen ordenadas; la órbita XY no
+        if len(x) > 1 and np.any(np.diff(x) < 0):
+            order = np.argsort(x, kind="stable")
+            x, y = x[order], y[order]
+        self.x = x
+        self.y = y
+
+    def nearest(self, ax, px: float, py: float, tol_px: float):
+        """(distancia en px, x, y) del punto más cercano a (px, py) o None."""
+        if len(self.x) == 0:
+            return None
+
+        inv = ax.transData.inverted()
+        (xa, _), (xb, _) = inv.transform([(px - tol_px, py), (px + tol_px, py)])
+        lo = np.searchsorted(self.x, min(xa, xb), side="left")
+        hi = np.searchsorted(self.x, max(xa, xb), side="right")
+        if hi <= lo:
+            return None
+
+        pts = ax.transData.transform(np.column_stack([self.x[lo:hi], self.y[lo:hi]]))
+        dist = np.hypot(pts[:, 0] - px, pts[:, 1] - py)
+        k = int(np.argmin(dist))
+        if dist[k] > tol_px:
+            return None
+        return float(dist[k]), float(self.x[lo + k]), float(self.y[lo + k])
+
+
+class PlotsWindow(QWidget):
+    """
+    Ventana de resultados. `figures` puede traer figuras ya hechas o
+    funciones que las construyen (figure_factories): en ese caso cada
+    figura se crea y se dibuja la primera vez que su pestaña se ve.
+    """
+
+    def __init__(self, figures, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Resultados de la simulación")
+        self.resize(1100, 800)
+
+        layout = QVBoxLayout(self)
+        self.tabs = QTabWidget()
+        layout.addWidget(self.tabs)
+
+        tab_names = [
+            "Trayectoria 3D",
+            "Órbita XY",
+            "Velocidades",
+            "|V| vs tiempo",
+            "Distancia r",
+        ]
+
+        self._canvases = []
+        self._hover_ann = {}
+        self._pending = {}
+
+        for i, (fig, name) in enumerate(zip(figures, tab_names)):
+            tab = QWidget()
+            QVBoxLayout(tab)
+            self.tabs.addTab(tab, name)
+            self._pending[i] = fig
+
+        self.tabs.currentChanged.connect(self._ensure_tab)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Primero se pinta la ventana; la pestaña visible se construye después
+        QTimer.singleShot(0, lambda: self._ensure_tab(self.tabs.currentIndex()))
+
+    def _ensure_tab(self, index: int):
+        fig = self._pending.pop(index, None)
+        if fig is None:
+            return
+
+        with span("show_figure", tab=self.tabs.tabText(index)):
+            if callable(fig):
+                try:
+                    fig = fig()
+                except Exception as e:
+                    print("❌ Error generando figura:", e)
+                    return
+
+            tab_layout = self.tabs.widget(index).layout()
+
+            canvas = FigureCanvas(fig)
+            toolbar = NavigationToolbar2QT(canvas, self)
+
+            tab_layout.addWidget(toolbar)
+            tab_layout.addWidget(canvas)
+
+            self._canvases.append(canvas)
+            self._enable_hover(canvas)
+
+            canvas.draw()
+
+    def _enable_hover(self, canvas: FigureCanvas):
+        fig = canvas.figure
+        axes = fig.get_axes()
+        if not axes:
+            return
+        ax = axes[0]
+
+        if ax.name == "3d":
+            return
+
+        # animated: no entra en el draw normal, se pinta encima con blit
+        ann = ax.annotate(
+            "",
+            xy=(0, 0),
+            xytext=(10, 10),
+            textcoords="offset points",
+            color="white",
+            bbox=dict(boxstyle="round", fc="black", ec="white", alpha=0.7),
+            animated=True,
+        )
+        ann.set_visible(False)
+        self._hover_ann[canvas] = ann
+
+        state = {"bg": None, "hit": None, "index": {}}
+
+        def data_lines():
+            # Las líneas de burn (axvline discontinua) no cuentan
+            return [
+                line for line in ax.lines
+                if not (np.size(line.get_xdata()) <= 2 and line.get_linestyle() == "--")
+            ]
+
+        def index_for(line):
+            # Se reconstruye solo si la línea cambió de datos (p.ej. al hacer zoom)
+            xd = line.get_xdata()
+            cached = state["index"].get(line)
+            if cached is None or cached[0] is not xd:
+                cached = (xd, HoverIndex(xd, line.get_ydata()))
+                state["index"][line] = cached
+            return cached[1]
+
+        def on_draw(event):
+            state["bg"] = canvas.copy_from_bbox(fig.bbox)
+            state["hit"] = None
+            if ann.get_visible():
+                ax.draw_artist(ann)
+
+        def blit():
+            if state["bg"] is None:
+                return
+            canvas.restore_region(state["bg"])
+            if ann.get_visible():
+                ax.draw_artist(ann)
+            canvas.blit(fig.bbox)
+
+        def on_move(event):
+            hit = None
+            if event.inaxes == ax:
+                best = None
+                for line in data_lines():
+                    found = index_for(line).nearest(ax, event.x, event.y, HOVER_TOL_PX)
+                    if found is not None and (best is None or found[0] < best[0]):
+                        best = found
+                if best is not None:
+                    hit = (best[1], best[2])
+
+            # Mismo punto que en el último evento: no se redibuja nada
+            if hit == state["hit"]:
+                return
+            state["hit"] = hit
+
+            if hit is None:
+                ann.set_visible(False)
+            else:
+                ann.xy = hit
+                ann.set_text(f"x={hit[0]:.4g}\ny={hit[1]:.4g}")
+                ann.set_visible(True)
+            blit()
+
+        canvas.mpl_connect("draw_event", on_draw)
+        canvas.mpl_connect("motion_notify_event", on_move)
+
+
+class LivePlotWindow(QWidget):
+    """
+    Gráficas en vivo mientras GMAT escribe el report: las filas nuevas se
+    añaden a las líneas ya existentes (set_data) en vez de rehacer la figura.
+    Solo se dibujan los puntos submuestreados (SOURCES/decimation.py), así
+    que el coste de cada redibujo no crece con las filas acumuladas.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Simulación en curso")
+        self.resize(900, 450)
+
+        self.fig, (self.ax_xy, self.ax_r) = plt.subplots(1, 2)
+        self.canvas = FigureCanvas(self.fig)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.canvas)
+
+        (self.line_xy,) = self.ax_xy.plot([], [], color="cyan")
+        self.ax_xy.set_title("Órbita en el plano XY")
+        self.ax_xy.set_xlabel("X [km]")
+        self.ax_xy.set_ylabel("Y [km]")
+        style_dark_2d(self.ax_xy, self.fig)
+
+        (self.line_r,) = self.ax_r.plot([], [], color="cyan")
+        self.ax_r.set_title("Distancia al cuerpo central vs Tiempo")
+        self.ax_r.set_xlabel("Tiempo [días]")
+        self.ax_r.set_ylabel("r [km]")
+        style_dark_2d(self.ax_r, self.fig)
+
+        self.fig.tight_layout()
+        self.clear()
+
+    def clear(self):
+        self._data = GrowableArray()
+        self._r = GrowableArray(1)
+        self.line_xy.set_data([], [])
+        self.line_r.set_data([], [])
+        self.canvas.draw_idle()
+
+    def append_rows(self, rows):
+        if rows.shape[1] < 7:
+            return
+        self._data.append(rows)
+        self._r.append(np.sqrt(np.sum(rows[:, 1:4]**2, axis=1))[:, None])
+
+        data = self._data.view()
+        t, r = data[:, 0], self._r.view()[:, 0]
+        idx_xy = orbit_indices(data[:, 1:3], t, (), r)
+        idx_r = series_indices(t, [r], (), r)
+        self.line_xy.set_data(data[idx_xy, 1], data[idx_xy, 2])
+        self.line_r.set_data(t[idx_r], r[idx_r])
+
+        for ax in (self.ax_xy, self.ax_r):
+            ax.relim()
+            ax.autoscale_view()
+        self.canvas.draw_idle()
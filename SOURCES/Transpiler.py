@@ -1,8 +1,10 @@
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 import subprocess
 import sys
 from SOURCES.utils import INPUT_DIR, GMAT_DIR, OUTPUT_DIR
+from SOURCES.trace import traced
 
 
 DATA_FILE   = INPUT_DIR / "datos_guardados.txt"
@@ -175,7 +177,105 @@ def map_report_variable(label: str, sat_name: str) -> str | None:
     # Si no lo tenemos mapeado todavía, devolvemos None
     return None
 
-def build_gmat_script(cfg: dict, script_path: Path):
+# strptime es lo más caro de normalize_config: en un barrido o un Monte
+# Carlo todas las configs tienen las mismas fechas
+@lru_cache(maxsize=256)
+def normalize_epoch(epoch: str) -> str:
+    """
+    Convierte lo que viene de la GUI en un string tipo:
+    '08 Dec 2024 12:00:00.000'
+    Soporta:
+    - '08 Dec 2024'
+    - '08/12/2024'
+    - '08 Dec 2024 10:30:00'
+    - '08/12/2024 10:30:00'
+    Si falla, devuelve una fecha por defecto.
+    """
+    s = epoch.strip()
+    if not s:
+        return "01 Jan 2030 12:00:00.000"
+
+    # Caso con hora incluida
+    if ":" in s:
+        for fmt in ("%d %b %Y %H:%M:%S", "%d/%m/%Y %H:%M:%S"):
+            try:
+                dt = datetime.strptime(s, fmt)
+                return dt.strftime("%d %b %Y %H:%M:%S.000")
+            except ValueError:
+                pass
+        if not s.endswith(".000"):
+            return s + ".000"
+        return s
+
+    # Solo fecha
+    for fmt in ("%d %b %Y", "%d/%m/%Y"):
+        try:
+            dt = datetime.strptime(s, fmt)
+            return dt.strftime("%d %b %Y 12:00:00.000")
+        except ValueError:
+            pass
+
+    return "01 Jan 2030 12:00:00.000"
+
+
+@lru_cache(maxsize=256)
+def parse_date_only(s: str):
+    s = s.strip()
+    if not s:
+        return None
+    for fmt in ("%d %b %Y", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            pass
+    return None
+
+
+def normalize_burn(ib: dict, name: str, central_es: str,
+                   coord_system: str, dur_days: float) -> dict:
+    """Valores ya convertidos de una sección IMPULSIVE BURN."""
+    coord_raw = ib.get("Sistema de coordenadas", "Local").strip()
+    origin_es = ib.get("Origen", central_es)
+    axes      = ib.get("Axes", "VNB").strip()
+
+    dv1 = to_float(ib.get("Delta V Element 1", "0"), 0.0)
+    dv2 = to_float(ib.get("Delta V Element 2", "0"), 0.0)
+    dv3 = to_float(ib.get("Delta V Element 3", "0"), 0.0)
+
+    active = (abs(dv1) + abs(dv2) + abs(dv3)) > 0.0
+
+    burn_time_str = ib.get("Tiempo burn", "").strip()
+    t_burn = None
+    if active and burn_time_str != "":
+        t_burn = to_float(burn_time_str, 0.0)
+        # Acotamos entre 0 y dur_days
+        if t_burn < 0.0:
+            t_burn = 0.0
+        if t_burn > dur_days:
+            t_burn = dur_days
+
+    if coord_raw == "Local":
+        coord_gmat = coord_system
+    else:
+        coord_gmat = coord_raw
+
+    return {
+        "name": name,
+        "active": active,
+        "coord_system": coord_gmat,
+        "origin": map_body(origin_es),
+        "axes": axes,
+        "dv": (dv1, dv2, dv3),
+        "t": t_burn,
+    }
+
+
+def normalize_config(cfg: dict) -> dict:
+    """
+    Convierte el diccionario de parse_gui_txt en valores ya listos para usar
+    (números, nombres GMAT, duración...). Es lo que consumen tanto
+    build_gmat_script como el propagador nativo.
+    """
     gen = cfg["general"]
     sc  = cfg["spacecraft"]
     tm  = cfg["time"]
@@ -198,63 +298,13 @@ def build_gmat_script(cfg: dict, script_path: Path):
     else:
         axes_type = "MJ2000Eq"   # ecuatorial por defecto
 
-
     time_fmt    = gen.get("Formato de tiempo", "UTC")
     date_format = map_time_format(time_fmt)
 
     # ========== TIEMPO ==========
-
     start_raw = tm.get("Fecha inicio", "").strip()
     end_raw   = tm.get("Fecha final", "").strip()
 
-    def normalize_epoch(epoch: str) -> str:
-        """
-        Convierte lo que viene de la GUI en un string tipo:
-        '08 Dec 2024 12:00:00.000'
-        Soporta:
-        - '08 Dec 2024'
-        - '08/12/2024'
-        - '08 Dec 2024 10:30:00'
-        - '08/12/2024 10:30:00'
-        Si falla, devuelve una fecha por defecto.
-        """
-        s = epoch.strip()
-        if not s:
-            return "01 Jan 2030 12:00:00.000"
-
-        # Caso con hora incluida
-        if ":" in s:
-            for fmt in ("%d %b %Y %H:%M:%S", "%d/%m/%Y %H:%M:%S"):
-                try:
-                    dt = datetime.strptime(s, fmt)
-                    return dt.strftime("%d %b %Y %H:%M:%S.000")
-                except ValueError:
-                    pass
-            if not s.endswith(".000"):
-                return s + ".000"
-            return s
-
-        # Solo fecha
-        for fmt in ("%d %b %Y", "%d/%m/%Y"):
-            try:
-                dt = datetime.strptime(s, fmt)
-                return dt.strftime("%d %b %Y 12:00:00.000")
-            except ValueError:
-                pass
-
-        return "01 Jan 2030 12:00:00.000"
-
-    def parse_date_only(s: str):
-        s = s.strip()
-        if not s:
-            return None
-        for fmt in ("%d %b %Y", "%d/%m/%Y"):
-            try:
-                return datetime.strptime(s, fmt)
-            except ValueError:
-                pass
-        return None
-
     epoch_str = normalize_epoch(start_raw)
 
     start_dt = parse_date_only(start_raw)
@@ -265,9 +315,7 @@ def build_gmat_script(cfg: dict, script_path: Path):
     else:
         dur_days = 1.0   # por defecto
 
-    
     # ========== SPACECRAFT ==========
-
     coord_type = sc.get("Sistema de coordenadas", "Cartesianas").strip()
 
     # Cartesianas
@@ -305,92 +353,156 @@ def build_gmat_script(cfg: dict, script_path: Path):
     fm_central_es = pr.get("Cuerpo central", gen.get("Cuerpo central", "Tierra"))
     fm_central_en = map_body(fm_central_es)
 
-    # ========== IMPULSIVE BURN 1 ==========
-    ib1_coord_raw = ib1.get("Sistema de coordenadas", "Local").strip()
-    ib1_origin_es = ib1.get("Origen", central_es)
-    ib1_axes      = ib1.get("Axes", "VNB").strip()
+    # Modelo gravitatorio (GMAT no lo recibe todavía en el script; lo usa
+    # el propagador nativo para activar J2 cuando el grado es >= 2)
+    gravity_model = pr.get("Modelo gravitatorio", "None").strip() or "None"
+    try:
+        gravity_degree = int(float(pr.get("Grado", "0").replace(",", ".")))
+    except Exception:
+        gravity_degree = 0
+
+    # ========== IMPULSIVE BURNS ==========
+    burns = [
+        normalize_burn(ib1, "ImpBurn1", central_es, coord_system, dur_days),
+        normalize_burn(ib2, "ImpBurn2", central_es, coord_system, dur_days),
+    ]
+
+    return {
+        "sat_name": sat_name,
+        "central_body": central_en,
+        "coord_system": coord_system,
+        "axes_type": axes_type,
+        "date_format": date_format,
+        "epoch": epoch_str,
+        "dur_days": dur_days,
+        "coord_type": coord_type,
+        "cartesian": (x, y, z, vx, vy, vz),
+        "keplerian": (sma, ecc, inc, raan, aop, ta),
+        "integrator": integ_type,
+        "init_step": init_step,
+        "accuracy": accuracy,
+        "min_step": min_step,
+        "max_step": max_step,
+        "max_step_attempts": max_step_attempts,
+        "fm_central_body": fm_central_en,
+        "gravity_model": gravity_model,
+        "gravity_degree": gravity_degree,
+        "burns": burns,
+    }
 
-    dv1_1 = to_float(ib1.get("Delta V Element 1", "0"), 0.0)
-    dv1_2 = to_float(ib1.get("Delta V Element 2", "0"), 0.0)
-    dv1_3 = to_float(ib1.get("Delta V Element 3", "0"), 0.0)
 
-    has_burn1 = (abs(dv1_1) + abs(dv1_2) + abs(dv1_3)) > 0.0
+def mission_sequence(p: dict) -> list:
+    """
+    Secuencia de misión a partir de normalize_config:
+    lista de ("propagate", t_fin_dias) y ("maneuver", burn).
+    Después de cada paso hay un Report.
+    """
+    dur_days = p["dur_days"]
 
-    ib1_burn_time_str = ib1.get("Tiempo burn", "").strip()
-    t_burn1 = None
-    if has_burn1 and ib1_burn_time_str != "":
-        t_burn1 = to_float(ib1_burn_time_str, 0.0)
-        # Acotamos entre 0 y dur_days
-        if t_burn1 < 0.0:
-            t_burn1 = 0.0
-        if t_burn1 > dur_days:
-            t_burn1 = dur_days
+    # Construimos lista de eventos (burn, tiempo)
+    events = [b for b in p["burns"] if b["active"] and b["t"] is not None]
 
-    if ib1_coord_raw == "Local":
-        ib1_coord_gmat = coord_system
-    else:
-        ib1_coord_gmat = ib1_coord_raw
+    # Ordenar por tiempo
+    events.sort(key=lambda b: b["t"])
 
-    ib1_origin_en = map_body(ib1_origin_es)
+    steps = []
+    current_t = 0.0
 
-    # ========== IMPULSIVE BURN 2 ==========
-    ib2_coord_raw = ib2.get("Sistema de coordenadas", "Local").strip()
-    ib2_origin_es = ib2.get("Origen", central_es)
-    ib2_axes      = ib2.get("Axes", "VNB").strip()
+    for burn in events:
+        if dur_days <= 0.0:
+            break
 
-    dv2_1 = to_float(ib2.get("Delta V Element 1", "0"), 0.0)
-    dv2_2 = to_float(ib2.get("Delta V Element 2", "0"), 0.0)
-    dv2_3 = to_float(ib2.get("Delta V Element 3", "0"), 0.0)
+        t_clamped = max(0.0, min(dur_days, burn["t"]))
 
-    has_burn2 = (abs(dv2_1) + abs(dv2_2) + abs(dv2_3)) > 0.0
+        if t_clamped > current_t:
+            steps.append(("propagate", t_clamped))
 
-    ib2_burn_time_str = ib2.get("Tiempo burn", "").strip()
-    t_burn2 = None
-    if has_burn2 and ib2_burn_time_str != "":
-        t_burn2 = to_float(ib2_burn_time_str, 0.0)
-        if t_burn2 < 0.0:
-            t_burn2 = 0.0
-        if t_burn2 > dur_days:
-            t_burn2 = dur_days
+        steps.append(("maneuver", burn))
 
-    if ib2_coord_raw == "Local":
-        ib2_coord_gmat = coord_system
-    else:
-        ib2_coord_gmat = ib2_coord_raw
+        current_t = t_clamped
 
-    ib2_origin_en = map_body(ib2_origin_es)
+    # Propagación final
+    if dur_days > current_t:
+        steps.append(("propagate", dur_days))
 
+    return steps
 
-        # ========== CONSTRUIR SCRIPT ==========
-    lines = []
 
-    # --- CoordinateSystem SOLO si NO es la Tierra ---
-    if central_en != "Earth":
-        lines.append(f"Create CoordinateSystem {coord_system};")
-        lines.append(f"{coord_system}.Origin = {central_en};")
-        lines.append(f"{coord_system}.Axes   = {axes_type};")
-        lines.append("")  # estética
+def unique_names(raw_names: list, default: str = "Sat") -> list:
+    """sanitize_name de cada nombre, con sufijo _2, _3... si se repite."""
+    names = []
+    used = set()
+    for raw in raw_names:
+        base = sanitize_name(raw, default=default)
+        name, i = base, 2
+        while name in used:
+            name, i = f"{base}_{i}", i + 1
+        used.add(name)
+        names.append(name)
+    return names
 
 
+def script_names(p: dict, case: str | None = None) -> dict:
+    """
+    Nombres de los objetos GMAT de un caso. Sin `case` son los del script
+    de un solo caso (FM, Prop, DefaultReportFile...); con `case` llevan el
+    sufijo _<case> para que varios casos convivan en un mismo script.
+    """
+    s = f"_{case}" if case else ""
+    report = f"Report{s}" if case else "DefaultReportFile"
+    return {
+        "sat": f"{p['sat_name']}{s}",
+        "fm": f"FM{s}",
+        "prop": f"Prop{s}",
+        "burns": {b["name"]: f"{b['name']}{s}" for b in p["burns"]},
+        "report": report,
+        "filename": f"{report}.txt",
+    }
 
-    # Objetos
-    lines.append(f"Create Spacecraft {sat_name};")
-    lines.append("Create ForceModel FM;")
-    lines.append("Create Propagator Prop;")
-    if has_burn1:
-        lines.append("Create ImpulsiveBurn ImpBurn1;")
-    if has_burn2:
-        lines.append("Create ImpulsiveBurn ImpBurn2;")
-    lines.append("Create ReportFile DefaultReportFile;")
-    lines.append("")
-    
+
+def _coordinate_system_lines(p: dict) -> list:
+    # --- CoordinateSystem SOLO si NO es la Tierra ---
+    if p["central_body"] == "Earth":
+        return []
+    coord_system = p["coord_system"]
+    return [
+        f"Create CoordinateSystem {coord_system};",
+        f"{coord_system}.Origin = {p['central_body']};",
+        f"{coord_system}.Axes   = {p['axes_type']};",
+        "",  # estética
+    ]
+
+
+def _create_lines(p: dict, n: dict) -> list:
+    lines = [
+        f"Create Spacecraft {n['sat']};",
+        f"Create ForceModel {n['fm']};",
+        f"Create Propagator {n['prop']};",
+    ]
+    for burn in p["burns"]:
+        if burn["active"]:
+            lines.append(f"Create ImpulsiveBurn {n['burns'][burn['name']]};")
+    lines.append(f"Create ReportFile {n['report']};")
+    return lines
+
+
+def _config_lines(p: dict, n: dict) -> list:
+    """Campos de Spacecraft, ForceModel, Propagator, burns y ReportFile."""
+    sat_name = n["sat"]
+    fm, prop, report = n["fm"], n["prop"], n["report"]
+    coord_system = p["coord_system"]
+    fm_central_en = p["fm_central_body"]
+    x, y, z, vx, vy, vz = p["cartesian"]
+    sma, ecc, inc, raan, aop, ta = p["keplerian"]
+
+    lines = []
 
     # Spacecraft
-    lines.append(f"{sat_name}.DateFormat = {date_format};")
-    lines.append(f"{sat_name}.Epoch = '{epoch_str}';")
+    lines.append(f"{sat_name}.DateFormat = {p['date_format']};")
+    lines.append(f"{sat_name}.Epoch = '{p['epoch']}';")
     lines.append(f"{sat_name}.CoordinateSystem = {coord_system};")
 
-    if coord_type == "Cartesianas":
+    if p["coord_type"] == "Cartesianas":
         lines.append(f"{sat_name}.DisplayStateType = Cartesian;")
         lines.append(f"{sat_name}.X  = {x};")
         lines.append(f"{sat_name}.Y  = {y};")
@@ -410,108 +522,94 @@ def build_gmat_script(cfg: dict, script_path: Path):
     lines.append("")
 
     # ForceModel
-    lines.append(f"FM.CentralBody   = {fm_central_en};")
-    lines.append(f"FM.PrimaryBodies = {{{fm_central_en}}};")
-    lines.append("FM.Drag = None;")
-    lines.append("FM.SRP  = Off;")
+    lines.append(f"{fm}.CentralBody   = {fm_central_en};")
+    lines.append(f"{fm}.PrimaryBodies = {{{fm_central_en}}};")
+    lines.append(f"{fm}.Drag = None;")
+    lines.append(f"{fm}.SRP  = Off;")
     lines.append("")
 
     # Propagator
-    lines.append(f"Prop.Type            = {integ_type};")
-    lines.append("Prop.FM              = FM;")
-    lines.append(f"Prop.InitialStepSize = {init_step};")
-    lines.append(f"Prop.Accuracy        = {accuracy};")
-    lines.append(f"Prop.MinStep         = {min_step};")
-    lines.append(f"Prop.MaxStep         = {max_step};");
-    lines.append(f"Prop.MaxStepAttempts = {max_step_attempts};")
+    lines.append(f"{prop}.Type            = {p['integrator']};")
+    lines.append(f"{prop}.FM              = {fm};")
+    lines.append(f"{prop}.InitialStepSize = {p['init_step']};")
+    lines.append(f"{prop}.Accuracy        = {p['accuracy']};")
+    lines.append(f"{prop}.MinStep         = {p['min_step']};")
+    lines.append(f"{prop}.MaxStep         = {p['max_step']};")
+    lines.append(f"{prop}.MaxStepAttempts = {p['max_step_attempts']};")
     lines.append("")
 
-    # ImpulsiveBurn 1
-    if has_burn1:
-        lines.append(f"ImpBurn1.CoordinateSystem = {ib1_coord_gmat};")
-        lines.append(f"ImpBurn1.Origin          = {ib1_origin_en};")
-        lines.append(f"ImpBurn1.Axes            = {ib1_axes};")
-        lines.append(f"ImpBurn1.Element1        = {dv1_1};")
-        lines.append(f"ImpBurn1.Element2        = {dv1_2};")
-        lines.append(f"ImpBurn1.Element3        = {dv1_3};")
-        lines.append("ImpBurn1.DecrementMass   = false;")
-        lines.append("")
-
-    # ImpulsiveBurn 2
-    if has_burn2:
-        lines.append(f"ImpBurn2.CoordinateSystem = {ib2_coord_gmat};")
-        lines.append(f"ImpBurn2.Origin          = {ib2_origin_en};")
-        lines.append(f"ImpBurn2.Axes            = {ib2_axes};")
-        lines.append(f"ImpBurn2.Element1        = {dv2_1};")
-        lines.append(f"ImpBurn2.Element2        = {dv2_2};")
-        lines.append(f"ImpBurn2.Element3        = {dv2_3};")
-        lines.append("ImpBurn2.DecrementMass   = false;")
+    # ImpulsiveBurns
+    for burn in p["burns"]:
+        if not burn["active"]:
+            continue
+        name = n["burns"][burn["name"]]
+        dv1, dv2, dv3 = burn["dv"]
+        lines.append(f"{name}.CoordinateSystem = {burn['coord_system']};")
+        lines.append(f"{name}.Origin          = {burn['origin']};")
+        lines.append(f"{name}.Axes            = {burn['axes']};")
+        lines.append(f"{name}.Element1        = {dv1};")
+        lines.append(f"{name}.Element2        = {dv2};")
+        lines.append(f"{name}.Element3        = {dv3};")
+        lines.append(f"{name}.DecrementMass   = false;")
         lines.append("")
 
     # ReportFile
-    lines.append("DefaultReportFile.Filename = 'DefaultReportFile.txt';")
-    lines.append("DefaultReportFile.WriteHeaders = true;")
-    lines.append("DefaultReportFile.Precision = 16;")
+    lines.append(f"{report}.Filename = '{n['filename']}';")
+    lines.append(f"{report}.WriteHeaders = true;")
+    lines.append(f"{report}.Precision = 16;")
     lines.append(
-        f"DefaultReportFile.Add = "
+        f"{report}.Add = "
         f"{{{sat_name}.ElapsedDays, {sat_name}.X, {sat_name}.Y, {sat_name}.Z, "
         f"{sat_name}.VX, {sat_name}.VY, {sat_name}.VZ}};"
     )
     lines.append("")
+    return lines
 
 
-    # ========== MISSION SEQUENCE ==========
-    lines.append("BeginMissionSequence;")
-
+def _mission_lines(p: dict, n: dict) -> list:
+    """Report inicial y Propagate/Maneuver + Report de la secuencia de misión."""
+    sat_name, report = n["sat"], n["report"]
     report_fields = (
         f"{sat_name}.ElapsedDays {sat_name}.X {sat_name}.Y {sat_name}.Z "
         f"{sat_name}.VX {sat_name}.VY {sat_name}.VZ"
     )
 
     # Report inicial
-    lines.append(f"Report DefaultReportFile {report_fields};")
-
-    # Construimos lista de eventos (nombre del burn, tiempo)
-    events = []
-    if has_burn1 and t_burn1 is not None:
-        events.append(("ImpBurn1", t_burn1))
-    if has_burn2 and t_burn2 is not None:
-        events.append(("ImpBurn2", t_burn2))
-
-    current_t = 0.0
-
-    # Ordenar por tiempo
-    events.sort(key=lambda e: e[1])
+    lines = [f"Report {report} {report_fields};"]
 
-    for burn_name, t in events:
-        if dur_days <= 0.0:
-            break
-
-        t_clamped = max(0.0, min(dur_days, t))
-
-        if t_clamped > current_t:
+    for kind, arg in mission_sequence(p):
+        if kind == "propagate":
             lines.append(
-                f"Propagate Prop({sat_name}) "
-                f"{{{sat_name}.ElapsedDays = {t_clamped}}};"
+                f"Propagate {n['prop']}({sat_name}) "
+                f"{{{sat_name}.ElapsedDays = {arg}}};"
             )
-            lines.append(f"Report DefaultReportFile {report_fields};")
+        else:
+            lines.append(f"Maneuver {n['burns'][arg['name']]}({sat_name});")
+        lines.append(f"Report {report} {report_fields};")
+    return lines
 
-        lines.append(f"Maneuver {burn_name}({sat_name});")
-        lines.append(f"Report DefaultReportFile {report_fields};")
 
-        current_t = t_clamped
+def _script_text(p: dict) -> str:
+    n = script_names(p)
 
-    # Propagación final
-    if dur_days > current_t:
-        lines.append(
-            f"Propagate Prop({sat_name}) "
-            f"{{{sat_name}.ElapsedDays = {dur_days}}};"
-        )
-        lines.append(f"Report DefaultReportFile {report_fields};")
+    # ========== CONSTRUIR SCRIPT ==========
+    lines = _coordinate_system_lines(p)
+
+    # Objetos
+    lines += _create_lines(p, n)
+    lines.append("")
+    lines += _config_lines(p, n)
 
+    # ========== MISSION SEQUENCE ==========
+    lines.append("BeginMissionSequence;")
+    lines += _mission_lines(p, n)
     lines.append("")
 
-    script_text = "\n".join(lines)
+    return "\n".join(lines)
+
+
+def build_gmat_script(cfg: dict, script_path: Path):
+    script_text = _script_text(normalize_config(cfg))
     script_path.write_text(script_text, encoding="utf-8")
 
     print(f"Script GMAT generado en: {script_path}")
@@ -520,11 +618,213 @@ def build_gmat_script(cfg: dict, script_path: Path):
     print(script_text[:400] + "...\n")
 
 
-def run_transpiler():
-    cfg = parse_gui_txt(DATA_FILE)
-    build_gmat_script(cfg, SCRIPT_PATH)
-    return SCRIPT_PATH
+def build_gmat_batch_script(cases: list, script_path: Path) -> list:
+    """
+    Un solo script GMAT con varios casos (lista de (nombre, cfg)): cada
+    uno con su Spacecraft, ForceModel, Propagator, burns y ReportFile
+    (sufijo _<caso>, ver script_names) y su tramo de secuencia de misión.
+    Así GMAT arranca una vez por lote y no una vez por caso.
+
+    Los casos se ejecutan uno tras otro y cada report solo está activo
+    (Toggle On) durante su tramo, para que no reciba filas al propagar
+    los demás. Devuelve, por caso, el nombre, la nave en el script y en
+    su config (sat_name) y el fichero de report (ver GMAT_exec.demux_report).
+    """
+    ids = unique_names([name for name, _ in cases], default="caso")
+    params = [normalize_config(cfg) for _, cfg in cases]
+    names = [script_names(p, case_id) for p, case_id in zip(params, ids)]
+
+    lines = []
+
+    # Sistemas de coordenadas: uno por cuerpo central, aunque lo usen varios casos
+    seen = set()
+    for p in params:
+        if p["coord_system"] not in seen:
+            cs_lines = _coordinate_system_lines(p)
+            if cs_lines:
+                seen.add(p["coord_system"])
+                lines += cs_lines
+
+    for p, n in zip(params, names):
+        lines += _create_lines(p, n)
+    lines.append("")
+
+    for (name, _), p, n in zip(cases, params, names):
+        lines.append(f"% ---------- {name} ----------")
+        lines += _config_lines(p, n)
+
+    lines.append("BeginMissionSequence;")
+    for n in names:
+        lines.append(f"Toggle {n['report']} Off;")
+    for (name, _), p, n in zip(cases, params, names):
+        lines.append(f"% ---------- {name} ----------")
+        lines.append(f"Toggle {n['report']} On;")
+        lines += _mission_lines(p, n)
+        lines.append(f"Toggle {n['report']} Off;")
+    lines.append("")
+
+    script_path.write_text("\n".join(lines), encoding="utf-8")
+    print(f"Script GMAT de {len(cases)} casos generado en: {script_path}")
+
+    return [
+        {"name": name, "sat": n["sat"], "sat_name": p["sat_name"], "report": n["filename"]}
+        for (name, _), p, n in zip(cases, params, names)
+    ]
+
+
+# Campos de parse_gui_txt que van tal cual a un solo valor del script, con
+# la misma conversión que normalize_config: (hueco, conversión)
+_DIRECT_FIELDS = {
+    ("spacecraft", "x"):   ("cartesian.0", lambda v: to_float(v, 7000.0)),
+    ("spacecraft", "y"):   ("cartesian.1", lambda v: to_float(v, 0.0)),
+    ("spacecraft", "z"):   ("cartesian.2", lambda v: to_float(v, 0.0)),
+    ("spacecraft", "vx"):  ("cartesian.3", lambda v: to_float(v, 0.0)),
+    ("spacecraft", "vy"):  ("cartesian.4", lambda v: to_float(v, 7.5)),
+    ("spacecraft", "vz"):  ("cartesian.5", lambda v: to_float(v, 0.0)),
+    ("spacecraft", "SMA"):  ("keplerian.0", lambda v: to_float(v, 7000.0)),
+    ("spacecraft", "ECC"):  ("keplerian.1", lambda v: to_float(v, 0.0)),
+    ("spacecraft", "INC"):  ("keplerian.2", lambda v: to_float(v, 0.0)),
+    ("spacecraft", "RAAN"): ("keplerian.3", lambda v: to_float(v, 0.0)),
+    ("spacecraft", "AOP"):  ("keplerian.4", lambda v: to_float(v, 0.0)),
+    ("spacecraft", "TA"):   ("keplerian.5", lambda v: to_float(v, 0.0)),
+    ("propagate", "Tamano de paso inicial"): ("init_step", lambda v: positive_or_default(v, 10.0)),
+    ("propagate", "Precision (accuracy)"):   ("accuracy", lambda v: positive_or_default(v, 1e-4)),
+    ("propagate", "Paso minimo"):            ("min_step", lambda v: positive_or_default(v, 0.01)),
+    ("propagate", "Paso maximo"):            ("max_step", lambda v: positive_or_default(v, 300.0)),
+}
+
+
+def field_value(cfg: dict, section: str, key: str) -> float:
+    """
+    Valor numérico de un campo de parse_gui_txt tal como lo usa
+    normalize_config: un campo directo vacío o inválido vale su default
+    (x = 7000, vy = 7.5...), no 0.
+    """
+    raw = cfg.get(section, {}).get(key, "")
+    if (section, key) in _DIRECT_FIELDS:
+        return _DIRECT_FIELDS[section, key][1](raw)
+    return to_float(raw, 0.0)
 
 
+_SLOT_SCALARS = ("init_step", "accuracy", "min_step", "max_step")
+_SLOT_TUPLES = ("cartesian", "keplerian")
 
+# ΔV de los burns: también directos mientras el burn siga activo (o inactivo)
+_BURN_SECTIONS = {"impulsive_burn": 0, "impulsive_burn_2": 1}
+_DV_KEYS = {f"Delta V Element {i + 1}": i for i in range(3)}
 
+
+class _Slot:
+    """Hueco de un valor numérico en la plantilla: se formatea como \\0clave\\0."""
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __format__(self, spec):
+        return f"\0{self.key}\0"
+
+
+def _slot_values(p: dict) -> dict:
+    """Valor (sin formatear) de cada hueco de la plantilla."""
+    values = {k: p[k] for k in _SLOT_SCALARS}
+    for k in _SLOT_TUPLES:
+        values.update({f"{k}.{i}": v for i, v in enumerate(p[k])})
+    for j, b in enumerate(p["burns"]):
+        values.update({f"burns.{j}.dv.{i}": v for i, v in enumerate(b["dv"])})
+    return values
+
+
+class ScriptTemplate:
+    """
+    Script GMAT de una config base con huecos en los valores que dependen
+    de un solo campo (estado inicial, pasos del propagador y ΔV de los
+    burns), para barridos y Monte Carlo. render(cfg) compara `cfg` con la
+    base y, si solo cambian campos de _DIRECT_FIELDS o ΔV, convierte esos
+    campos y rellena sus huecos, sin normalize_config ni volver a construir
+    cada línea. Si cambia cualquier otra cosa (fechas, tiempo de un burn,
+    un burn que se activa...) construye el script entero como
+    build_gmat_script. El resultado es idéntico en los dos casos.
+    """
+
+    def __init__(self, cfg: dict):
+        self.cfg = {section: dict(values) for section, values in cfg.items()}
+        p = normalize_config(cfg)
+        self.active = [b["active"] for b in p["burns"]]
+
+        slotted = dict(p)
+        for k in _SLOT_SCALARS:
+            slotted[k] = _Slot(k)
+        for k in _SLOT_TUPLES:
+            slotted[k] = tuple(_Slot(f"{k}.{i}") for i in range(len(p[k])))
+        slotted["burns"] = [
+            dict(b, dv=tuple(_Slot(f"burns.{j}.dv.{i}") for i in range(len(b["dv"]))))
+            for j, b in enumerate(p["burns"])
+        ]
+        # Partes fijas en las posiciones pares y huecos en las impares, ya
+        # con los valores de la base
+        self.parts = _script_text(slotted).split("\0")
+        base = _slot_values(p)
+        self.index = {}
+        for i in range(1, len(self.parts), 2):
+            self.index[self.parts[i]] = i
+            self.parts[i] = f"{base[self.parts[i]]}"
+        self.rendered = 0
+        self.rebuilt = 0
+        # Campos ya vistos que no son directos: en un barrido se repiten
+        self._blocking = []
+
+    def _changes(self, cfg: dict) -> list | None:
+        """(hueco, valor) de los campos que cambian; None si alguno no es directo."""
+        for section, key in self._blocking:
+            if cfg.get(section, {}).get(key) != self.cfg[section].get(key):
+                return None
+
+        changes = []
+        for section, base_values in self.cfg.items():
+            values = cfg.get(section, {})
+            if values == base_values:
+                continue
+            if values.keys() != base_values.keys():
+                return None
+            burn = _BURN_SECTIONS.get(section)
+            for key, raw in values.items():
+                if raw == base_values[key]:
+                    continue
+                if burn is not None and key in _DV_KEYS:
+                    dv = [to_float(values.get(k, "0"), 0.0) for k in _DV_KEYS]
+                    if (sum(map(abs, dv)) > 0.0) != self.active[burn]:
+                        return None   # el burn se activa o se desactiva
+                    changes.append((f"burns.{burn}.dv.{_DV_KEYS[key]}", dv[_DV_KEYS[key]]))
+                elif (section, key) in _DIRECT_FIELDS:
+                    slot, convert = _DIRECT_FIELDS[section, key]
+                    changes.append((slot, convert(raw)))
+                else:
+                    if len(self._blocking) < 8:
+                        self._blocking.append((section, key))
+                    return None
+        return changes
+
+    def render(self, cfg: dict) -> str:
+        changes = self._changes(cfg)
+        if changes is None:
+            self.rebuilt += 1
+            return _script_text(normalize_config(cfg))
+
+        parts = list(self.parts)
+        for slot, value in changes:
+            # Sin hueco (p.ej. X con estado kepleriano) el campo no sale en el script
+            if slot in self.index:
+                parts[self.index[slot]] = f"{value}"
+        self.rendered += 1
+        return "".join(parts)
+
+    def write(self, cfg: dict, script_path: Path) -> Path:
+        script_path.write_text(self.render(cfg), encoding="utf-8")
+        return script_path
+
+
+@traced("run_transpiler")
+def run_transpiler():
+    cfg = parse_gui_txt(DATA_FILE)
+    build_gmat_script(cfg, SCRIPT_PATH)
+    return SCRIPT_PATH
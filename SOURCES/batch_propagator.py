@@ -0,0 +1,208 @@
+"""
+Propagación en lote: N naves en un único array de estados (N, 6).
+
+Con RK4 fijo todas las naves avanzan juntas con el mismo paso. Con
+Dormand-Prince adaptativo cada nave lleva su propio tiempo y su propio
+paso (el mismo control de error que propagate_segment), y en cada
+iteración se da un paso a la vez a todas las que aún no han llegado a la
+siguiente parada: el resultado de una nave no depende de con cuáles se
+propague. El coste crece con la aritmética de arrays y no con N bucles ni
+N procesos. El resultado es un array (N, T, 6) en memoria o en un .npy
+memory-mapped.
+
+Lo usa el motor nativo de SOURCES/sweep.py (barridos y Monte Carlo) para
+los puntos con J2, que se integran numéricamente: las configs que solo
+cambian en el estado inicial y en el ΔV de los burns (batch_key) se
+propagan juntas.
+"""
+from pathlib import Path
+import numpy as np
+
+from SOURCES.Transpiler import normalize_config
+from SOURCES.propagator import (
+    ADAPTIVE_INTEGRATORS, force_model, initial_state, burn_delta_v,
+    _dopri_step, _rk4_step, _rss_step_errors,
+)
+
+
+METHODS = ("fixed", "adaptive")
+
+
+def batch_method(integrator: str) -> str:
+    """Método de propagate_batch equivalente al integrador de la config."""
+    if integrator == "RungeKutta4":
+        return "fixed"
+    if integrator in ADAPTIVE_INTEGRATORS:
+        return "adaptive"
+    raise ValueError(f"El integrador '{integrator}' no está soportado por el motor nativo")
+
+
+def batch_key(p: dict) -> tuple:
+    """
+    Lo que tienen que compartir las configs (normalize_config) de un mismo
+    lote: todo salvo el estado inicial, el nombre y el ΔV de los burns.
+    """
+    skip = {"sat_name", "coord_type", "cartesian", "keplerian", "burns"}
+    burns = tuple((b["active"], b["t"], b["axes"]) for b in p["burns"])
+    return tuple((k, v) for k, v in sorted(p.items()) if k not in skip) + (burns,)
+
+
+def initial_states(cfgs: list) -> np.ndarray:
+    """Estados iniciales (N, 6) de una lista de configs de parse_gui_txt."""
+    states = []
+    for cfg in cfgs:
+        p = normalize_config(cfg)
+        states.append(initial_state(p, force_model(p)["mu"]))
+    return np.array(states)
+
+
+def _allocate_output(shape, out):
+    if out is None:
+        return np.empty(shape)
+    if isinstance(out, (str, Path)):
+        return np.lib.format.open_memmap(out, mode="w+", dtype=np.float64, shape=shape)
+    if out.shape != shape:
+        raise ValueError(f"El array de salida tiene forma {out.shape}, se esperaba {shape}")
+    return out
+
+
+def propagate_batch(states: np.ndarray, t_out: np.ndarray, fm: dict,
+                    method: str = "fixed", step: float = 60.0,
+                    accuracy: float = 1e-8, min_step: float = 0.01,
+                    max_step: float = 300.0, max_step_attempts: int = 50,
+                    burns: list | None = None, out=None,
+                    return_steps: bool = False):
+    """
+    Propaga los N estados de `states` (N, 6) y los guarda en los instantes
+    `t_out` [días] (crecientes, empezando en >= 0).
+
+    method: "fixed" (RK4 con paso `step` [s]) o "adaptive" (Dormand-Prince
+            con el paso de cada nave controlado por `accuracy`).
+    burns:  lista de (t_dias, axes, dv) con dv (3,) o (N, 3). Si un burn
+            coincide con un instante de salida se guarda el estado tras el burn.
+    out:    None, un array (N, T, 6) o una ruta .npy (memory-mapped).
+
+    Devuelve el array (N, T, 6); con return_steps, (array, pasos aceptados
+    de cada nave (N,)).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Método de propagación desconocido: {method!r} ({' o '.join(METHODS)})")
+    states = np.array(states, dtype=float)
+    t_out = np.asarray(t_out, dtype=float) * 86400.0
+    n, T = states.shape[0], t_out.size
+
+    result = _allocate_output((n, T, 6), out)
+
+    burns = sorted(burns or [], key=lambda b: b[0])
+    burn_times = [b[0] * 86400.0 for b in burns]
+
+    # Paradas obligatorias: instantes de salida y de burn
+    stops = np.union1d(t_out, burn_times)
+
+    # Tiempo, paso, intentos y pasos aceptados de cada nave
+    t = np.zeros(n)
+    h = np.full(n, min(step, max_step) if method == "adaptive" else step)
+    attempts = np.zeros(n, dtype=np.int64)
+    steps = np.zeros(n, dtype=np.int64)
+    i_out = 0
+    i_burn = 0
+
+    for t_stop in stops:
+        if method == "fixed":
+            while t[0] < t_stop:
+                h_i = min(step, t_stop - t[0])
+                states = _rk4_step(states, h_i, fm)
+                t[:] = t_stop if h_i == t_stop - t[0] else t[0] + h_i
+                steps += 1
+        else:
+            active = np.nonzero(t < t_stop)[0]
+            while active.size:
+                left = t_stop - t[active]
+                clipped = h[active] > left
+                h_i = np.where(clipped, left, h[active])
+                s = states[active]
+                new_states, err = _dopri_step(s, h_i[:, None], fm)
+                err_norm = _rss_step_errors(s, new_states, err) / accuracy
+
+                with np.errstate(divide="ignore"):
+                    factor = np.where(err_norm > 0, 0.9 * err_norm ** -0.2, 5.0)
+                factor = np.clip(factor, 0.2, 5.0)
+                ok = (err_norm <= 1.0) | (h_i <= min_step)
+
+                acc, rej = active[ok], active[~ok]
+                states[acc] = new_states[ok]
+                t[acc] = np.where(clipped[ok], t_stop, t[acc] + h_i[ok])
+                steps[acc] += 1
+                attempts[acc] = 0
+                # Un paso recortado por una parada no debe frenar los siguientes
+                h[acc] = np.where(clipped[ok], h[acc],
+                                  np.clip(h_i[ok] * factor[ok], min_step, max_step))
+
+                attempts[rej] += 1
+                if rej.size and attempts[rej].max() >= max_step_attempts:
+                    worst = rej[np.argmax(attempts[rej])]
+                    raise RuntimeError(
+                        f"Paso rechazado {attempts[worst]} veces en t = {t[worst]:.3f} s "
+                        f"(nave {worst})"
+                    )
+                h[rej] = np.maximum(min_step, h_i[~ok] * factor[~ok])
+
+                active = active[t[active] < t_stop]
+
+        while i_burn < len(burns) and burn_times[i_burn] <= t_stop:
+            _, axes, dv = burns[i_burn]
+            states = states.copy()
+            states[:, 3:] += burn_delta_v(states, axes, dv)
+            i_burn += 1
+
+        while i_out < T and t_out[i_out] <= t_stop:
+            result[:, i_out, :] = states
+            i_out += 1
+
+    if isinstance(result, np.memmap):
+        result.flush()
+
+    return (result, steps) if return_steps else result
+
+
+def propagate_configs(cfgs: list, n_samples: int = 1000, method: str | None = None,
+                      t_out=None, out=None, return_steps: bool = False) -> tuple:
+    """
+    Propaga variantes de un mismo escenario: todas las configs con el mismo
+    batch_key (cuerpo central, tiempos, integrador, tiempos de los burns...)
+    y distinto estado inicial o ΔV. Sin `method` se usa el del integrador
+    de la config. Devuelve (t_out [días], estados (N, T, 6)), y con
+    return_steps también los pasos aceptados de cada nave (N,); sin
+    `t_out`, `n_samples` instantes hasta el final de la misión.
+    """
+    ps = [normalize_config(cfg) for cfg in cfgs]
+    p = ps[0]
+    key = batch_key(p)
+    if any(batch_key(q) != key for q in ps[1:]):
+        raise ValueError("Las configs del lote no comparten escenario (ver batch_key)")
+    fm = force_model(p)
+    states = np.array([initial_state(q, fm["mu"]) for q in ps])
+
+    if t_out is None:
+        t_out = np.linspace(0.0, p["dur_days"], n_samples)
+    burns = [
+        (b["t"], b["axes"], np.array([q["burns"][k]["dv"] for q in ps]))
+        for k, b in enumerate(p["burns"]) if b["active"] and b["t"] is not None
+    ]
+
+    result = propagate_batch(
+        states, t_out, fm,
+        method=method or batch_method(p["integrator"]),
+        step=p["init_step"],
+        accuracy=p["accuracy"],
+        min_step=p["min_step"],
+        max_step=p["max_step"],
+        max_step_attempts=p["max_step_attempts"],
+        burns=burns,
+        out=out,
+        return_steps=return_steps,
+    )
+    if return_steps:
+        result, steps = result
+        return t_out, result, steps
+    return t_out, result
@@ -0,0 +1,287 @@
+"""
+Caché de resultados direccionada por contenido para el pipeline
+Transpiler -> GMAT (o motor nativo) -> report -> plots.
+
+La clave es un SHA-256 de la config normalizada (normalize_config), del
+texto del script generado y de la versión del motor. Cada entrada es una
+carpeta DATA/cache/<clave>/ con el report y, opcionalmente, los PNG.
+El tamaño total está limitado y se expulsa lo menos usado (LRU).
+
+Varios procesos pueden usar la misma caché (los del pool de Batch.py, la
+GUI y la línea de comandos): index.json se vuelve a leer y se reescribe
+con un fichero de bloqueo (index.lock) en cada cambio, así que nadie
+pisa las entradas o expulsiones de otro. El bloqueo lleva el PID de quien
+lo tiene: solo se rompe si ese proceso ya no existe o si lleva más de
+LOCK_STALE sin soltarlo, y cada uno borra solo el suyo.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from shutil import copy2, rmtree
+import hashlib
+import json
+import os
+import time
+import uuid
+
+from SOURCES.utils import CACHE_DIR
+
+
+DEFAULT_MAX_MB = 500
+REPORT_NAME = "DefaultReportFile.txt"
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# Tras esta espera por el bloqueo del índice se avisa de quién lo tiene [s]
+LOCK_TIMEOUT = 30.0
+# Un bloqueo más antiguo que esto se da por abandonado aunque su PID siga
+# vivo (PID reutilizado o proceso colgado) [s]
+LOCK_STALE = 600.0
+# Cada cuánto se mira si el dueño del bloqueo sigue vivo [s]
+LOCK_CHECK = 1.0
+
+
+def cache_key(p: dict, script_text: str, engine_version: str) -> str:
+    payload = json.dumps(
+        {"config": p, "script": script_text, "engine": engine_version},
+        sort_keys=True, ensure_ascii=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _pid_alive(pid: int) -> bool:
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if os.name == "nt":
+        # os.kill(pid, 0) terminaría el proceso en Windows: sin psutil solo
+        # cuenta la antigüedad del bloqueo
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+
+
+class ResultCache:
+    def __init__(self, root: Path = CACHE_DIR, max_bytes: int | None = None):
+        if max_bytes is None:
+            max_mb = float(os.environ.get("AM1_CACHE_MAX_MB", DEFAULT_MAX_MB))
+            max_bytes = int(max_mb * 1024 * 1024)
+        self.root = root
+        self.max_bytes = max_bytes
+        self.index_path = root / "index.json"
+        self.lock_path = root / "index.lock"
+        self.index = self._load_index()
+
+    # ---------- índice (LRU + estadísticas) ----------
+
+    def _load_index(self) -> dict:
+        if self.index_path.exists():
+            try:
+                return json.loads(self.index_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                pass
+        return {"entries": {}, "stats": {"hits": 0, "misses": 0}}
+
+    def _save_index(self):
+        tmp = self.index_path.with_name(f"index.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self.index, indent=1), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def _read_lock(self) -> tuple[str, float] | None:
+        """(contenido, mtime) de index.lock, o None si no existe."""
+        try:
+            return self.lock_path.read_text(encoding="utf-8"), self.lock_path.stat().st_mtime
+        except (OSError, ValueError):
+            return None
+
+    def _break_if_abandoned(self) -> bool:
+        """
+        Rompe index.lock si su dueño murió o es más antiguo que LOCK_STALE.
+        Se aparta con un nombre único antes de borrarlo: si entretanto otro
+        proceso lo había cogido, se le devuelve.
+        """
+        lock = self._read_lock()
+        if lock is None:
+            return False
+        owner, mtime = lock
+        try:
+            pid = int(owner.split()[0])
+        except (IndexError, ValueError):
+            pid = None   # recién creado, aún sin escribir
+        if time.time() - mtime < LOCK_STALE and (pid is None or _pid_alive(pid)):
+            return False
+
+        moved = self.lock_path.with_name(f"index.lock.{uuid.uuid4().hex}")
+        try:
+            os.rename(self.lock_path, moved)
+        except OSError:
+            return False
+        if moved.read_text(encoding="utf-8") != owner:
+            try:
+                os.link(moved, self.lock_path)
+            except OSError:
+                pass
+            moved.unlink(missing_ok=True)
+            return False
+        moved.unlink(missing_ok=True)
+        print(f"⚠ Bloqueo de la caché abandonado (PID {pid}), se libera:", self.lock_path)
+        return True
+
+    @contextmanager
+    def _locked(self):
+        """
+        Bloqueo del índice entre procesos (O_EXCL sobre index.lock, con
+        "<PID> <id>" dentro). Dentro, self.index es el índice recién leído
+        y se guarda al salir.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        token = f"{os.getpid()} {uuid.uuid4().hex}"
+        warn_at = time.monotonic() + LOCK_TIMEOUT
+        next_check = time.monotonic() + LOCK_CHECK
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                now = time.monotonic()
+                if now >= next_check:
+                    next_check = now + LOCK_CHECK
+                    if self._break_if_abandoned():
+                        continue
+                if warn_at is not None and now > warn_at:
+                    lock = self._read_lock()
+                    print("⚠ Esperando al bloqueo de la caché:", lock[0] if lock else self.lock_path)
+                    warn_at = None
+                time.sleep(0.01)
+        try:
+            os.write(fd, token.encode("utf-8"))
+        finally:
+            os.close(fd)
+        try:
+            self.index = self._load_index()
+            yield self.index
+            self._save_index()
+        finally:
+            # Solo se borra el bloqueo propio
+            lock = self._read_lock()
+            if lock is not None and lock[0] == token:
+                self.lock_path.unlink(missing_ok=True)
+
+    # ---------- API ----------
+
+    def get(self, key: str) -> Path | None:
+        """Carpeta de la entrada si existe (cuenta como hit), si no None."""
+        entry_dir = self.root / key
+        with self._locked() as index:
+            entry = index["entries"].get(key)
+            if entry is None or not (entry_dir / REPORT_NAME).exists():
+                index["stats"]["misses"] += 1
+                return None
+            entry["last_access"] = time.time()
+            index["stats"]["hits"] += 1
+        return entry_dir
+
+    def restore(self, entry_dir: Path, report_dst: Path, plots_dst: Path | None = None) -> bool:
+        """
+        Copia el report guardado a `report_dst` y, si hay PNG guardados y
+        se pide, también a `plots_dst`. Devuelve True si se restauraron plots.
+        """
+        report_dst.parent.mkdir(parents=True, exist_ok=True)
+        copy2(entry_dir / REPORT_NAME, report_dst)
+
+        pngs = sorted(entry_dir.glob("*.png"))
+        if plots_dst is None or not pngs:
+            return False
+
+        plots_dst.mkdir(parents=True, exist_ok=True)
+        for png in pngs:
+            copy2(png, plots_dst / png.name)
+        return True
+
+    def put(self, key: str, report_path: Path, plot_files: list = ()):
+        """
+        Guarda el report y los PNG `plot_files` (los de esta ejecución, no
+        todo lo que haya en la carpeta de plots) bajo `key`.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_dir = self.root / f".{key}.{os.getpid()}.tmp"
+        if tmp_dir.exists():
+            rmtree(tmp_dir)
+        tmp_dir.mkdir()
+
+        copy2(report_path, tmp_dir / REPORT_NAME)
+        for png in map(Path, plot_files):
+            if png.exists():
+                copy2(png, tmp_dir / png.name)
+        size = _dir_size(tmp_dir)
+
+        entry_dir = self.root / key
+        with self._locked() as index:
+            if entry_dir.exists():
+                rmtree(entry_dir)
+            os.replace(tmp_dir, entry_dir)
+            index["entries"][key] = {"size": size, "last_access": time.time()}
+            self._evict()
+
+    def add_plots(self, key: str, plot_files: list) -> bool:
+        """
+        Añade los PNG `plot_files` a una entrada ya guardada (el report se
+        guarda en cuanto termina la ejecución y los plots llegan después).
+        False si la entrada ya no está (p.ej. expulsada).
+        """
+        entry_dir = self.root / key
+        with self._locked() as index:
+            entry = index["entries"].get(key)
+            if entry is None or not entry_dir.exists():
+                return False
+            for png in map(Path, plot_files):
+                if png.exists():
+                    copy2(png, entry_dir / png.name)
+            entry["size"] = _dir_size(entry_dir)
+            self._evict()
+        return True
+
+    def _evict(self):
+        entries = self.index["entries"]
+        total = sum(e["size"] for e in entries.values())
+
+        for key in sorted(entries, key=lambda k: entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= entries[key]["size"]
+            rmtree(self.root / key, ignore_errors=True)
+            del entries[key]
+
+    def stats(self) -> dict:
+        self.index = self._load_index()
+        entries = self.index["entries"]
+        st = self.index["stats"]
+        lookups = st["hits"] + st["misses"]
+        return {
+            "hits": st["hits"],
+            "misses": st["misses"],
+            "hit_rate": st["hits"] / lookups if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(e["size"] for e in entries.values()),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self):
+        with self._locked():
+            for path in self.root.iterdir():
+                if path.is_dir():
+                    rmtree(path)
+                elif path != self.lock_path:
+                    path.unlink()
+            self.index = {"entries": {}, "stats": {"hits": 0, "misses": 0}}
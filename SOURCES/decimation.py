@@ -0,0 +1,185 @@
+"""
+Reducción de puntos (level of detail) para dibujar trayectorias largas.
+
+Una pantalla no muestra más de unos pocos miles de píxeles de ancho, así
+que pasar millones de filas a ax.plot solo hace lento el dibujo y el PNG.
+Aquí se eligen los índices a dibujar conservando la forma:
+
+- Series temporales: min/max por cubeta (los picos no desaparecen).
+- Órbitas 3D/XY: muestreo según longitud de arco + curvatura, de modo que
+  las zonas que giran (periapsis) reciben más puntos que los tramos rectos.
+
+En ambos casos se conservan siempre el primer y último punto, las filas
+de cada burn (las dos del mismo instante, antes y después del impulso, y
+sus vecinas) y los periapsis/apoapsis (extremos de r que cambian al menos
+APSIS_REL_TOL del rango de r, no las oscilaciones de redondeo). Solo los
+periapsis/apoapsis se aclaran si pasan de la mitad del presupuesto (miles
+de órbitas en una pantalla); los burns no se descartan nunca.
+Todas las funciones devuelven índices ordenados sobre los arrays de entrada.
+"""
+import numpy as np
+
+
+MAX_POINTS = 4000
+
+# Un periapsis/apoapsis tiene que separarse del extremo anterior al menos
+# esta fracción del rango de r (y APSIS_ABS_TOL de r, para órbitas casi
+# circulares, donde el rango es solo ruido de redondeo)
+APSIS_REL_TOL = 1e-3
+APSIS_ABS_TOL = 1e-6
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Índices del mínimo y el máximo de `y` en cada una de `n_buckets` cubetas."""
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)
+    # Se rellena repitiendo el último valor: argmin/argmax devuelven la
+    # primera aparición, así que el relleno nunca gana a un punto real
+    padded = np.pad(np.asarray(y, dtype=float), (0, size * n_buckets - n), mode="edge")
+    blocks = padded.reshape(n_buckets, size)
+    base = np.arange(n_buckets) * size
+
+    idx = np.concatenate([base + blocks.argmin(axis=1), base + blocks.argmax(axis=1)])
+    return np.unique(np.minimum(idx, n - 1))
+
+
+def curvature_indices(points: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Índices de una curva (n, k) repartidos a partes iguales entre longitud de
+    arco y ángulo girado: los tramos curvos quedan más densos.
+    """
+    n = len(points)
+    if n <= n_out:
+        return np.arange(n)
+
+    d = np.diff(points, axis=0)
+    seg = np.linalg.norm(d, axis=1)
+    u = d / np.where(seg > 0, seg, 1.0)[:, None]
+    ang = np.arccos(np.clip(np.sum(u[:-1] * u[1:], axis=1), -1.0, 1.0))
+
+    w = np.zeros(n)
+    if seg.sum() > 0:
+        w[1:] += seg / seg.sum()
+    if ang.sum() > 0:
+        w[1:-1] += ang / ang.sum()
+
+    cum = np.cumsum(w)
+    levels = np.linspace(0.0, cum[-1], n_out)
+    idx = np.searchsorted(cum, levels)
+    return np.unique(np.clip(idx, 0, n - 1))
+
+
+def apsis_indices(r: np.ndarray, max_points: int = MAX_POINTS) -> np.ndarray:
+    """
+    Periapsis y apoapsis: extremos locales de r con prominencia. Los
+    candidatos son los mínimos/máximos locales que además son el extremo
+    de su cubeta (minmax_indices), así que no hay más de `max_points`; de
+    ellos se quedan los que forman un zigzag con saltos de al menos la
+    tolerancia (APSIS_REL_TOL, APSIS_ABS_TOL).
+    """
+    r = np.asarray(r, dtype=float)
+    if len(r) < 3:
+        return np.arange(len(r))
+    mid, prev, nxt = r[1:-1], r[:-2], r[2:]
+    local = np.zeros(len(r), dtype=bool)
+    local[1:-1] = ((mid <= prev) & (mid < nxt)) | ((mid >= prev) & (mid > nxt))
+    cands = minmax_indices(r, max(max_points // 2, 1))
+    cands = cands[local[cands]]
+    if len(cands) == 0:
+        return cands
+
+    tol = max(APSIS_REL_TOL * (np.max(r) - np.min(r)), APSIS_ABS_TOL * np.max(np.abs(r)))
+    pivots = []
+    hi = lo = ext = cands[0]
+    trend = 0   # 1 subiendo (se busca un máximo), -1 bajando
+    for c in cands[1:]:
+        v = r[c]
+        if trend == 0:
+            if v > r[hi]:
+                hi = c
+            if v < r[lo]:
+                lo = c
+            if r[hi] - r[lo] >= tol:
+                trend = 1 if hi > lo else -1
+                pivots.append(lo if trend == 1 else hi)
+                ext = hi if trend == 1 else lo
+        elif trend == 1:
+            if v > r[ext]:
+                ext = c
+            elif r[ext] - v >= tol:
+                pivots.append(ext)
+                ext, trend = c, -1
+        else:
+            if v < r[ext]:
+                ext = c
+            elif v - r[ext] >= tol:
+                pivots.append(ext)
+                ext, trend = c, 1
+    if trend != 0:
+        pivots.append(ext)
+    return np.array(pivots, dtype=int)
+
+
+def burn_indices(t: np.ndarray, burn_times) -> np.ndarray:
+    """
+    Filas alrededor de cada burn. El report tiene dos filas en el mismo
+    instante (antes y después del impulso): se guardan todas las filas de
+    ese instante y sus vecinas, aunque el tiempo del burn de la config no
+    coincida al bit con el del report.
+    """
+    n = len(t)
+    if n == 0 or len(burn_times) == 0:
+        return np.empty(0, dtype=int)
+    tb = np.asarray(burn_times, dtype=float)
+    tb = tb[(tb >= t[0]) & (tb <= t[-1])]
+    lo = np.searchsorted(t, tb, side="left")
+    hi = np.searchsorted(t, tb, side="right")
+    idx = np.clip(np.concatenate([lo - 1, lo, hi - 1, hi]), 0, n - 1)
+    # Cada fila arrastra a las que comparten su instante
+    first = np.searchsorted(t, t[idx], side="left")
+    last = np.searchsorted(t, t[idx], side="right")
+    idx = np.concatenate([np.arange(a, b) for a, b in zip(first, last)] + [idx])
+    return np.unique(np.clip(np.concatenate([idx - 1, idx, idx + 1]), 0, n - 1))
+
+
+def _with_keep(idx, t, burn_times, r, max_points: int = MAX_POINTS):
+    """
+    `idx` más los puntos forzados: extremos y burns siempre; los
+    periapsis/apoapsis, como mucho max_points // 2 (repartidos a lo largo
+    de la trayectoria).
+    """
+    keep = [idx, [0, len(t) - 1], burn_indices(t, burn_times)]
+    if r is not None:
+        apses = apsis_indices(r, max_points)
+        cap = max(max_points // 2, 2)
+        if len(apses) > cap:
+            apses = apses[np.unique(np.linspace(0, len(apses) - 1, cap).round().astype(int))]
+        keep.append(apses)
+    return np.unique(np.concatenate(keep).astype(int))
+
+
+def series_indices(t: np.ndarray, ys, burn_times=(), r=None,
+                   max_points: int = MAX_POINTS) -> np.ndarray:
+    """Índices para dibujar una o varias series y(t) con ~max_points puntos cada una."""
+    n = len(t)
+    if n == 0:
+        return np.arange(0)
+    if n <= max_points:
+        return np.arange(n)
+    n_buckets = max(max_points // 2, 1)
+    idx = np.concatenate([minmax_indices(y, n_buckets) for y in ys])
+    return _with_keep(idx, t, burn_times, r, max_points)
+
+
+def orbit_indices(points: np.ndarray, t: np.ndarray, burn_times=(), r=None,
+                  max_points: int = MAX_POINTS) -> np.ndarray:
+    """Índices para dibujar la curva `points` (n, 2 o 3) con ~max_points puntos."""
+    n = len(points)
+    if n == 0:
+        return np.arange(0)
+    if n <= max_points:
+        return np.arange(n)
+    return _with_keep(curvature_indices(points, max_points), t, burn_times, r, max_points)
@@ -0,0 +1,288 @@
+"""
+Backend de GMAT por su API de Python (gmatpy) en un proceso de larga vida.
+
+Cada GmatConsole vuelve a cargar el motor, las efemérides y los plugins
+antes de propagar. Aquí gmatpy se importa una sola vez en un proceso
+hijo (GmatEngine) y cada ejecución solo hace LoadScript + RunScript: el
+arranque se paga en la primera ejecución y no en cada una. El worker
+parsea el report nada más terminar y manda el array por la tubería; el
+proceso principal escribe el report y su sidecar .npy sin volver a
+parsearlo.
+
+La API de Python existe desde GMAT R2020a (no en R2019aBeta). Variables
+de entorno:
+    AM1_GMAT_BACKEND  auto (por defecto): gmatpy si se puede importar,
+                      si no GmatConsole; api: gmatpy (si falla, se avisa
+                      y se usa GmatConsole); console: siempre GmatConsole.
+    AM1_GMATPY        módulo a importar, "gmatpy" por defecto. Admite
+                      "modulo:atributo" (p.ej. "load_gmat:gmat") y
+                      cualquier módulo con LoadScript/RunScript, como el
+                      simulador BENCHMARKS/fake_gmat/gmatpy.py.
+    AM1_GMATPY_PATH   carpeta que se añade al sys.path del worker
+                      (normalmente <GMAT>/bin).
+"""
+from importlib.machinery import PathFinder
+from pathlib import Path
+from shutil import copy2, rmtree
+import atexit
+import hashlib
+import importlib
+import multiprocessing
+import os
+import sys
+import threading
+import uuid
+
+import pandas as pd
+
+from SOURCES.utils import SCRATCH_DIR
+
+
+BACKEND_ENV = "AM1_GMAT_BACKEND"
+MODULE_ENV = "AM1_GMATPY"
+PATH_ENV = "AM1_GMATPY_PATH"
+DEFAULT_MODULE = "gmatpy"
+
+# Máximo para importar el módulo y dejar el motor listo [s]
+START_TIMEOUT = 120.0
+
+
+class GmatApiUnavailable(RuntimeError):
+    """No se puede usar gmatpy: hay que ir por GmatConsole."""
+
+
+def _module_spec() -> tuple[str, str | None, str | None]:
+    """(módulo, atributo, carpeta extra) a partir del entorno."""
+    name = os.environ.get(MODULE_ENV, "").strip() or DEFAULT_MODULE
+    module, _, attr = name.partition(":")
+    return module, attr or None, os.environ.get(PATH_ENV, "").strip() or None
+
+
+def api_importable() -> bool:
+    """Si el módulo de gmatpy existe, sin importarlo (ni cargar GMAT) aquí."""
+    module, _, extra = _module_spec()
+    top = module.split(".")[0]
+    if top in sys.modules:
+        return True
+    paths = ([extra] if extra else []) + sys.path
+    return PathFinder.find_spec(top, paths) is not None
+
+
+def api_enabled() -> bool:
+    backend = os.environ.get(BACKEND_ENV, "auto").strip().lower()
+    if backend == "console":
+        return False
+    if _failed:
+        return False
+    if backend == "api":
+        return True
+    return api_importable()
+
+
+def api_version() -> str:
+    """Identificador de gmatpy para la caché de resultados (como gmat_version)."""
+    module, attr, extra = _module_spec()
+    spec = PathFinder.find_spec(module.split(".")[0], ([extra] if extra else []) + sys.path)
+    origin = Path(spec.origin) if spec is not None and spec.origin else None
+    if origin is None or not origin.exists():
+        return f"gmatpy:{module}:{attr}"
+    st = origin.stat()
+    return f"gmatpy:{origin}:{st.st_size}:{int(st.st_mtime)}"
+
+
+# ---------- proceso worker ----------
+
+def _load_module(module: str, attr: str | None, extra: str | None):
+    if extra:
+        sys.path.insert(0, extra)
+    mod = importlib.import_module(module)
+    return getattr(mod, attr) if attr else mod
+
+
+def _worker(conn, module: str, attr: str | None, extra: str | None):
+    from SOURCES.report_parser import parse_report
+
+    try:
+        gmat = _load_module(module, attr, extra)
+    except BaseException as e:
+        conn.send(("error", f"No se pudo importar {module}: {type(e).__name__}: {e}"))
+        return
+    conn.send(("ready", getattr(gmat, "__file__", module)))
+
+    loaded = None   # hash del último script cargado
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            return
+        if msg is None:
+            return
+
+        script_path, report = msg
+        try:
+            # Mismo script que la vez anterior: basta con volver a ejecutarlo
+            digest = hashlib.sha256(Path(script_path).read_bytes()).hexdigest()
+            if digest != loaded:
+                loaded = None
+                if not gmat.LoadScript(str(script_path)):
+                    raise RuntimeError(f"LoadScript falló: {script_path}")
+                loaded = digest
+            if not gmat.RunScript():
+                raise RuntimeError("RunScript falló")
+            if not Path(report).exists():
+                raise FileNotFoundError(f"GMAT terminó pero no se generó el report file: {report}")
+            columns, data = parse_report(Path(report))
+            conn.send(("ok", columns, data))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+# ---------- proceso principal ----------
+
+class GmatEngine:
+    """
+    Proceso hijo con gmatpy ya importado. run() es bloqueante y solo hay
+    una ejecución a la vez; poll()/kill() imitan a subprocess.Popen para
+    poder cancelarla igual que un GmatConsole (el motor se vuelve a
+    arrancar en la siguiente ejecución).
+    """
+
+    def __init__(self, module: str | None = None, attr: str | None = None,
+                 extra_path: str | None = None):
+        env_module, env_attr, env_path = _module_spec()
+        self.module = module or env_module
+        self.attr = attr if module else env_attr
+        self.extra_path = extra_path or env_path
+        self._proc = None
+        self._conn = None
+        self._busy = False
+        self._lock = threading.Lock()
+        # Carpeta fija: el script reescrito es el mismo en cada ejecución y
+        # el worker puede ahorrarse el LoadScript si no cambió
+        self.workdir = (SCRATCH_DIR / f"gmatpy_{os.getpid()}_{uuid.uuid4().hex[:6]}").resolve()
+
+    def start(self):
+        if self._proc is not None and self._proc.is_alive():
+            return
+        # spawn: no se hereda el estado de Qt ni de los hilos del proceso principal
+        ctx = multiprocessing.get_context("spawn")
+        parent, child = ctx.Pipe()
+        self._proc = ctx.Process(
+            target=_worker, args=(child, self.module, self.attr, self.extra_path),
+            name="gmatpy", daemon=True,
+        )
+        self._proc.start()
+        child.close()
+        self._conn = parent
+
+        if not parent.poll(START_TIMEOUT):
+            self.kill()
+            raise GmatApiUnavailable(f"{self.module} no arrancó en {START_TIMEOUT:.0f} s")
+        try:
+            status, info = parent.recv()
+        except EOFError:
+            status, info = "error", f"el proceso de {self.module} terminó al arrancar"
+        if status != "ready":
+            self.kill()
+            raise GmatApiUnavailable(info)
+        print("✅ Motor GMAT (API) cargado:", info)
+
+    def run(self, script_path: Path, report: Path) -> tuple[list, object]:
+        """Ejecuta el script y devuelve (columnas, array) del report `report`."""
+        with self._lock:
+            self.start()
+            self._busy = True
+            try:
+                self._conn.send((str(script_path), str(report)))
+                reply = self._conn.recv()
+            except (EOFError, OSError):
+                self.kill()
+                raise RuntimeError("El proceso de GMAT (API) terminó inesperadamente")
+            finally:
+                self._busy = False
+
+        if reply[0] != "ok":
+            raise RuntimeError(reply[1])
+        return reply[1], reply[2]
+
+    def poll(self):
+        """None mientras hay una ejecución en curso (como Popen.poll)."""
+        if self._busy and self._proc is not None and self._proc.is_alive():
+            return None
+        return 0
+
+    def kill(self):
+        if self._proc is not None and self._proc.is_alive():
+            self._proc.kill()
+            self._proc.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._proc = None
+        self._conn = None
+
+    def close(self):
+        if self._proc is not None and self._proc.is_alive():
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+            self._proc.join(timeout=5)
+        self.kill()
+        rmtree(self.workdir, ignore_errors=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+# Si gmatpy falló al arrancar, no se vuelve a intentar en este proceso
+_failed = None
+
+
+def get_engine() -> GmatEngine:
+    """Motor compartido (se arranca en la primera llamada)."""
+    global _engine, _failed
+    with _engine_lock:
+        if _failed:
+            raise GmatApiUnavailable(_failed)
+        if _engine is None:
+            _engine = GmatEngine()
+            atexit.register(_engine.close)
+        try:
+            _engine.start()
+        except GmatApiUnavailable as e:
+            _failed = str(e)
+            raise
+        return _engine
+
+
+def run_gmat_api(script_path: Path, dst: Path, engine: GmatEngine | None = None) -> pd.DataFrame:
+    """
+    Como run_gmat pero con el motor ya cargado: copia el report a `dst`,
+    deja su sidecar escrito y devuelve la tabla. Lanza GmatApiUnavailable
+    si no se puede usar gmatpy (el llamador vuelve a GmatConsole).
+    """
+    from SOURCES.GMAT_exec import rewrite_report_paths
+    from SOURCES.report_parser import write_sidecar
+
+    engine = engine or get_engine()
+    engine.workdir.mkdir(parents=True, exist_ok=True)
+    job_report = engine.workdir / "DefaultReportFile.txt"
+    job_report.unlink(missing_ok=True)
+
+    text = Path(script_path).read_text(encoding="utf-8")
+    job_script = engine.workdir / Path(script_path).name
+    job_script.write_text(rewrite_report_paths(text, engine.workdir), encoding="utf-8")
+
+    columns, data = engine.run(job_script, job_report)
+
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    copy2(job_report, dst)
+    write_sidecar(dst, columns, data)
+    print("✅ ReportFile (API) copiado a:", dst)
+    return pd.DataFrame(data, columns=columns, copy=False)
@@ -0,0 +1,111 @@
+"""
+Propagador analítico de dos cuerpos (variable universal).
+
+Para tramos sin maniobras con solo el cuerpo central (sin J2, drag ni SRP)
+no hace falta integrar: se resuelve la ecuación de Kepler universal para
+todos los instantes de salida a la vez, con operaciones de array O(T).
+"""
+import numpy as np
+
+
+def stumpff(z: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Funciones de Stumpff C(z), S(z) vectorizadas (serie cerca de z = 0)."""
+    z = np.asarray(z, dtype=float)
+    c = np.empty_like(z)
+    s = np.empty_like(z)
+
+    small = np.abs(z) < 1e-6
+    pos = (z > 0) & ~small
+    neg = (z < 0) & ~small
+
+    sz = np.sqrt(z[pos])
+    c[pos] = (1.0 - np.cos(sz)) / z[pos]
+    s[pos] = (sz - np.sin(sz)) / sz**3
+
+    sz = np.sqrt(-z[neg])
+    c[neg] = (np.cosh(sz) - 1.0) / -z[neg]
+    s[neg] = (np.sinh(sz) - sz) / sz**3
+
+    zs = z[small]
+    c[small] = 1/2 - zs/24 + zs**2/720
+    s[small] = 1/6 - zs/120 + zs**2/5040
+
+    return c, s
+
+
+def propagate_kepler(state0: np.ndarray, dt: np.ndarray, mu: float,
+                     tol: float = 1e-12, max_iter: int = 50) -> np.ndarray:
+    """
+    Estados (T, 6) tras los tiempos `dt` [s] desde `state0`.
+    Lanza RuntimeError si la iteración no converge en algún instante.
+    """
+    dt = np.atleast_1d(np.asarray(dt, dtype=float))
+    r0v = np.asarray(state0[:3], dtype=float)
+    v0v = np.asarray(state0[3:], dtype=float)
+
+    sqmu = np.sqrt(mu)
+    r0 = np.linalg.norm(r0v)
+    vr0 = r0v @ v0v / r0
+    alpha = 2.0 / r0 - (v0v @ v0v) / mu
+
+    # En órbitas cerradas basta con propagar dt módulo el periodo
+    if alpha > 1e-12:
+        period = 2.0 * np.pi / np.sqrt(mu * alpha**3)
+        dt_red = np.fmod(dt, period)
+        chi = sqmu * alpha * dt_red
+    elif alpha < -1e-12:
+        # Estimación inicial hiperbólica (Vallado)
+        dt_red = dt
+        a = 1.0 / alpha
+        sgn = np.where(dt >= 0, 1.0, -1.0)
+        arg = (-2.0 * mu * alpha * dt) / (
+            r0v @ v0v + sgn * np.sqrt(-mu * a) * (1.0 - r0 * alpha))
+        chi = sgn * np.sqrt(-a) * np.log(np.maximum(arg, 1e-12))
+    else:
+        dt_red = dt
+        chi = sqmu * dt / r0
+
+    a1 = r0 * vr0 / sqmu
+    a2 = 1.0 - alpha * r0
+
+    # Iteración de Laguerre-Conway (n = 5): converge desde casi cualquier chi
+    n = 5.0
+    for _ in range(max_iter):
+        z = alpha * chi**2
+        c, s = stumpff(z)
+        f = a1 * chi**2 * c + a2 * chi**3 * s + r0 * chi - sqmu * dt_red
+        df = a1 * chi * (1.0 - z * s) + a2 * chi**2 * c + r0
+        ddf = a1 * (1.0 - z * c) + a2 * chi * (1.0 - z * s)
+        root = np.sqrt(np.abs((n - 1)**2 * df**2 - n * (n - 1) * f * ddf))
+        delta = n * f / (df + np.sign(df) * root)
+        chi = chi - delta
+        if np.all(np.abs(delta) <= tol * np.maximum(1.0, np.abs(chi))):
+            break
+    else:
+        raise RuntimeError("Kepler: la iteración no converge")
+
+    z = alpha * chi**2
+    c, s = stumpff(z)
+
+    f = 1.0 - chi**2 / r0 * c
+    g = dt_red - chi**3 / sqmu * s
+    r = f[:, None] * r0v + g[:, None] * v0v
+    rn = np.linalg.norm(r, axis=1)
+
+    fdot = sqmu / (rn * r0) * (alpha * chi**3 * s - chi)
+    gdot = 1.0 - chi**2 / rn * c
+    v = fdot[:, None] * r0v + gdot[:, None] * v0v
+
+    return np.hstack([r, v])
+
+
+def kepler_segment(state, t0, t1, mu, sample_step):
+    """
+    Tramo analítico de t0 a t1 [s] muestreado cada `sample_step` [s].
+    Devuelve (tiempos, estados) incluido el instante inicial.
+    """
+    times = np.arange(t0, t1, sample_step)
+    times = np.append(times, t1)
+    states = propagate_kepler(state, times - t0, mu)
+    states[0] = state
+    return list(times), list(states)
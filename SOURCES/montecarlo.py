@@ -0,0 +1,423 @@
+"""
+Análisis de dispersión Monte Carlo alrededor de un datos_guardados.txt
+nominal.
+
+Cada muestra es la config nominal con perturbaciones aleatorias:
+
+    {
+      "base": "DATA/input/datos_guardados.txt",
+      "samples": 1000,
+      "seed": 1,
+      "fields": {
+        "SPACECRAFT.x":  {"sigma": 1.0},
+        "SPACECRAFT.vy": {"sigma": 0.001},
+        "SPACECRAFT.TA": {"uniform": [-0.5, 0.5]}
+      },
+      "burns": {
+        "magnitude_sigma": 0.01,
+        "pointing_sigma_deg": 0.5,
+        "time_sigma_days": 0.001
+      }
+    }
+
+"fields" suma un error normal (sigma) o uniforme a cualquier campo
+numérico ("SECCIÓN.Campo" como en SOURCES/sweep.py). "burns" se aplica a
+cada burn activo: error relativo en |ΔV|, error de apuntamiento (giro del
+vector ΔV un ángulo normal alrededor de un eje perpendicular aleatorio) y
+desplazamiento del tiempo del burn. La muestra i usa el generador
+default_rng([seed, i]): es la misma sea cual sea el orden de ejecución o
+el nº de procesos.
+
+Las muestras se ejecutan en paralelo (sweep.iter_points) y sus estados
+en la rejilla de tiempos se acumulan al llegar, sin guardarlos: media y
+covarianza con Welford (RunningMoments) y percentiles de r y |V| con un
+histograma por instante (StreamingHistogram). La memoria depende de la
+rejilla, no del nº de muestras.
+"""
+from pathlib import Path
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from SOURCES.Transpiler import (
+    DATA_FILE, build_gmat_script, field_value, normalize_config, parse_gui_txt, to_float,
+)
+from SOURCES.GMAT_exec import run_gmat_job, select_engine
+from SOURCES.propagator import propagate_config
+from SOURCES.report_parser import load_report_array
+from SOURCES.sweep import field_key, iter_points, resample, with_fields
+
+
+# Percentiles que se guardan de r y |V|
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+# Interpolación lineal en la función de distribución, como el histograma
+PERCENTILE_METHOD = "interpolated_inverted_cdf"
+
+# Secciones de los burns y campos de ΔV
+BURN_SECTIONS = ("impulsive_burn", "impulsive_burn_2")
+DV_KEYS = ("Delta V Element 1", "Delta V Element 2", "Delta V Element 3")
+
+
+# ---------- estadística online ----------
+
+class RunningMoments:
+    """
+    Media y covarianza online (Welford) de un vector de d componentes en
+    cada uno de T instantes. Las muestras con NaN en un instante no cuentan
+    en ese instante. Memoria O(T·d²), independiente del nº de muestras.
+    """
+
+    def __init__(self, T: int, d: int):
+        self.n = np.zeros(T, dtype=np.int64)
+        self.mean = np.zeros((T, d))
+        self.m2 = np.zeros((T, d, d))
+
+    def update(self, x: np.ndarray):
+        """Añade una muestra (T, d)."""
+        ok = np.all(np.isfinite(x), axis=1)
+        self.n += ok
+        delta = np.where(ok[:, None], x - self.mean, 0.0)
+        self.mean += delta / np.maximum(self.n, 1)[:, None]
+        delta2 = np.where(ok[:, None], x - self.mean, 0.0)
+        self.m2 += delta[:, :, None] * delta2[:, None, :]
+
+    @property
+    def cov(self) -> np.ndarray:
+        """Covarianza muestral (T, d, d); NaN donde hay menos de 2 muestras."""
+        n = self.n[:, None, None]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(n > 1, self.m2 / (n - 1), np.nan)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(np.diagonal(self.cov, axis1=1, axis2=2))
+
+
+class StreamingHistogram:
+    """
+    Percentiles online de un escalar en T instantes: un histograma de
+    `bins` cubos por instante. El rango de cada instante se fija cuando ese
+    instante lleva `warmup` muestras finitas (su mínimo y máximo, ampliados
+    la mitad del intervalo por cada lado); hasta entonces sus valores se
+    guardan tal cual, así que un instante que es NaN en las primeras
+    muestras (p.ej. una propagación más corta) espera a tener datos. Si
+    llega un valor fuera del rango, el rango de ese instante se duplica
+    (juntando cubos de dos en dos) hasta `max_widen` veces; lo que aún
+    cae fuera va al cubo del extremo y se cuenta en `clipped` (T,). Los
+    percentiles son los de la distribución empírica (np.percentile con
+    method=PERCENTILE_METHOD) con un error de como mucho un cubo (del
+    ancho final) si no hay recortes; con menos de `warmup` muestras
+    finitas son exactos. Memoria O(T·(bins + warmup)).
+    """
+
+    def __init__(self, T: int, bins: int = 2000, warmup: int = 100, max_widen: int = 6):
+        if bins % 2:
+            raise ValueError(f"bins debe ser par: {bins}")
+        self.T = T
+        self.bins = bins
+        self.warmup = warmup
+        self.max_widen = max_widen
+        self.n = 0
+        self.clipped = np.zeros(T, dtype=np.int64)
+        self.min = np.full(T, np.inf)
+        self.max = np.full(T, -np.inf)
+        self.ready = np.zeros(T, dtype=bool)
+        self.lo = np.zeros(T)
+        self.width = np.ones(T)
+        self.widened = np.zeros(T, dtype=np.int64)
+        self.counts = np.zeros((T, bins), dtype=np.int64)
+        # Muestras finitas de los instantes que aún no tienen rango
+        self._buffer = np.full((warmup, T), np.nan)
+        self._filled = np.zeros(T, dtype=np.int64)
+
+    def update(self, x: np.ndarray):
+        """Añade una muestra (T,)."""
+        x = np.asarray(x, dtype=float)
+        self.n += 1
+        self.min = np.fmin(self.min, x)
+        self.max = np.fmax(self.max, x)
+        ok = np.isfinite(x)
+
+        self._add(x, ok & self.ready)
+
+        waiting = np.nonzero(ok & ~self.ready)[0]
+        if waiting.size:
+            self._buffer[self._filled[waiting], waiting] = x[waiting]
+            self._filled[waiting] += 1
+            full = waiting[self._filled[waiting] >= self.warmup]
+            if full.size:
+                self._start(full)
+
+    def _start(self, rows: np.ndarray):
+        buf = self._buffer[:, rows]
+        lo, hi = buf.min(axis=0), buf.max(axis=0)
+        span = np.maximum(hi - lo, 1e-9 * np.maximum(np.abs(hi), 1.0))
+        self.lo[rows] = lo - 0.5 * span
+        self.width[rows] = 2.0 * span / self.bins
+        self.ready[rows] = True
+        mask = np.zeros(self.T, dtype=bool)
+        mask[rows] = True
+        for x in self._buffer:
+            self._add(x, mask)
+        self._buffer[:, rows] = np.nan
+        self._filled[rows] = 0
+
+    def _add(self, x: np.ndarray, mask: np.ndarray):
+        rows = np.nonzero(mask)[0]
+        if not rows.size:
+            return
+        k = np.floor((x[rows] - self.lo[rows]) / self.width[rows])
+        out = (k < 0) | (k >= self.bins)
+        if out.any():
+            for r in rows[out]:
+                self._widen(r, x[r])
+            k = np.floor((x[rows] - self.lo[rows]) / self.width[rows])
+            out = (k < 0) | (k >= self.bins)
+            self.clipped[rows[out]] += 1
+        k = np.clip(k, 0, self.bins - 1).astype(np.int64)
+        self.counts[rows, k] += 1
+
+    def _widen(self, r: int, value: float):
+        """Duplica el rango del instante r (juntando cubos de dos en dos) hasta que quepa `value`."""
+        half = self.bins // 2
+        while self.widened[r] < self.max_widen:
+            hi = self.lo[r] + self.bins * self.width[r]
+            if self.lo[r] <= value < hi:
+                return
+            merged = self.counts[r].reshape(half, 2).sum(axis=1)
+            self.counts[r] = 0
+            if value < self.lo[r]:
+                self.counts[r, half:] = merged
+                self.lo[r] -= self.bins * self.width[r]
+            else:
+                self.counts[r, :half] = merged
+            self.width[r] *= 2.0
+            self.widened[r] += 1
+
+    def percentiles(self, q) -> np.ndarray:
+        """Percentiles `q` (0-100) en cada instante: array (len(q), T)."""
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        cdf = np.cumsum(self.counts, axis=1)
+        total = cdf[:, -1]
+        # Último cubo no vacío antes de cada cubo (-1 si no hay): la CDF se
+        # interpola entre los bordes derechos de cubos no vacíos, como
+        # np.percentile entre muestras vecinas, aunque haya cubos vacíos
+        # en medio (colas con pocas muestras)
+        nonempty = np.where(self.counts > 0, np.arange(self.bins), -1)
+        last = np.maximum.accumulate(nonempty, axis=1)
+        out = np.full((q.size, self.T), np.nan)
+        rows = np.arange(self.T)
+        for j, qj in enumerate(q):
+            target = qj / 100.0 * total
+            k = np.argmax(cdf >= target[:, None], axis=1)
+            prev = np.where(k > 0, last[rows, np.maximum(k - 1, 0)], -1)
+            x0 = self.lo + np.where(prev >= 0, prev + 1, k) * self.width
+            c0 = np.where(prev >= 0, cdf[rows, np.maximum(prev, 0)], 0)
+            x1 = self.lo + (k + 1) * self.width
+            c1 = cdf[rows, k]
+            frac = np.where(c1 > c0, (target - c0) / np.maximum(c1 - c0, 1), 0.0)
+            value = x0 + frac * (x1 - x0)
+            out[j] = np.where(self.ready, np.clip(value, self.min, self.max), np.nan)
+
+        # Instantes aún sin rango: percentiles exactos de lo guardado
+        waiting = np.nonzero(~self.ready & (self._filled > 0))[0]
+        if waiting.size:
+            with np.errstate(all="ignore"):
+                out[:, waiting] = np.nanpercentile(self._buffer[:, waiting], q, axis=0,
+                                                   method=PERCENTILE_METHOD)
+        return out
+
+
+# ---------- muestreo ----------
+
+def load_spec(path: Path) -> dict:
+    spec = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not spec.get("fields") and not spec.get("burns"):
+        raise ValueError(f"{path}: la dispersión no tiene 'fields' ni 'burns'")
+    return spec
+
+
+def _rotate(v: np.ndarray, axis: np.ndarray, angle: float) -> np.ndarray:
+    """Rodrigues: v girado `angle` [rad] alrededor del eje unitario `axis`."""
+    return (v * np.cos(angle) + np.cross(axis, v) * np.sin(angle)
+            + axis * np.dot(axis, v) * (1.0 - np.cos(angle)))
+
+
+def sample_config(base: dict, spec: dict, i: int, keys: list | None = None) -> dict:
+    """
+    Muestra i de la dispersión `spec` alrededor de `base`. Siempre se
+    sacan los mismos números aleatorios por campo y por burn, así que
+    activar o quitar un error no cambia los demás.
+    """
+    rng = np.random.default_rng([int(spec.get("seed", 0)), i])
+    fields = spec.get("fields", {})
+    keys = keys or [field_key(name, base) for name in fields]
+    values = {}
+
+    for (section, key), err in zip(keys, fields.values()):
+        # Un campo vacío se perturba alrededor del default de normalize_config
+        nominal = field_value(base, section, key)
+        z, u = rng.standard_normal(), rng.random()
+        if "sigma" in err:
+            values[section, key] = nominal + float(err["sigma"]) * z
+        elif "uniform" in err:
+            a, b = map(float, err["uniform"])
+            values[section, key] = nominal + a + (b - a) * u
+        else:
+            raise ValueError(f"Error de campo sin 'sigma' ni 'uniform': {err}")
+
+    burns = spec.get("burns", {})
+    mag_sigma = float(burns.get("magnitude_sigma", 0.0))
+    pointing_sigma = np.radians(float(burns.get("pointing_sigma_deg", 0.0)))
+    time_sigma = float(burns.get("time_sigma_days", 0.0))
+
+    for section in BURN_SECTIONS:
+        z_mag, z_angle, z_time = rng.standard_normal(3)
+        direction = rng.standard_normal(3)
+        ib = base.get(section)
+        if not ib:
+            continue
+        dv = np.array([to_float(ib.get(k, "0"), 0.0) for k in DV_KEYS])
+        if not np.any(dv):
+            continue   # burn inactivo: no se activa por el error
+
+        new_dv = dv * (1.0 + mag_sigma * z_mag)
+        if pointing_sigma > 0.0:
+            # Eje perpendicular a ΔV en una dirección aleatoria
+            axis = np.cross(dv, direction)
+            norm = np.linalg.norm(axis)
+            if norm > 0.0:
+                new_dv = _rotate(new_dv, axis / norm, pointing_sigma * z_angle)
+        for k, v in zip(DV_KEYS, new_dv):
+            values[section, k] = v
+
+        if time_sigma > 0.0 and ib.get("Tiempo burn", "").strip():
+            values[section, "Tiempo burn"] = to_float(ib["Tiempo burn"], 0.0) + time_sigma * z_time
+
+    return with_fields(base, values)
+
+
+# ---------- ejecución ----------
+
+def run_nominal(base_path: Path, engine: str, out_dir: Path) -> np.ndarray:
+    """Caso nominal completo (sin remuestrear), para sus gráficas."""
+    cfg = parse_gui_txt(base_path)
+    if engine == "native":
+        _, data = propagate_config(cfg)
+        return data
+    out_dir.mkdir(parents=True, exist_ok=True)
+    script = out_dir / "nominal.script"
+    build_gmat_script(cfg, script)
+    report = run_gmat_job(script, out_dir)
+    _, data = load_report_array(report)
+    return data
+
+
+def run_montecarlo(spec: dict, out_dir: Path, engine: str | None = None,
+                   workers: int | None = None, samples: int | None = None,
+                   t_samples: int = 200, keep_reports: bool = False,
+                   plots: bool = True, progress=None) -> dict:
+    """
+    Ejecuta la dispersión `spec` (ver el docstring del módulo) y guarda en
+    `out_dir`:
+
+    - montecarlo.npz: t [días] (T,), n (T,) muestras válidas por instante,
+      nominal (T, 6), mean (T, 6), cov (T, 6, 6), r_* y v_* (mean, std,
+      min, max, clipped (T,) y pct (len(q), T) con los percentiles q), y
+      la media y covarianza del estado final (final_mean (6,), final_cov (6, 6));
+    - summary.json: especificación, motor, tiempos y errores;
+    - plots/: las gráficas del caso nominal (make_plots) y las envolventes
+      de dispersión de r y |V| (make_dispersion_plots).
+    """
+    t_start = time.perf_counter()
+    base_path = Path(spec.get("base") or DATA_FILE)
+    base = parse_gui_txt(base_path)
+    n = int(samples or spec.get("samples", 1000))
+    seed = int(spec.get("seed", 0))
+    spec = dict(spec, seed=seed)
+    keys = [field_key(name, base) for name in spec.get("fields", {})]
+
+    p = normalize_config(base)
+    engine = select_engine(p, engine)
+    t_grid = np.linspace(0.0, p["dur_days"], t_samples)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    print(f"▶ Monte Carlo: {n} muestras (semilla {seed}), motor {engine}")
+
+    t0 = time.perf_counter()
+    nominal = run_nominal(base_path, engine, out_dir / "nominal")
+    timings = {"nominal": round(time.perf_counter() - t0, 4)}
+
+    state = RunningMoments(t_samples, 6)
+    final = RunningMoments(1, 6)
+    norms = RunningMoments(t_samples, 2)   # r y |V|
+    radius = StreamingHistogram(t_samples)
+    speed = StreamingHistogram(t_samples)
+    errors = []
+
+    t0 = time.perf_counter()
+    cfgs = (sample_config(base, spec, i, keys) for i in range(n))
+    for done, (i, result) in enumerate(
+            iter_points(cfgs, t_grid, engine, out_dir, workers, keep_reports, timings), 1):
+        if isinstance(result, Exception):
+            errors.append({"sample": i, "error": f"{type(result).__name__}: {result}"})
+        else:
+            _, last, history = result
+            r = np.linalg.norm(history[:, :3], axis=1)
+            v = np.linalg.norm(history[:, 3:], axis=1)
+            state.update(history)
+            final.update(last[None, 1:])
+            norms.update(np.column_stack([r, v]))
+            radius.update(r)
+            speed.update(v)
+        if progress is not None:
+            progress(done, n)
+    timings["run"] = round(time.perf_counter() - t0 - timings.get("transpile", 0.0), 4)
+
+    nominal_grid = resample(nominal, t_grid)
+    stats = {
+        "t": t_grid,
+        "n": state.n,
+        "nominal": nominal_grid,
+        "mean": state.mean,
+        "cov": state.cov,
+        "final_mean": final.mean[0],
+        "final_cov": final.cov[0],
+        "q": np.array(PERCENTILES, dtype=float),
+    }
+    norms_std = norms.std
+    for j, (name, hist) in enumerate((("r", radius), ("v", speed))):
+        stats[f"{name}_mean"] = norms.mean[:, j]
+        stats[f"{name}_std"] = norms_std[:, j]
+        stats[f"{name}_nominal"] = np.linalg.norm(nominal_grid[:, 3 * j:3 * j + 3], axis=1)
+        stats[f"{name}_min"] = hist.min
+        stats[f"{name}_max"] = hist.max
+        stats[f"{name}_pct"] = hist.percentiles(PERCENTILES)
+        stats[f"{name}_clipped"] = hist.clipped
+    np.savez(out_dir / "montecarlo.npz", **stats)
+
+    if plots:
+        t0 = time.perf_counter()
+        from SOURCES.plot_results import make_dispersion_plots, make_plots
+        make_plots(pd.DataFrame(nominal), out_dir / "plots", base_path, workers=1)
+        make_dispersion_plots(stats, out_dir / "plots", base_path)
+        timings["plots"] = round(time.perf_counter() - t0, 4)
+
+    summary = {
+        "base": str(base_path),
+        "spec": spec,
+        "engine": engine,
+        "samples": n,
+        "t_samples": t_samples,
+        "n_ok": n - len(errors),
+        "n_error": len(errors),
+        "clipped": {"r": int(radius.clipped.sum()), "v": int(speed.clipped.sum())},
+        "timings": dict(timings, total=round(time.perf_counter() - t_start, 4)),
+        "errors": errors[:100],
+    }
+    (out_dir / "summary.json").write_text(
+        json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    return dict(summary, **stats)
@@ -0,0 +1,282 @@
+"""
+Pipeline incremental por etapas: transpile -> run (GMAT o nativo) -> parse -> plots.
+
+Cada etapa declara sus entradas (ficheros o valores) y sus salidas
+(ficheros). Antes de ejecutarla se calcula la huella (SHA-256) de sus
+entradas y se compara con la de la última ejecución, guardada en
+DATA/output/pipeline_state.json. Una etapa solo se ejecuta si la huella
+cambió o falta alguna de sus salidas.
+
+Como las entradas de una etapa son las salidas de la anterior, si la
+etapa de arriba se repite pero produce el mismo fichero (p.ej. el mismo
+script de GMAT) la de abajo no se repite. El código de cada etapa también
+entra en la huella: cambiar solo plot_results.py rehace los PNG pero no
+vuelve a ejecutar GMAT.
+
+Uso (desde la raíz del proyecto), para ver qué se ejecutaría:
+    python -m SOURCES.pipeline --dry-run
+"""
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from SOURCES import decimation, kepler, plot_results, propagator, report_parser, Transpiler
+from SOURCES.Transpiler import DATA_FILE, SCRIPT_PATH, parse_gui_txt, normalize_config, build_gmat_script
+from SOURCES.GMAT_exec import run_gmat, select_engine, gmat_version
+from SOURCES.propagator import run_native, ENGINE_VERSION
+from SOURCES.plot_results import PLOTS, load_report, make_plots, leer_tiempos_burn
+from SOURCES.report_parser import sidecar_paths
+from SOURCES.cache import ResultCache, cache_key
+from SOURCES.utils import OUTPUT_DIR, PLOTS_DIR
+from SOURCES.trace import span
+
+
+STATE_PATH = OUTPUT_DIR / "pipeline_state.json"
+REPORT_PATH = OUTPUT_DIR / "DefaultReportFile.txt"
+
+
+def code_version(*modules) -> str:
+    """Huella del código fuente de los módulos (en el ejecutable, su nombre)."""
+    h = hashlib.sha256()
+    for m in modules:
+        src = Path(getattr(m, "__file__", "") or "")
+        if src.suffix == ".py" and src.exists():
+            h.update(src.read_bytes())
+        else:
+            h.update(m.__name__.encode())
+    return h.hexdigest()
+
+
+class PipelineCancelled(Exception):
+    pass
+
+
+class Stage:
+    def __init__(self, name: str, inputs: list, outputs: list, action):
+        self.name = name
+        self.inputs = inputs      # Path (se usa su contenido) o valores JSON
+        self.outputs = outputs    # Path que produce la etapa
+        self.action = action      # action(ctx)
+
+
+class Pipeline:
+    def __init__(self, stages: list, state_path: Path = STATE_PATH):
+        self.stages = stages
+        self.state_path = state_path
+        self.state = self._load_state()
+        self.ctx = {}
+
+    # ---------- estado y huellas ----------
+
+    def _load_state(self) -> dict:
+        if self.state_path.exists():
+            try:
+                return json.loads(self.state_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                pass
+        return {"stages": {}, "files": {}}
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state, indent=1), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    def file_hash(self, path: Path) -> str:
+        """
+        SHA-256 del contenido. Se memoriza por (tamaño, mtime) para no
+        releer reports grandes que no han cambiado.
+        """
+        if not path.exists():
+            return "missing"
+        st = path.stat()
+        key = str(path.resolve())
+        memo = self.state["files"].get(key)
+        if memo and memo["size"] == st.st_size and memo["mtime_ns"] == st.st_mtime_ns:
+            return memo["sha256"]
+
+        h = hashlib.sha256()
+        with path.open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        self.state["files"][key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def fingerprint(self, stage: Stage) -> str:
+        parts = []
+        for item in stage.inputs:
+            if isinstance(item, Path):
+                parts.append(["file", item.name, self.file_hash(item)])
+            else:
+                parts.append(["value", item])
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _why(self, stage: Stage, fp: str) -> str | None:
+        """Motivo para ejecutar la etapa, o None si está al día."""
+        saved = self.state["stages"].get(stage.name)
+        if saved is None:
+            return "sin ejecuciones previas"
+        if saved["fingerprint"] != fp:
+            return "entradas cambiadas"
+        missing = [o.name for o in stage.outputs if not o.exists()]
+        if missing:
+            return "faltan salidas: " + ", ".join(missing)
+        return None
+
+    # ---------- ejecución ----------
+
+    def plan(self) -> list:
+        """
+        Qué etapas se ejecutarían (dry-run), sin ejecutar nada. Si una etapa
+        depende de una salida que otra va a regenerar, no se puede saber si
+        cambiará: se marca como "quizá".
+        """
+        dirty = set()
+        plan = []
+        for stage in self.stages:
+            upstream = [i for i in stage.inputs if isinstance(i, Path) and i in dirty]
+            if upstream:
+                status, why = "quizá", "depende de " + ", ".join(p.name for p in upstream)
+            else:
+                why = self._why(stage, self.fingerprint(stage))
+                status = "ejecutar" if why else "al día"
+            if status != "al día":
+                dirty.update(stage.outputs)
+            plan.append({"stage": stage.name, "status": status, "reason": why})
+        return plan
+
+    def run(self, force: bool = False, on_stage=None, should_cancel=None) -> list:
+        """
+        Ejecuta las etapas pendientes. `on_stage(i, n, nombre)` informa del
+        progreso; si `should_cancel()` devuelve True se para antes de la
+        siguiente etapa con PipelineCancelled.
+        """
+        results = []
+        for i, stage in enumerate(self.stages):
+            if should_cancel is not None and should_cancel():
+                raise PipelineCancelled(f"cancelado antes de {stage.name}")
+            if on_stage is not None:
+                on_stage(i + 1, len(self.stages), stage.name)
+
+            fp = self.fingerprint(stage)
+            why = "forzado" if force else self._why(stage, fp)
+            if why is None:
+                print(f"⏭ {stage.name}: sin cambios")
+                results.append({"stage": stage.name, "ran": False, "reason": None, "seconds": 0.0})
+                continue
+
+            print(f"▶ {stage.name} ({why})")
+            t0 = time.perf_counter()
+            with span(f"stage.{stage.name}", reason=why):
+                stage.action(self.ctx)
+            dt = time.perf_counter() - t0
+
+            self.state["stages"][stage.name] = {"fingerprint": fp, "time": time.time()}
+            self._save_state()
+            results.append({"stage": stage.name, "ran": True, "reason": why, "seconds": round(dt, 4)})
+        return results
+
+
+def build_pipeline(engine: str | None = None, run_gmat_fn=None,
+                   data_file: Path = DATA_FILE, report: Path = REPORT_PATH,
+                   plots_dir: Path = PLOTS_DIR, state_path: Path = STATE_PATH,
+                   cache: ResultCache | None = None,
+                   script_path: Path = SCRIPT_PATH) -> Pipeline:
+    """
+    Pipeline del proyecto para la config de `data_file`.
+    `run_gmat_fn(script_path, report)` permite ejecutar GMAT de otra forma
+    (p.ej. leyendo el report en vivo desde la GUI); como run_gmat, deja el
+    report en `report` y devuelve la tabla ya leída.
+    """
+    p = normalize_config(parse_gui_txt(data_file))
+    engine = select_engine(p, engine)
+    cache = cache if cache is not None else ResultCache()
+
+    run_gmat_fn = run_gmat_fn or run_gmat
+
+    def transpile(ctx):
+        build_gmat_script(parse_gui_txt(data_file), script_path)
+
+    def run(ctx):
+        if engine == "native":
+            script_text, version = "", ENGINE_VERSION
+        else:
+            script_text, version = script_path.read_text(encoding="utf-8"), gmat_version()
+
+        key = cache_key(p, script_text, version)
+        entry = cache.get(key)
+        if entry is not None:
+            print("⚡ Resultado recuperado de la caché:", key[:12])
+            ctx["plots_restored"] = cache.restore(entry, report, plots_dir)
+            return
+
+        if engine == "native":
+            ctx["df"] = run_native(data_file, report)
+        else:
+            ctx["df"] = run_gmat_fn(script_path, report)
+        # El report se guarda ya: la etapa de plots puede no repetirse (si
+        # el report es igual al anterior) y los PNG se añaden si se hacen
+        cache.put(key, report)
+        ctx["cache_key"] = key
+
+    def parse(ctx):
+        # Siempre por load_report: deja el sidecar binario para las cargas
+        # siguientes (p.ej. "Ver gráficas"), aunque la tabla ya esté en memoria
+        ctx["df"] = load_report(report)
+
+    def plots(ctx):
+        if ctx.get("plots_restored"):
+            return
+        df = ctx.get("df")
+        if df is None:
+            df = load_report(report)
+        make_plots(df, plots_dir, data_file)
+        if "cache_key" in ctx:
+            cache.add_plots(ctx["cache_key"], [plots_dir / name for name in PLOTS])
+            print("Caché:", cache.stats())
+
+    stages = []
+    if engine == "native":
+        run_inputs = [data_file, ENGINE_VERSION, code_version(propagator, kepler)]
+    else:
+        stages.append(Stage("transpile", [data_file, code_version(Transpiler)], [script_path], transpile))
+        run_inputs = [script_path, gmat_version()]
+
+    stages += [
+        Stage("run", [engine] + run_inputs, [report], run),
+        Stage("parse", [report, code_version(report_parser)], list(sidecar_paths(report)), parse),
+        # Los plots dependen del report y de los tiempos de burn, no del resto de la config
+        Stage("plots", [report, leer_tiempos_burn(data_file), code_version(plot_results, decimation)],
+              [plots_dir / name for name in PLOTS], plots),
+    ]
+    return Pipeline(stages, state_path)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pipeline incremental por etapas.")
+    parser.add_argument("--dry-run", action="store_true", help="solo mostrar qué se ejecutaría")
+    parser.add_argument("--force", action="store_true", help="ejecutar todas las etapas")
+    parser.add_argument("--engine", choices=["auto", "analytic", "gmat", "native"], default=None)
+    args = parser.parse_args(argv)
+
+    pipeline = build_pipeline(args.engine)
+
+    if args.dry_run:
+        for step in pipeline.plan():
+            reason = f"  ({step['reason']})" if step["reason"] else ""
+            print(f"{step['stage']:<10} {step['status']}{reason}")
+        return 0
+
+    pipeline.run(force=args.force)
+    print("✅ Pipeline completo")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,27 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+import atexit
+import os
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D  
-import sys
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from SOURCES.report_parser import load_report_array
+from SOURCES.decimation import orbit_indices, series_indices
 from SOURCES.utils import INPUT_DIR, OUTPUT_DIR, PLOTS_DIR
+from SOURCES.trace import span, traced
 
 DATOS_PATH  = INPUT_DIR / "datos_guardados.txt"
 REPORT_PATH = OUTPUT_DIR / "DefaultReportFile.txt"
 
 
+@traced("load_report", rows=True)
 def load_report(path: Path) -> pd.DataFrame:
-    if not path.exists():
-        raise FileNotFoundError(f"No se encuentra el report: {path}")
-
-    # Leemos separado por espacios (uno o más)
-    df = pd.read_csv(path, sep=r"\s+", engine="python")
-
-    # Forzar a numérico y eliminar filas no numéricas (cabeceras repetidas, etc.)
-    df = df.apply(pd.to_numeric, errors="coerce").dropna()
+    # Parser propio (salta las cabeceras repetidas); el resultado queda en un
+    # sidecar binario que las cargas siguientes abren con memory-map
+    columns, data = load_report_array(path)
+    df = pd.DataFrame(data, columns=columns, copy=False)
 
     if df.shape[1] < 7:
         raise ValueError(
@@ -58,63 +61,44 @@ def leer_tiempos_burn(path: Path):
     return tiempos
 
 
-def make_plots(df: pd.DataFrame):
-    PLOTS_DIR.mkdir(exist_ok=True)
+# Cada figura se construye con la API orientada a objetos (Figure + Agg),
+# sin el estado global de pyplot, para poder renderizarlas en paralelo.
 
-    cols = df.columns.tolist()
-    t_col  = cols[0]
-    x_col  = cols[1]
-    y_col  = cols[2]
-    z_col  = cols[3]
-    vx_col = cols[4]
-    vy_col = cols[5]
-    vz_col = cols[6]
-
-    t  = df[t_col].values
-    x  = df[x_col].values
-    y  = df[y_col].values
-    z  = df[z_col].values
-    vx = df[vx_col].values
-    vy = df[vy_col].values
-    vz = df[vz_col].values
-
-    speed = np.sqrt(vx**2 + vy**2 + vz**2)
-    r     = np.sqrt(x**2 + y**2 + z**2)
-
-    # Intentamos leer los tiempos de burn (si existen)
-    burn_times = leer_tiempos_burn(DATOS_PATH)
-    print("Tiempos de burn leídos:", burn_times)
-
-    # === 1) Trayectoria 3D ===
-    fig = plt.figure()
+def fig_trayectoria_3d(d: dict, burn_times: list) -> Figure:
+    fig = Figure()
+    FigureCanvasAgg(fig)
     ax = fig.add_subplot(111, projection="3d")
-    ax.plot(x, y, z)
+    ax.plot(d["x"], d["y"], d["z"])
     ax.set_xlabel("X [km]")
     ax.set_ylabel("Y [km]")
     ax.set_zlabel("Z [km]")
     ax.set_title("Trayectoria 3D")
     ax.set_box_aspect([1, 1, 1])  # ejes a la misma escala
-    plt.tight_layout()
-    plt.savefig(PLOTS_DIR / "trayectoria_3D.png", dpi=300, bbox_inches="tight")
-    plt.close(fig)
+    fig.tight_layout()
+    return fig
 
-    # === 2) Órbita en plano XY ===
-    fig, ax = plt.subplots()
-    ax.plot(x, y)
+
+def fig_orbita_xy(d: dict, burn_times: list) -> Figure:
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.plot(d["x"], d["y"])
     ax.set_xlabel("X [km]")
     ax.set_ylabel("Y [km]")
     ax.set_title("Órbita en el plano XY")
     ax.axis("equal")
     ax.grid(True)
-    plt.tight_layout()
-    plt.savefig(PLOTS_DIR / "orbita_XY.png", dpi=300, bbox_inches="tight")
-    plt.close(fig)
+    fig.tight_layout()
+    return fig
+
 
-    # === 3) Componentes de velocidad vs tiempo ===
-    fig, ax = plt.subplots()
-    ax.plot(t, vx, label="Vx")
-    ax.plot(t, vy, label="Vy")
-    ax.plot(t, vz, label="Vz")
+def fig_velocidades(d: dict, burn_times: list) -> Figure:
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.plot(d["t"], d["vx"], label="Vx")
+    ax.plot(d["t"], d["vy"], label="Vy")
+    ax.plot(d["t"], d["vz"], label="Vz")
 
     # Marcar burns si existen
     for tb in burn_times:
@@ -125,13 +109,15 @@ def make_plots(df: pd.DataFrame):
     ax.set_title("Componentes de velocidad vs tiempo")
     ax.grid(True)
     ax.legend()
-    plt.tight_layout()
-    plt.savefig(PLOTS_DIR / "velocidades_vs_tiempo.png", dpi=300, bbox_inches="tight")
-    plt.close(fig)
+    fig.tight_layout()
+    return fig
+
 
-    # === 4) Módulo de la velocidad vs tiempo ===
-    fig, ax = plt.subplots()
-    ax.plot(t, speed, label="|V|")
+def fig_velocidad_modulo(d: dict, burn_times: list) -> Figure:
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.plot(d["t"], d["speed"], label="|V|")
 
     for tb in burn_times:
         ax.axvline(tb, color="k", linestyle="--", alpha=0.7)
@@ -141,13 +127,15 @@ def make_plots(df: pd.DataFrame):
     ax.set_title("Módulo de la velocidad vs tiempo")
     ax.grid(True)
     ax.legend()
-    plt.tight_layout()
-    plt.savefig(PLOTS_DIR / "velocidad_modulo_vs_tiempo.png", dpi=300, bbox_inches="tight")
-    plt.close(fig)
+    fig.tight_layout()
+    return fig
 
-    # === 5) Distancia al cuerpo central r(t) ===
-    fig, ax = plt.subplots()
-    ax.plot(t, r, label="r")
+
+def fig_radio(d: dict, burn_times: list) -> Figure:
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.plot(d["t"], d["r"], label="r")
 
     for tb in burn_times:
         ax.axvline(tb, color="k", linestyle="--", alpha=0.7)
@@ -157,11 +145,191 @@ def make_plots(df: pd.DataFrame):
     ax.set_title("Distancia al cuerpo central vs tiempo")
     ax.grid(True)
     ax.legend()
-    plt.tight_layout()
-    plt.savefig(PLOTS_DIR / "radio_vs_tiempo.png", dpi=300, bbox_inches="tight")
-    plt.close(fig)
+    fig.tight_layout()
+    return fig
+
+
+def _fig_dispersion(d: dict, burn_times: list, ylabel: str, title: str) -> Figure:
+    """
+    Envolvente de una magnitud en un Monte Carlo: bandas de percentiles
+    5-95 y 25-75, mediana, media y caso nominal.
+    """
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    pct = dict(zip(d["q"], d["pct"]))
+    ax.fill_between(d["t"], pct[5], pct[95], alpha=0.2, color="C0", label="P5-P95")
+    ax.fill_between(d["t"], pct[25], pct[75], alpha=0.35, color="C0", label="P25-P75")
+    ax.plot(d["t"], pct[50], color="C0", label="Mediana")
+    ax.plot(d["t"], d["mean"], color="C1", linestyle=":", label="Media")
+    ax.plot(d["t"], d["nominal"], color="k", linewidth=1, label="Nominal")
+
+    for tb in burn_times:
+        ax.axvline(tb, color="k", linestyle="--", alpha=0.7)
+
+    ax.set_xlabel("Tiempo [días]")
+    ax.set_ylabel(ylabel)
+    ax.set_title(f"{title} ({d['n']} muestras)")
+    ax.grid(True)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def fig_dispersion_radio(d: dict, burn_times: list) -> Figure:
+    return _fig_dispersion(d, burn_times, "r [km]", "Dispersión de la distancia al cuerpo central")
+
+
+def fig_dispersion_velocidad(d: dict, burn_times: list) -> Figure:
+    return _fig_dispersion(d, burn_times, "|V| [km/s]", "Dispersión del módulo de la velocidad")
+
+
+# Nombre del PNG -> (función que construye la figura, arrays que necesita)
+PLOTS = {
+    "trayectoria_3D.png":             (fig_trayectoria_3d,   ("x", "y", "z")),
+    "orbita_XY.png":                  (fig_orbita_xy,        ("x", "y")),
+    "velocidades_vs_tiempo.png":      (fig_velocidades,      ("t", "vx", "vy", "vz")),
+    "velocidad_modulo_vs_tiempo.png": (fig_velocidad_modulo, ("t", "speed")),
+    "radio_vs_tiempo.png":            (fig_radio,            ("t", "r")),
+}
+
+
+@traced("render_png")
+def render_png(builder, d: dict, burn_times: list, out_path: Path):
+    """Construye la figura y la guarda de forma atómica (tmp + os.replace)."""
+    fig = builder(d, burn_times)
+    tmp = out_path.with_name(f".{out_path.stem}.tmp.png")
+    fig.savefig(tmp, dpi=300, bbox_inches="tight", format="png")
+    os.replace(tmp, out_path)
+    return out_path
+
+
+def plot_arrays(df: pd.DataFrame) -> dict:
+    cols = df.columns.tolist()
+    d = {
+        "t":  df[cols[0]].values,
+        "x":  df[cols[1]].values,
+        "y":  df[cols[2]].values,
+        "z":  df[cols[3]].values,
+        "vx": df[cols[4]].values,
+        "vy": df[cols[5]].values,
+        "vz": df[cols[6]].values,
+    }
+    d["speed"] = np.sqrt(d["vx"]**2 + d["vy"]**2 + d["vz"]**2)
+    d["r"]     = np.sqrt(d["x"]**2 + d["y"]**2 + d["z"]**2)
+    return d
+
+
+def decimate_arrays(d: dict, keys: tuple, burn_times: list) -> dict:
+    """
+    Submuestrea los arrays de una figura (ver SOURCES/decimation.py):
+    min/max si es una serie temporal, curvatura si es una órbita.
+    """
+    if "t" in keys:
+        ys = [d[k] for k in keys if k != "t"]
+        idx = series_indices(d["t"], ys, burn_times, d["r"])
+    else:
+        points = np.column_stack([d[k] for k in keys])
+        idx = orbit_indices(points, d["t"], burn_times, d["r"])
+    return {k: np.asarray(d[k])[idx] for k in keys}
+
+
+# Pool de render que se reutiliza entre llamadas: el arranque de los
+# procesos (e importar matplotlib en cada uno) se paga una vez, no en cada
+# ejecución desde la GUI
+_pool = None
+_pool_workers = 0
+
+
+def _shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+atexit.register(_shutdown_pool)
+
+
+def render_parallel(jobs: list, workers: int):
+    """render_png de cada trabajo en el pool compartido de `workers` procesos."""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        _shutdown_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    try:
+        futures = [_pool.submit(render_png, *job) for job in jobs]
+        for f in futures:
+            f.result()
+    except BrokenProcessPool:
+        # Un proceso del pool murió: se crea otro en la siguiente llamada
+        _pool = None
+        raise
 
-    print("✅ Gráficas guardadas en:", PLOTS_DIR)
 
+def make_plots(df: pd.DataFrame, plots_dir: Path = PLOTS_DIR,
+               datos_path: Path = DATOS_PATH, workers: int | None = None):
+    """
+    Genera los cinco PNG. Cada figura se renderiza en un proceso del pool
+    compartido (render_parallel), así que el tiempo total lo marca la más
+    lenta (normalmente la 3D). Con workers=1, en este proceso.
+    """
+    with span("make_plots", rows=len(df)) as sp:
+        plots_dir.mkdir(parents=True, exist_ok=True)
+
+        d = plot_arrays(df)
+
+        # Intentamos leer los tiempos de burn (si existen)
+        burn_times = leer_tiempos_burn(datos_path)
+        print("Tiempos de burn leídos:", burn_times)
+
+        workers = workers or min(len(PLOTS), os.cpu_count() or 1)
+        sp.set(workers=workers)
+
+        # Solo viajan a los procesos los puntos que se van a dibujar
+        jobs = []
+        for name, (builder, keys) in PLOTS.items():
+            arrays = decimate_arrays(d, keys, burn_times)
+            jobs.append((builder, arrays, burn_times, plots_dir / name))
+
+        if workers <= 1:
+            for job in jobs:
+                render_png(*job)
+        else:
+            render_parallel(jobs, workers)
+
+    print("✅ Gráficas guardadas en:", plots_dir)
+
+
+# Nombre del PNG -> (figura, magnitud) de las envolventes Monte Carlo
+DISPERSION_PLOTS = {
+    "dispersion_radio_vs_tiempo.png":     (fig_dispersion_radio,     "r"),
+    "dispersion_velocidad_vs_tiempo.png": (fig_dispersion_velocidad, "v"),
+}
+
+
+def make_dispersion_plots(stats: dict, plots_dir: Path = PLOTS_DIR,
+                          datos_path: Path = DATOS_PATH):
+    """
+    Envolventes de r y |V| de un Monte Carlo (SOURCES/montecarlo.py) a
+    partir de sus estadísticas: t, q, n y <r|v>_pct, _mean, _nominal.
+    Van junto a las gráficas del caso nominal (radio_vs_tiempo.png...).
+    """
+    with span("make_dispersion_plots", rows=len(stats["t"])):
+        plots_dir.mkdir(parents=True, exist_ok=True)
+        burn_times = leer_tiempos_burn(datos_path)
+        n = int(np.max(stats["n"])) if len(stats["n"]) else 0
 
+        for name, (builder, key) in DISPERSION_PLOTS.items():
+            d = {
+                "t": stats["t"],
+                "q": [float(q) for q in stats["q"]],
+                "pct": stats[f"{key}_pct"],
+                "mean": stats[f"{key}_mean"],
+                "nominal": stats[f"{key}_nominal"],
+                "n": n,
+            }
+            render_png(builder, d, burn_times, plots_dir / name)
 
+    print("✅ Envolventes de dispersión guardadas en:", plots_dir)
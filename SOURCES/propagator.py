@@ -0,0 +1,362 @@
+"""
+Motor de propagación nativo (NumPy) como alternativa a GmatConsole.
+
+Recibe el mismo diccionario que devuelve parse_gui_txt y genera la misma
+tabla de 7 columnas (t, X, Y, Z, VX, VY, VZ) que load_report, así que
+make_plots y make_figures funcionan igual.
+
+Modelo: gravedad del cuerpo central de FM (masa puntual) más J2 opcional
+(si el modelo gravitatorio no es "None" y el grado es >= 2), integrador
+Runge-Kutta adaptativo con los pasos/precisión de la sección PROPAGATE y
+maniobras impulsivas en ejes VNB, LVLH o inerciales. Sin J2 los tramos
+entre maniobras se resuelven de forma analítica (ver kepler.py).
+
+Limitación: el estado inicial se interpreta directamente respecto al
+cuerpo central del ForceModel (no se hacen cambios de origen entre
+sistemas de referencia como haría GMAT) y el J2 supone el polo del cuerpo
+alineado con el eje Z del sistema.
+"""
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from SOURCES.Transpiler import (
+    DATA_FILE, parse_gui_txt, normalize_config, mission_sequence,
+)
+from SOURCES.kepler import propagate_kepler, kepler_segment
+from SOURCES.utils import OUTPUT_DIR
+from SOURCES.trace import traced
+
+
+ENGINE_VERSION = "native-2"
+
+REPORT_PATH = OUTPUT_DIR / "DefaultReportFile.txt"
+
+# mu [km^3/s^2], radio ecuatorial [km], J2 [-]
+BODIES = {
+    "Earth":   {"mu": 398600.4415,       "radius": 6378.1363, "j2": 1.0826269e-3},
+    "Luna":    {"mu": 4902.8005821478,   "radius": 1738.2,    "j2": 2.0330530e-4},
+    "Mars":    {"mu": 42828.314258067,   "radius": 3396.19,   "j2": 1.9555e-3},
+    "Venus":   {"mu": 324858.59882646,   "radius": 6051.8,    "j2": 4.458e-6},
+    "Jupiter": {"mu": 126712767.8578,    "radius": 71492.0,   "j2": 1.4736e-2},
+    "Saturn":  {"mu": 37940626.061137,   "radius": 60268.0,   "j2": 1.6298e-2},
+    "Uranus":  {"mu": 5794549.0070719,   "radius": 25559.0,   "j2": 3.34343e-3},
+    "Neptune": {"mu": 6836534.0638793,   "radius": 24764.0,   "j2": 3.411e-3},
+    "Mercury": {"mu": 22032.080486418,   "radius": 2439.7,    "j2": 6.0e-5},
+    "Sun":     {"mu": 132712440017.99,   "radius": 695990.0,  "j2": 2.0e-7},
+}
+
+# Integradores de GMAT que se resuelven con el Runge-Kutta adaptativo
+ADAPTIVE_INTEGRATORS = {
+    "RungeKutta89", "PrinceDormand78", "PrinceDormand45", "RungeKutta68",
+    "RungeKutta56", "AdamsBashforthMoulton", "PrinceDormand853",
+}
+
+# Coeficientes Dormand-Prince 5(4)
+_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+_B5 = np.array([35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84, 0.0])
+_B4 = np.array([5179/57600, 0.0, 7571/16695, 393/640,
+                -92097/339200, 187/2100, 1/40])
+
+
+def force_model(p: dict) -> dict:
+    """Parámetros de gravedad a partir de normalize_config."""
+    body = BODIES.get(p["fm_central_body"], BODIES["Earth"])
+    use_j2 = p["gravity_model"] != "None" and p["gravity_degree"] >= 2
+    return {
+        "mu": body["mu"],
+        "radius": body["radius"],
+        "j2": body["j2"] if use_j2 else 0.0,
+    }
+
+
+def kepler_to_cartesian(sma, ecc, inc, raan, aop, ta, mu):
+    """Elementos keplerianos (ángulos en grados) -> estado cartesiano."""
+    inc, raan, aop, ta = np.radians([inc, raan, aop, ta])
+
+    p = sma * (1.0 - ecc**2)
+    r = p / (1.0 + ecc * np.cos(ta))
+
+    r_pf = np.array([r * np.cos(ta), r * np.sin(ta), 0.0])
+    v_pf = np.sqrt(mu / p) * np.array([-np.sin(ta), ecc + np.cos(ta), 0.0])
+
+    cO, sO = np.cos(raan), np.sin(raan)
+    ci, si = np.cos(inc), np.sin(inc)
+    cw, sw = np.cos(aop), np.sin(aop)
+    rot = np.array([
+        [cO*cw - sO*sw*ci, -cO*sw - sO*cw*ci,  sO*si],
+        [sO*cw + cO*sw*ci, -sO*sw + cO*cw*ci, -cO*si],
+        [sw*si,             cw*si,             ci],
+    ])
+    return np.concatenate([rot @ r_pf, rot @ v_pf])
+
+
+def initial_state(p: dict, mu: float) -> np.ndarray:
+    if p["coord_type"] == "Cartesianas":
+        return np.array(p["cartesian"], dtype=float)
+    return kepler_to_cartesian(*p["keplerian"], mu)
+
+
+def acceleration(r: np.ndarray, mu: float, j2: float = 0.0,
+                 radius: float = 0.0) -> np.ndarray:
+    """Aceleración gravitatoria. `r` puede ser (3,) o (..., 3)."""
+    rn2 = np.sum(r * r, axis=-1, keepdims=True)
+    rn = np.sqrt(rn2)
+    a = -mu * r / (rn2 * rn)
+
+    if j2:
+        z2 = (r[..., 2:3] ** 2) / rn2
+        k = 1.5 * j2 * mu * radius**2 / (rn2 * rn2 * rn)
+        f = np.concatenate([5*z2 - 1, 5*z2 - 1, 5*z2 - 3], axis=-1)
+        a = a + k * r * f
+
+    return a
+
+
+def derivative(state: np.ndarray, fm: dict) -> np.ndarray:
+    r = state[..., :3]
+    v = state[..., 3:]
+    a = acceleration(r, fm["mu"], fm["j2"], fm["radius"])
+    return np.concatenate([v, a], axis=-1)
+
+
+def burn_delta_v(state: np.ndarray, axes: str, dv) -> np.ndarray:
+    """
+    Pasa el ΔV del burn (ejes VNB/LVLH/inerciales) a ejes inerciales.
+    `state` puede ser (6,) o (N, 6) y `dv` (3,) o (N, 3).
+    """
+    r = state[..., :3]
+    v = state[..., 3:]
+    dv = np.asarray(dv, dtype=float)
+
+    def unit(a):
+        return a / np.linalg.norm(a, axis=-1, keepdims=True)
+
+    if axes == "VNB":
+        e_v = unit(v)
+        e_n = unit(np.cross(r, v))
+        e_b = np.cross(e_v, e_n)
+        return dv[..., 0:1]*e_v + dv[..., 1:2]*e_n + dv[..., 2:3]*e_b
+
+    if axes == "LVLH":
+        e_r = unit(r)
+        e_h = unit(np.cross(r, v))
+        e_t = np.cross(e_h, e_r)
+        return dv[..., 0:1]*e_r + dv[..., 1:2]*e_t + dv[..., 2:3]*e_h
+
+    # MJ2000Eq / SpacecraftBody (actitud por defecto = inercial)
+    return np.broadcast_to(dv, v.shape).copy()
+
+
+def _dopri_step(state, h, fm):
+    """Un paso Dormand-Prince: devuelve (nuevo estado, estimación de error)."""
+    k = []
+    for i in range(7):
+        s = state
+        for a_ij, k_j in zip(_A[i], k):
+            if a_ij:
+                s = s + h * a_ij * k_j
+        k.append(derivative(s, fm))
+    k = np.array(k)
+    y5 = state + h * np.tensordot(_B5, k, axes=1)
+    err = h * np.tensordot(_B5 - _B4, k, axes=1)
+    return y5, err
+
+
+def _rk4_step(state, h, fm):
+    k1 = derivative(state, fm)
+    k2 = derivative(state + 0.5*h*k1, fm)
+    k3 = derivative(state + 0.5*h*k2, fm)
+    k4 = derivative(state + h*k3, fm)
+    return state + h/6.0 * (k1 + 2*k2 + 2*k3 + k4)
+
+
+def _rss_step_errors(state, new_state, err) -> np.ndarray:
+    """
+    Control de error 'RSSStep' de GMAT: error RSS relativo al cambio del
+    paso, uno por estado si `state` es (N, 6).
+    """
+    delta = new_state - state
+    e_r = np.linalg.norm(err[..., :3], axis=-1) / np.maximum(
+        np.linalg.norm(delta[..., :3], axis=-1), 1e-12)
+    e_v = np.linalg.norm(err[..., 3:], axis=-1) / np.maximum(
+        np.linalg.norm(delta[..., 3:], axis=-1), 1e-12)
+    return np.maximum(e_r, e_v)
+
+
+def _rss_step_error(state, new_state, err):
+    """Como _rss_step_errors; con estados (N, 6) devuelve el peor de los N."""
+    return float(np.max(_rss_step_errors(state, new_state, err)))
+
+
+def propagate_segment(state, t0, t1, fm, settings):
+    """
+    Integra de t0 a t1 [s]. Devuelve (tiempos, estados) de todos los pasos
+    aceptados, incluido el inicial (como hace el ReportFile de GMAT).
+    """
+    times = [t0]
+    states = [state]
+
+    integrator = settings["integrator"]
+    h = min(settings["init_step"], settings["max_step"])
+    t = t0
+
+    if integrator == "RungeKutta4":
+        while t < t1:
+            h_i = min(h, t1 - t)
+            state = _rk4_step(state, h_i, fm)
+            t += h_i
+            times.append(t)
+            states.append(state)
+        return times, states
+
+    if integrator not in ADAPTIVE_INTEGRATORS:
+        raise ValueError(
+            f"El integrador '{integrator}' no está soportado por el motor nativo"
+        )
+
+    accuracy = settings["accuracy"]
+    min_step = settings["min_step"]
+    max_step = settings["max_step"]
+    max_attempts = settings["max_step_attempts"]
+
+    while t < t1:
+        attempts = 0
+        while True:
+            h_i = min(h, t1 - t)
+            new_state, err = _dopri_step(state, h_i, fm)
+            err_norm = _rss_step_error(state, new_state, err) / accuracy
+
+            factor = 0.9 * err_norm ** (-0.2) if err_norm > 0 else 5.0
+            factor = min(5.0, max(0.2, factor))
+
+            if err_norm <= 1.0 or h_i <= min_step:
+                break
+
+            attempts += 1
+            if attempts >= max_attempts:
+                raise RuntimeError(
+                    f"Paso rechazado {attempts} veces en t = {t:.3f} s "
+                    "(revisa 'Intentos max. paso' o la precisión)"
+                )
+            h = max(min_step, h_i * factor)
+
+        t += h_i
+        state = new_state
+        times.append(t)
+        states.append(state)
+
+        h = min(max_step, max(min_step, h_i * factor))
+
+    return times, states
+
+
+def is_two_body(p: dict) -> bool:
+    """
+    True si el caso (normalize_config) es dos cuerpos puro y la solución
+    analítica coincide con lo que escribe GMAT: sin J2 (el script ya va sin
+    drag, sin SRP y con solo el cuerpo central) y el estado está en
+    EarthMJ2000Eq, que es el sistema por defecto del ReportFile.
+    """
+    return (
+        force_model(p)["j2"] == 0.0
+        and p["fm_central_body"] == "Earth"
+        and p["coord_system"] == "EarthMJ2000Eq"
+    )
+
+
+def compare_kepler_numerical(state0, t1, fm, settings) -> dict:
+    """
+    Comprueba el camino analítico contra el integrador numérico en los pasos
+    de este último: error máximo en posición [km] y velocidad [km/s].
+    """
+    state0 = np.asarray(state0, dtype=float)
+    times, states = propagate_segment(state0, 0.0, t1, fm, settings)
+    diff = propagate_kepler(state0, np.array(times), fm["mu"]) - np.array(states)
+    return {
+        "max_pos_err_km": float(np.max(np.linalg.norm(diff[:, :3], axis=1))),
+        "max_vel_err_kms": float(np.max(np.linalg.norm(diff[:, 3:], axis=1))),
+        "n_points": len(times),
+    }
+
+
+def propagate_config(cfg: dict, analytic: bool = True,
+                     sample_step: float | None = None) -> tuple[list, np.ndarray]:
+    """
+    Propaga la misión descrita por parse_gui_txt.
+    Devuelve (nombres de columna, array (n, 7)) con t en días.
+
+    Sin J2 los tramos entre maniobras se resuelven analíticamente (Kepler)
+    muestreados cada `sample_step` [s] (por defecto Prop.MaxStep); si no,
+    o si Kepler no converge, se integra numéricamente.
+    """
+    p = normalize_config(cfg)
+    fm = force_model(p)
+    state = initial_state(p, fm["mu"])
+
+    use_kepler = analytic and fm["j2"] == 0.0
+    sample_step = sample_step or p["max_step"]
+
+    rows_t = [0.0]
+    rows_s = [state]
+    t = 0.0
+
+    for kind, arg in mission_sequence(p):
+        if kind == "propagate":
+            t1 = arg * 86400.0
+            times = None
+            if use_kepler:
+                try:
+                    times, states = kepler_segment(state, t, t1, fm["mu"], sample_step)
+                except RuntimeError as e:
+                    print("⚠ Kepler falló, se integra numéricamente:", e)
+            if times is None:
+                times, states = propagate_segment(state, t, t1, fm, p)
+            rows_t.extend(times)
+            rows_s.extend(states)
+            t = times[-1]
+            state = states[-1]
+        else:
+            state = state.copy()
+            state[3:] += burn_delta_v(state, arg["axes"], arg["dv"])
+        # Report tras cada comando
+        rows_t.append(t)
+        rows_s.append(state)
+
+    data = np.column_stack([np.array(rows_t) / 86400.0, np.array(rows_s)])
+
+    sat = p["sat_name"]
+    columns = [f"{sat}.ElapsedDays", f"{sat}.X", f"{sat}.Y", f"{sat}.Z",
+               f"{sat}.VX", f"{sat}.VY", f"{sat}.VZ"]
+    return columns, data
+
+
+def write_report(path: Path, columns: list, data: np.ndarray):
+    """Escribe la tabla con el formato del ReportFile de GMAT (Precision = 16)."""
+    width = 26
+    lines = ["".join(c.ljust(width) for c in columns)]
+    for row in data:
+        lines.append("".join(f"{v:.16g}".ljust(width) for v in row))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@traced("run_native", rows=True)
+def run_native(cfg_path: Path = DATA_FILE, report_path: Path = REPORT_PATH) -> pd.DataFrame:
+    """
+    Equivalente a run_transpiler + run_gmat sin GMAT: propaga, deja el
+    report en OUTPUT_DIR (para "Ver gráficas") y devuelve la tabla.
+    """
+    cfg = parse_gui_txt(cfg_path)
+    columns, data = propagate_config(cfg)
+    write_report(report_path, columns, data)
+    print("✅ Report nativo escrito en:", report_path)
+    return pd.DataFrame(data, columns=columns)
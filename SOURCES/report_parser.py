@@ -0,0 +1,386 @@
+"""
+Parser rápido del ReportFile de GMAT.
+
+Sustituye a pd.read_csv(sep=r"\\s+", engine="python") + to_numeric + dropna:
+lee la cabecera una vez, cuenta las líneas para reservar el array de
+salida y decodifica los floats por bloques directamente en ese array
+(np.fromstring en C). Las cabeceras que GMAT repite a mitad de fichero
+se eliminan con bytes.replace; solo si queda otro texto no numérico se
+filtra línea a línea.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import json
+import os
+import numpy as np
+
+
+CHUNK_BYTES = 32 * 1024 * 1024
+
+# A partir de este tamaño load_report_array parsea en paralelo
+PARALLEL_MIN_BYTES = 256 * 1024 * 1024
+
+# El índice temporal guarda (ElapsedDays, offset) cada INDEX_EVERY líneas
+INDEX_EVERY = 1000
+
+# Versión del formato del sidecar binario (.npy + .meta.json)
+SIDECAR_VERSION = 1
+
+# Bytes que pueden aparecer en un bloque solo con números
+_NUMERIC_BYTES = b"0123456789.-+eE \t\r\n"
+
+
+def _is_data_line(line: bytes) -> bool:
+    try:
+        float(line.split(None, 1)[0])
+        return True
+    except (ValueError, IndexError):
+        return False
+
+
+def read_header(path: Path) -> tuple[list, int, int, bytes]:
+    """
+    Devuelve (columnas, nº de columnas, offset del primer dato, línea de
+    cabecera tal cual). Si el report no tiene cabecera las columnas se
+    llaman col0, col1...
+    """
+    columns = None
+    header = b""
+    offset = 0
+    with path.open("rb") as f:
+        for line in f:
+            s = line.strip()
+            if s and _is_data_line(s):
+                ncols = len(s.split())
+                if columns is None:
+                    columns = [f"col{i}" for i in range(ncols)]
+                return columns, ncols, offset, header
+            if s and columns is None:
+                columns = s.decode("utf-8", errors="replace").split()
+                header = line
+            offset += len(line)
+
+    if columns is None:
+        raise ValueError(f"El report está vacío: {path}")
+    return columns, len(columns), offset, header
+
+
+def parse_block(block: bytes, ncols: int, header: bytes = b"") -> np.ndarray:
+    """Filas (k, ncols) de un bloque de líneas completas."""
+    # GMAT repite exactamente la misma línea de cabecera: se quita en C
+    if header and header in block:
+        block = block.replace(header, b"")
+
+    if block.translate(None, _NUMERIC_BYTES):
+        # Queda otro texto: descartamos las líneas que no sean numéricas
+        block = b"\n".join(
+            ln for ln in block.split(b"\n")
+            if not ln.translate(None, _NUMERIC_BYTES)
+            and len(ln.split()) == ncols
+        )
+
+    if not block.strip():
+        return np.empty((0, ncols))
+
+    values = np.fromstring(block, sep=" ")
+    return values.reshape(-1, ncols)
+
+
+def count_lines(path: Path, start: int = 0) -> int:
+    n = 0
+    last = b"\n"
+    with path.open("rb") as f:
+        f.seek(start)
+        while True:
+            chunk = f.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            n += chunk.count(b"\n")
+            last = chunk[-1:]
+    # Última línea sin salto final
+    return n + (last != b"\n")
+
+
+def parse_report(path: Path, chunk_bytes: int = CHUNK_BYTES) -> tuple[list, np.ndarray]:
+    """
+    Parsea el report completo. Devuelve (columnas, array float64 (n, ncols)).
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"No se encuentra el report: {path}")
+
+    columns, ncols, offset, header = read_header(path)
+
+    # Cota superior de filas: una por línea (sobran solo las cabeceras)
+    out = np.empty((count_lines(path, offset), ncols))
+    n = 0
+
+    with path.open("rb") as f:
+        f.seek(offset)
+        rest = b""
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                break
+            chunk = rest + chunk
+            cut = chunk.rfind(b"\n") + 1
+            rest = chunk[cut:]
+
+            rows = parse_block(chunk[:cut], ncols, header)
+            out[n:n + len(rows)] = rows
+            n += len(rows)
+
+        if rest.strip():
+            rows = parse_block(rest, ncols, header)
+            out[n:n + len(rows)] = rows
+            n += len(rows)
+
+    return columns, out[:n]
+
+
+def byte_ranges(path: Path, start: int, chunk_bytes: int) -> list:
+    """Trozos [a, b) de ~chunk_bytes que empiezan y acaban en inicio de línea."""
+    size = path.stat().st_size
+    ranges = []
+    with path.open("rb") as f:
+        a = start
+        while a < size:
+            f.seek(min(a + chunk_bytes, size))
+            f.readline()
+            b = min(f.tell(), size)
+            ranges.append((a, b))
+            a = b
+    return ranges
+
+
+def _parse_range(path: Path, a: int, b: int, ncols: int, header: bytes) -> np.ndarray:
+    with path.open("rb") as f:
+        f.seek(a)
+        block = f.read(b - a)
+    return parse_block(block, ncols, header)
+
+
+def parse_report_parallel(path: Path, workers: int | None = None,
+                          chunk_bytes: int = CHUNK_BYTES) -> tuple[list, np.ndarray]:
+    """
+    Como parse_report, pero reparte el fichero en trozos alineados a saltos
+    de línea y los parsea en un pool de procesos. Los resultados se copian
+    en orden a un único array; como mucho hay `workers` trozos en vuelo,
+    así que la memoria extra está acotada por chunk_bytes * workers.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"No se encuentra el report: {path}")
+
+    workers = workers or os.cpu_count() or 1
+    columns, ncols, offset, header = read_header(path)
+    ranges = byte_ranges(path, offset, chunk_bytes)
+    total_bytes = path.stat().st_size - offset
+
+    out = None
+    n = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        pending = []
+        next_range = 0
+
+        while next_range < len(ranges) or pending:
+            while next_range < len(ranges) and len(pending) < workers:
+                a, b = ranges[next_range]
+                pending.append(ex.submit(_parse_range, path, a, b, ncols, header))
+                next_range += 1
+
+            rows = pending.pop(0).result()
+
+            if out is None:
+                # Reserva según los bytes por fila del primer trozo (+5 %)
+                a, b = ranges[0]
+                per_row = (b - a) / max(len(rows), 1)
+                out = np.empty((int(total_bytes / per_row * 1.05) + len(rows), ncols))
+            elif n + len(rows) > out.shape[0]:
+                grown = np.empty((max(n + len(rows), 2 * out.shape[0]), ncols))
+                grown[:n] = out[:n]
+                out = grown
+
+            out[n:n + len(rows)] = rows
+            n += len(rows)
+
+    if out is None:
+        return columns, np.empty((0, ncols))
+    return columns, out[:n]
+
+
+def sidecar_paths(path: Path) -> tuple[Path, Path]:
+    return path.with_name(path.name + ".npy"), path.with_name(path.name + ".meta.json")
+
+
+def _source_meta(path: Path) -> dict:
+    st = path.stat()
+    return {
+        "version": SIDECAR_VERSION,
+        "source": str(path.resolve()),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    }
+
+
+def _read_sidecar(path: Path):
+    npy, meta_path = sidecar_paths(path)
+    if not (npy.exists() and meta_path.exists()):
+        return None
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    current = _source_meta(path)
+    if any(meta.get(k) != v for k, v in current.items()):
+        return None
+
+    data = np.load(npy, mmap_mode="r")
+    if list(data.shape) != meta.get("shape"):
+        return None
+    return meta["columns"], data
+
+
+def write_sidecar(path: Path, columns: list, data: np.ndarray):
+    """
+    Guarda el sidecar de `path` con datos ya parseados (p.ej. los que
+    devuelve el backend de gmatpy), para que load_report no lo parsee.
+    """
+    npy, meta_path = sidecar_paths(path)
+    meta = _source_meta(path)
+    meta["columns"] = columns
+    meta["shape"] = list(data.shape)
+
+    # Escritura atómica: primero los datos y al final el meta que los valida
+    tmp_npy = npy.with_name(npy.name + ".tmp")
+    with tmp_npy.open("wb") as f:
+        np.save(f, np.ascontiguousarray(data))
+    os.replace(tmp_npy, npy)
+
+    tmp_meta = meta_path.with_name(meta_path.name + ".tmp")
+    tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp_meta, meta_path)
+
+
+def load_report_array(path: Path, use_sidecar: bool = True) -> tuple[list, np.ndarray]:
+    """
+    Como parse_report, pero guarda las columnas parseadas en un sidecar
+    binario junto al report (<report>.npy + <report>.meta.json). Las cargas
+    siguientes lo abren con memory-map (sin copiar ni parsear) mientras el
+    report no cambie de tamaño ni de fecha; si cambia, se regenera.
+    Los reports de más de PARALLEL_MIN_BYTES se parsean en paralelo
+    (AM1_PARSE_WORKERS fija el nº de procesos; 1 lo desactiva).
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"No se encuentra el report: {path}")
+
+    if use_sidecar:
+        cached = _read_sidecar(path)
+        if cached is not None:
+            return cached
+
+    workers = int(os.environ.get("AM1_PARSE_WORKERS", "0")) or os.cpu_count() or 1
+    if workers > 1 and path.stat().st_size >= PARALLEL_MIN_BYTES:
+        columns, data = parse_report_parallel(path, workers)
+    else:
+        columns, data = parse_report(path)
+
+    if use_sidecar:
+        try:
+            write_sidecar(path, columns, data)
+        except OSError as e:
+            print("⚠ No se pudo guardar el sidecar del report:", e)
+
+    return columns, data
+
+
+def index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".idx.npz")
+
+
+def build_time_index(path: Path, every: int = INDEX_EVERY) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Índice disperso del report: (tiempos, offsets en bytes) de una de cada
+    `every` líneas de datos. Se guarda en <report>.idx.npz.
+    """
+    _, _, offset, _ = read_header(path)
+
+    times = []
+    offsets = []
+    line_no = 0
+
+    with path.open("rb") as f:
+        f.seek(offset)
+        pos = offset
+        rest = b""
+        while True:
+            chunk = f.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            buf = rest + chunk
+            base = pos - len(rest)
+
+            # Inicios de línea del bloque (vectorizado)
+            nl = np.flatnonzero(np.frombuffer(buf, dtype=np.uint8) == 10)
+            starts = np.concatenate([[0], nl[:-1] + 1]) if nl.size else np.empty(0, int)
+
+            first = (-line_no) % every
+            for start in starts[first::every]:
+                token = buf[start:start + 40].split(None, 1)
+                try:
+                    times.append(float(token[0]))
+                    offsets.append(base + int(start))
+                except (ValueError, IndexError):
+                    pass   # cabecera repetida
+
+            line_no += starts.size
+            cut = int(nl[-1]) + 1 if nl.size else 0
+            rest = buf[cut:]
+            pos += len(chunk)
+
+    t_idx = np.array(times)
+    off_idx = np.array(offsets, dtype=np.int64)
+
+    st = path.stat()
+    tmp = path.with_name(path.name + ".idx.tmp.npz")
+    np.savez(tmp, t=t_idx, offset=off_idx, size=st.st_size,
+             mtime_ns=st.st_mtime_ns, every=every)
+    os.replace(tmp, index_path(path))
+
+    return t_idx, off_idx
+
+
+def load_time_index(path: Path, every: int = INDEX_EVERY) -> tuple[np.ndarray, np.ndarray]:
+    """Índice guardado si sigue siendo válido para el report; si no, lo rehace."""
+    idx = index_path(path)
+    if idx.exists():
+        st = path.stat()
+        with np.load(idx) as z:
+            if int(z["size"]) == st.st_size and int(z["mtime_ns"]) == st.st_mtime_ns:
+                return z["t"], z["offset"]
+    return build_time_index(path, every)
+
+
+def read_window(path: Path, t0: float, t1: float) -> tuple[list, np.ndarray]:
+    """
+    Filas con t0 <= ElapsedDays <= t1 sin cargar el report entero: busca en
+    el índice (búsqueda binaria) y parsea solo los bytes de esa ventana.
+    Útil para ver de cerca los burns de leer_tiempos_burn.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"No se encuentra el report: {path}")
+
+    columns, ncols, data_offset, header = read_header(path)
+    t_idx, off_idx = load_time_index(path)
+
+    # Última entrada con t < t0 (puede haber tiempos repetidos en los burns)
+    i = np.searchsorted(t_idx, t0, side="left") - 1
+    start = int(off_idx[i]) if i >= 0 else data_offset
+
+    # Primera entrada con t > t1
+    j = np.searchsorted(t_idx, t1, side="right")
+    end = int(off_idx[j]) if j < t_idx.size else path.stat().st_size
+
+    rows = _parse_range(path, start, end, ncols, header)
+    mask = (rows[:, 0] >= t0) & (rows[:, 0] <= t1)
+    return columns, rows[mask]
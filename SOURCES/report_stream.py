@@ -0,0 +1,106 @@
+"""
+Lectura incremental ("tail") del ReportFile mientras GMAT lo escribe.
+
+Cada poll() lee solo los bytes nuevos, parsea las líneas completas
+(saltando las cabeceras repetidas) y devuelve las filas nuevas como array.
+Las filas se acumulan, así que al terminar GMAT el report ya está parseado.
+"""
+from pathlib import Path
+import numpy as np
+
+
+def _is_data_line(line: bytes) -> bool:
+    """Una línea de datos empieza por un número; la cabecera por 'Sat.Campo'."""
+    try:
+        float(line.split(None, 1)[0])
+        return True
+    except ValueError:
+        return False
+
+
+class GrowableArray:
+    """Array (n, ncols) que crece por duplicación: añadir filas es O(1) amortizado."""
+
+    def __init__(self, ncols: int | None = None):
+        self.ncols = ncols
+        self._buf = None
+        self._n = 0
+
+    def append(self, rows: np.ndarray):
+        needed = self._n + rows.shape[0]
+        if self._buf is None:
+            self.ncols = rows.shape[1]
+            self._buf = np.empty((max(needed, 1024), self.ncols))
+        elif needed > self._buf.shape[0]:
+            new_buf = np.empty((max(needed, 2 * self._buf.shape[0]), self.ncols))
+            new_buf[:self._n] = self._buf[:self._n]
+            self._buf = new_buf
+        self._buf[self._n:needed] = rows
+        self._n = needed
+
+    def view(self) -> np.ndarray:
+        if self._buf is None:
+            return np.empty((0, self.ncols or 0))
+        return self._buf[:self._n]
+
+    def __len__(self):
+        return self._n
+
+
+class ReportTailer:
+    def __init__(self, path: Path):
+        self.path = path
+        self.columns = None
+        self._offset = 0
+        self._partial = b""
+        self._rows = GrowableArray()
+
+    def poll(self) -> np.ndarray | None:
+        """Filas nuevas desde la última llamada (o None si no hay)."""
+        if not self.path.exists():
+            return None
+
+        with self.path.open("rb") as f:
+            f.seek(self._offset)
+            chunk = f.read()
+        if not chunk:
+            return None
+        self._offset += len(chunk)
+
+        lines = (self._partial + chunk).split(b"\n")
+        # La última línea puede estar a medio escribir
+        self._partial = lines.pop()
+
+        return self._parse(lines)
+
+    def finish(self) -> np.ndarray | None:
+        """Último poll al acabar GMAT, incluida la última línea sin salto."""
+        rows = self.poll()
+        last, self._partial = self._partial, b""
+        tail = self._parse([last])
+        if tail is None:
+            return rows
+        return tail if rows is None else np.vstack([rows, tail])
+
+    def _parse(self, lines: list) -> np.ndarray | None:
+        data_lines = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if _is_data_line(line):
+                data_lines.append(line)
+            elif self.columns is None:
+                self.columns = line.decode("utf-8", errors="replace").split()
+
+        if not data_lines:
+            return None
+
+        ncols = len(data_lines[0].split())
+        rows = np.fromstring(b" ".join(data_lines), sep=" ").reshape(-1, ncols)
+        self._rows.append(rows)
+        return rows
+
+    def data(self) -> np.ndarray:
+        """Todas las filas leídas hasta ahora."""
+        return self._rows.view()
@@ -0,0 +1,78 @@
+"""
+Cola de ejecuciones del pipeline (sin Qt).
+
+Un único consumidor (el hilo del pipeline) saca trabajos con take(); la
+GUI los añade con submit(). La cola está acotada y agrupa peticiones:
+- Si llega una config idéntica a una pendiente o a la que se está
+  ejecutando, no se encola otra vez.
+- Si la cola está llena, se descarta la petición pendiente más antigua:
+  la nueva la sustituye y no se gasta CPU en resultados que se van a
+  sobrescribir.
+"""
+from collections import deque
+import hashlib
+import threading
+
+
+MAX_PENDING = 3
+
+
+def config_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class RunQueue:
+    def __init__(self, maxsize: int = MAX_PENDING):
+        self.maxsize = maxsize
+        self._cond = threading.Condition()
+        self._pending = deque()     # (clave, payload)
+        self._current = None        # clave del trabajo en curso
+        self._closed = False
+
+    def submit(self, key: str, payload) -> str:
+        """Devuelve "encolado", "agrupado" o "sustituido" (si se descartó uno pendiente)."""
+        with self._cond:
+            if key == self._current or any(k == key for k, _ in self._pending):
+                return "agrupado"
+
+            status = "encolado"
+            if len(self._pending) >= self.maxsize:
+                self._pending.popleft()
+                status = "sustituido"
+
+            self._pending.append((key, payload))
+            self._cond.notify()
+            return status
+
+    def take(self):
+        """Siguiente trabajo (bloquea hasta que haya uno); None si la cola se cerró."""
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return None
+            key, payload = self._pending.popleft()
+            self._current = key
+            return payload
+
+    def done(self):
+        with self._cond:
+            self._current = None
+
+    def clear(self) -> int:
+        """Descarta los trabajos pendientes (no el que está en curso)."""
+        with self._cond:
+            n = len(self._pending)
+            self._pending.clear()
+            return n
+
+    def depth(self) -> int:
+        """Pendientes + el que se está ejecutando."""
+        with self._cond:
+            return len(self._pending) + (self._current is not None)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
@@ -0,0 +1,419 @@
+"""
+Barridos paramétricos sobre los campos de datos_guardados.txt.
+
+Un barrido es una config base (parse_gui_txt) y unos parámetros, cada uno
+con su lista de valores:
+
+    {
+      "base": "DATA/input/datos_guardados.txt",
+      "mode": "product",
+      "params": {
+        "IMPULSIVE BURN.Delta V Element 1": {"start": 0.0, "stop": 0.2, "num": 5},
+        "SPACECRAFT.SMA": [7000, 8000, 9000]
+      }
+    }
+
+Los parámetros se escriben "SECCIÓN.Campo", con la sección como en el
+fichero o con su clave de parse_gui_txt ("impulsive_burn.Tiempo burn").
+Valores: lista, {"start", "stop", "num"} (linspace) o {"start", "stop",
+"step"} (stop incluido); en la línea de comandos "a:b:n" o "v1,v2,...".
+"product" recorre todas las combinaciones (forma len1 x len2 x ...) y
+"zip" va emparejando los valores (todas las listas del mismo tamaño).
+
+Cada punto es una copia de la base con esos campos cambiados. Con el
+motor GMAT los scripts salen de ScriptTemplate (solo se sustituyen los
+valores que cambian) y se ejecutan en paralelo; con el nativo cada punto
+se propaga en un proceso del pool, y los que llevan J2 (integración
+numérica) se agrupan en lotes que avanzan juntos (batch_propagator).
+Los resultados se juntan en arrays indexados por las coordenadas del
+barrido (ver run_sweep).
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+from shutil import rmtree
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+
+from SOURCES.Transpiler import DATA_FILE, ScriptTemplate, normalize_config, parse_gui_txt
+from SOURCES.GMAT_exec import run_gmat_job, select_engine
+from SOURCES.batch_propagator import batch_key, batch_method, propagate_configs
+from SOURCES.propagator import force_model, propagate_config
+from SOURCES.report_parser import load_report_array
+
+
+# Secciones de datos_guardados.txt -> claves de parse_gui_txt
+SECTIONS = {
+    "GENERAL": "general",
+    "SPACECRAFT": "spacecraft",
+    "TIEMPO": "time",
+    "PROPAGATE": "propagate",
+    "IMPULSIVE BURN": "impulsive_burn",
+    "IMPULSIVE BURN 2": "impulsive_burn_2",
+    "REPORTFILE": "reportfile",
+}
+
+# ElapsedDays, X, Y, Z, VX, VY, VZ
+N_COLUMNS = 7
+
+# Máximo de puntos nativos consecutivos que se propagan en un mismo lote
+BATCH_SIZE = 32
+
+
+def field_key(name: str, cfg: dict | None = None) -> tuple[str, str]:
+    """'SECCIÓN.Campo' -> (clave de sección, campo). Avisa si el campo no está en `cfg`."""
+    section, sep, key = name.partition(".")
+    if not sep or not key.strip():
+        raise ValueError(f"Parámetro sin sección: {name!r} (se espera 'SECCIÓN.Campo')")
+    section, key = section.strip(), key.strip()
+    section = SECTIONS.get(section.upper(), section.lower())
+    if section not in SECTIONS.values():
+        raise ValueError(f"Sección desconocida en {name!r}: {', '.join(SECTIONS)}")
+    if cfg is not None and key not in cfg.get(section, {}):
+        # Puede ser a propósito (SMA con una base cartesiana) o una errata
+        known = ", ".join(cfg.get(section, {})) or "(vacía)"
+        print(f"⚠ {name!r}: la config base no tiene ese campo, se añade ({section}: {known})")
+    return section, key
+
+
+def parse_values(spec) -> list:
+    """Lista de valores de un parámetro (ver el docstring del módulo)."""
+    if isinstance(spec, str):
+        if ":" in spec:
+            start, stop, num = spec.split(":")
+            return parse_values({"start": float(start), "stop": float(stop), "num": int(num)})
+        return [v.strip() for v in spec.split(",") if v.strip()]
+    if isinstance(spec, dict):
+        start, stop = float(spec["start"]), float(spec["stop"])
+        if "num" in spec:
+            return np.linspace(start, stop, int(spec["num"])).tolist()
+        step = float(spec["step"])
+        n = int(np.floor((stop - start) / step + 1e-9)) + 1
+        return (start + step * np.arange(max(n, 0))).tolist()
+    return list(spec)
+
+
+def format_value(value) -> str:
+    """Valor tal como iría en datos_guardados.txt."""
+    if isinstance(value, (float, np.floating)):
+        return f"{float(value)}"
+    return str(value)
+
+
+def with_fields(cfg: dict, values: dict) -> dict:
+    """
+    Copia de `cfg` con los campos {(sección, campo): valor} cambiados. Las
+    secciones que no cambian se comparten con `cfg` (no se modifican).
+    """
+    out = dict(cfg)
+    for (section, key), value in values.items():
+        if out.get(section) is cfg.get(section):
+            out[section] = dict(cfg.get(section, {}))
+        out[section][key] = format_value(value)
+    return out
+
+
+def expand_sweep(base: dict, params: dict, mode: str = "product") -> tuple[tuple, list]:
+    """
+    Configs de todos los puntos, en orden C (el último parámetro varía más
+    rápido). Devuelve (forma del barrido, lista de configs).
+    """
+    keys = [field_key(name, base) for name in params]
+    values = [parse_values(v) for v in params.values()]
+    if any(not v for v in values):
+        raise ValueError("Hay parámetros sin valores")
+
+    if mode == "product":
+        shape = tuple(len(v) for v in values)
+        combos = itertools.product(*values)
+    elif mode == "zip":
+        sizes = {len(v) for v in values}
+        if len(sizes) != 1:
+            raise ValueError(f"En modo zip todos los parámetros necesitan el mismo nº de valores: {sorted(sizes)}")
+        shape = (sizes.pop(),)
+        combos = zip(*values)
+    else:
+        raise ValueError(f"Modo de barrido desconocido: {mode!r} (product o zip)")
+
+    return shape, [with_fields(base, dict(zip(keys, combo))) for combo in combos]
+
+
+def resample(data: np.ndarray, t_grid: np.ndarray) -> np.ndarray:
+    """
+    Estado (T, 6) de una tabla del report en los instantes `t_grid` [días],
+    interpolado linealmente; NaN fuera del intervalo propagado.
+    """
+    t = data[:, 0]
+    return np.column_stack([
+        np.interp(t_grid, t, data[:, k], left=np.nan, right=np.nan) for k in range(1, N_COLUMNS)
+    ])
+
+
+# ---------- ejecución de los puntos ----------
+
+def _native_point(cfg: dict, t_grid: np.ndarray):
+    _, data = propagate_config(cfg)
+    return data.shape[0], data[-1], resample(data, t_grid)
+
+
+def _batch_key(cfg: dict):
+    """batch_key de los puntos que se integran en lote (con J2 y un integrador soportado); si no, None."""
+    p = normalize_config(cfg)
+    try:
+        if force_model(p)["j2"] and batch_method(p["integrator"]):
+            return batch_key(p)
+    except ValueError:
+        pass   # integrador no soportado: el error sale en su punto
+    return None
+
+
+def _native_batch(cfgs: list, t_grid: np.ndarray) -> list:
+    """
+    Resultados de un lote de _native_jobs: (pasos aceptados, estado final
+    (7,), estado en t_grid (T, 6)) de cada punto. Los puntos con J2 se
+    integran con propagate_configs aunque vayan solos, parando en t_grid,
+    así que su resultado no depende del lote en que caigan; el resto usa
+    propagate_config (Kepler) y devuelve las filas del report.
+    """
+    if len(cfgs) == 1 and _batch_key(cfgs[0]) is None:
+        return [_native_point(cfgs[0], t_grid)]
+
+    dur = normalize_config(cfgs[0])["dur_days"]
+    m = int(np.searchsorted(t_grid, dur, side="right"))
+    t_out = t_grid[:m]
+    if not t_out.size or t_out[-1] < dur:
+        t_out = np.append(t_out, dur)
+    _, states, steps = propagate_configs(cfgs, t_out=t_out, return_steps=True)
+
+    results = []
+    for s, n_steps in zip(states, steps):
+        history = np.full((len(t_grid), N_COLUMNS - 1), np.nan)
+        history[:m] = s[:m]
+        results.append((int(n_steps), np.concatenate([[dur], s[-1]]), history))
+    return results
+
+
+def _native_jobs(points, size: int = BATCH_SIZE):
+    """
+    Agrupa los puntos nativos consecutivos que se pueden propagar juntos:
+    los que llevan J2 (sin solución analítica) con el mismo batch_key, de
+    `size` en `size`. El resto va de uno en uno. Devuelve ([índices], [configs]).
+    """
+    chunk, key = [], None
+    for i, cfg in points:
+        k = _batch_key(cfg)
+        if chunk and (k is None or k != key or len(chunk) >= size):
+            yield [i for i, _ in chunk], [c for _, c in chunk]
+            chunk = []
+        chunk.append((i, cfg))
+        key = k
+        if k is None:
+            yield [i], [cfg]
+            chunk = []
+    if chunk:
+        yield [i for i, _ in chunk], [c for _, c in chunk]
+
+
+def _gmat_point(script_path: Path, workdir: Path, t_grid: np.ndarray, keep_report: bool):
+    try:
+        report = run_gmat_job(script_path, workdir)
+        _, data = load_report_array(report, use_sidecar=False)
+    finally:
+        if not keep_report:
+            rmtree(workdir, ignore_errors=True)
+    return data.shape[0], data[-1], resample(data, t_grid)
+
+
+def iter_points(cfgs, t_grid: np.ndarray, engine: str, out_dir: Path,
+                workers: int | None = None, keep_reports: bool = False,
+                timings: dict | None = None):
+    """
+    Ejecuta las configs en paralelo y va devolviendo (i, resultado) según
+    terminan, con resultado = (filas, última fila del report (7,), estado
+    en t_grid (T, 6)) o la excepción del punto; en los puntos nativos con
+    J2 "filas" son los pasos aceptados del integrador. `cfgs` puede ser cualquier
+    iterable (p.ej. un generador): se consume a medida que hay hueco y no
+    hay más de 2 x workers trabajos en marcha, así que la memoria no crece
+    con el nº de puntos.
+
+    Con motor nativo los puntos con J2 consecutivos y compatibles se
+    propagan en lotes de hasta BATCH_SIZE (_native_jobs); cada punto del
+    lote lleva su propio paso, así que el resultado es el mismo que solo.
+
+    Con motor GMAT los scripts salen de ScriptTemplate (con la primera
+    config como base) y cada punto corre en out_dir/puntos/p_<i>/, que se
+    borra al terminar salvo con keep_reports. En `timings` se acumula el
+    tiempo de generar los scripts.
+    """
+    workers = workers or os.cpu_count() or 1
+    timings = {} if timings is None else timings
+    template = None
+
+    if engine == "native":
+        pool = ProcessPoolExecutor(max_workers=workers)
+    else:
+        # Cada trabajo ya es un proceso GmatConsole: basta un pool de hilos
+        pool = ThreadPoolExecutor(max_workers=workers)
+        timings.setdefault("transpile", 0.0)
+
+    def submit(i, cfg):
+        nonlocal template
+        if engine == "native":
+            return pool.submit(_native_batch, cfg, t_grid)   # cfg: configs del lote
+        t0 = time.perf_counter()
+        if template is None:
+            template = ScriptTemplate(cfg)
+        workdir = out_dir / "puntos" / f"p_{i:05d}"
+        workdir.mkdir(parents=True, exist_ok=True)
+        script = template.write(cfg, workdir / "punto.script")
+        timings["transpile"] = round(timings["transpile"] + time.perf_counter() - t0, 4)
+        timings["scripts_rebuilt"] = template.rebuilt
+        return pool.submit(_gmat_point, script, workdir, t_grid, keep_reports)
+
+    # Trabajos ([índices], arg): un lote de configs (nativo) o una config
+    if engine == "native":
+        jobs = _native_jobs(enumerate(cfgs))
+    else:
+        jobs = (([i], cfg) for i, cfg in enumerate(cfgs))
+
+    pending = {}
+    with pool:
+        while True:
+            for indices, arg in itertools.islice(jobs, 2 * workers - len(pending)):
+                pending[submit(indices[0], arg)] = indices
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                indices = pending.pop(f)
+                try:
+                    results = f.result()
+                    if engine != "native":
+                        results = [results]
+                except Exception as e:
+                    results = [e] * len(indices)
+                yield from zip(indices, results)
+
+    if engine != "native" and not keep_reports:
+        try:
+            (out_dir / "puntos").rmdir()
+        except OSError:
+            pass
+
+
+def run_points(cfgs: list, t_grid: np.ndarray, engine: str, out_dir: Path,
+               workers: int | None = None, keep_reports: bool = False,
+               progress=None) -> dict:
+    """
+    Ejecuta las configs en paralelo (iter_points) y devuelve arrays por
+    punto: rows (N,) (filas del report o pasos aceptados, ver
+    iter_points), final (N, 7) (última fila del report), history
+    (N, T, 6) (estado en t_grid) y status (N,) ("ok" o el error).
+    `progress(hechos, total)` se llama al terminar cada punto.
+    """
+    n, T = len(cfgs), len(t_grid)
+    rows = np.zeros(n, dtype=np.int64)
+    final = np.full((n, N_COLUMNS), np.nan)
+    history = np.full((n, T, N_COLUMNS - 1), np.nan)
+    status = ["ok"] * n
+    timings = {}
+
+    t0 = time.perf_counter()
+    for done, (i, result) in enumerate(
+            iter_points(cfgs, t_grid, engine, out_dir, workers, keep_reports, timings), 1):
+        if isinstance(result, Exception):
+            status[i] = f"{type(result).__name__}: {result}"
+        else:
+            rows[i], final[i], history[i] = result
+        if progress is not None:
+            progress(done, n)
+    timings["run"] = round(time.perf_counter() - t0 - timings.get("transpile", 0.0), 4)
+
+    return {"rows": rows, "final": final, "history": history,
+            "status": np.array(status), "timings": timings}
+
+
+# ---------- barrido completo ----------
+
+def load_spec(path: Path) -> dict:
+    spec = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not spec.get("params"):
+        raise ValueError(f"{path}: el barrido no tiene parámetros ('params')")
+    return spec
+
+
+def run_sweep(spec: dict, out_dir: Path, engine: str | None = None,
+              workers: int | None = None, samples: int = 200,
+              keep_reports: bool = False, progress=None) -> dict:
+    """
+    Ejecuta el barrido `spec` (ver el docstring del módulo) y guarda en
+    `out_dir`:
+
+    - sweep.npz: t [días] (T,), final (*forma, 7), history (*forma, T, 6),
+      rows y status (*forma), y por parámetro i param_i (nombre) y
+      values_i (sus valores a lo largo de su eje; en zip, todos en el eje 0);
+    - summary.json: especificación, forma, motor, tiempos y errores.
+
+    Devuelve el resumen con los arrays ya con la forma del barrido.
+    """
+    t_start = time.perf_counter()
+    base_path = Path(spec.get("base") or DATA_FILE)
+    base = parse_gui_txt(base_path)
+    mode = spec.get("mode", "product")
+    params = spec["params"]
+
+    shape, cfgs = expand_sweep(base, params, mode)
+    engine = select_engine(normalize_config(base), engine)
+
+    # Rejilla común de tiempos hasta la misión más larga (las fechas
+    # también se pueden barrer: una normalización por sección TIEMPO distinta)
+    durations = {}
+    for cfg in cfgs:
+        key = tuple(cfg["time"].items())
+        if key not in durations:
+            durations[key] = normalize_config(cfg)["dur_days"]
+    t_grid = np.linspace(0.0, max(durations.values()), samples)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    print(f"▶ Barrido {mode} {'x'.join(map(str, shape))} = {len(cfgs)} puntos, motor {engine}")
+    res = run_points(cfgs, t_grid, engine, out_dir, workers, keep_reports, progress)
+
+    arrays = {
+        "t": t_grid,
+        "final": res["final"].reshape(shape + (N_COLUMNS,)),
+        "history": res["history"].reshape(shape + (samples, N_COLUMNS - 1)),
+        "rows": res["rows"].reshape(shape),
+        "status": res["status"].reshape(shape),
+    }
+    for i, (name, values) in enumerate(params.items()):
+        arrays[f"param_{i}"] = np.array(name)
+        values = parse_values(values)
+        try:
+            arrays[f"values_{i}"] = np.array(values, dtype=float)
+        except ValueError:
+            arrays[f"values_{i}"] = np.array([str(v) for v in values])
+    np.savez(out_dir / "sweep.npz", **arrays)
+
+    errors = [
+        {"index": list(map(int, idx)), "error": str(err)}
+        for idx, err in np.ndenumerate(arrays["status"]) if err != "ok"
+    ]
+    summary = {
+        "base": str(base_path),
+        "mode": mode,
+        "params": params,
+        "shape": list(shape),
+        "engine": engine,
+        "samples": samples,
+        "n_points": len(cfgs),
+        "n_error": len(errors),
+        "timings": dict(res["timings"], total=round(time.perf_counter() - t_start, 4)),
+        "errors": errors,
+    }
+    (out_dir / "summary.json").write_text(
+        json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    return dict(summary, **arrays)
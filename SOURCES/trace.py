@@ -0,0 +1,332 @@
+"""
+Instrumentación por etapas del pipeline.
+
+    with span("make_plots", rows=len(df)) as sp:
+        ...
+        sp.set(png=5)
+
+    @traced("load_report", rows=True)
+    def load_report(path): ...
+
+Cada etapa registra tiempo de pared, tiempo de CPU (propio y de los
+subprocesos que terminaron durante la etapa, p.ej. GMAT), pico de RSS
+durante la etapa (rss_peak_mb, ver _PeakTracker), variación del RSS entre
+el principio y el final (rss_delta_mb), bytes leídos/escritos y los
+atributos que se le pasen (filas, etc.).
+
+Salida, según la variable de entorno AM1_TRACE:
+- sin definir: solo en memoria (records()), sin coste de E/S.
+- "-": una línea JSON por etapa en stdout.
+- ruta terminada en .json: fichero de Chrome trace (chrome://tracing,
+  Perfetto). Se puede abrir aunque el proceso no haya terminado.
+- cualquier otra ruta: JSON lines.
+
+AM1_PROFILE=<etapa> activa cProfile solo en esa etapa: el perfil se
+guarda en DATA/output/profile_<etapa>.prof y se imprime un resumen.
+"""
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+
+from SOURCES.utils import OUTPUT_DIR
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+
+TRACE_ENV = "AM1_TRACE"
+PROFILE_ENV = "AM1_PROFILE"
+MAX_RECORDS = 1000
+# Periodo de muestreo del RSS cuando no se puede usar VmHWM [s]
+RSS_SAMPLE_INTERVAL = 0.01
+
+_records = []
+_lock = threading.Lock()
+
+
+# ---------- medidas del proceso ----------
+
+def _io_bytes() -> tuple[int | None, int | None]:
+    """Bytes leídos/escritos por el proceso (incluye la caché de páginas)."""
+    if psutil is not None:
+        try:
+            io_ = psutil.Process().io_counters()
+            return (getattr(io_, "read_chars", io_.read_bytes),
+                    getattr(io_, "write_chars", io_.write_bytes))
+        except (psutil.Error, AttributeError):
+            pass
+    try:
+        fields = dict(
+            line.split(":", 1) for line in Path("/proc/self/io").read_text().splitlines()
+        )
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def _rss_mb() -> float | None:
+    """RSS actual del proceso (no el pico de toda su vida, que es ru_maxrss)."""
+    if psutil is not None:
+        try:
+            return psutil.Process().memory_info().rss / (1024 * 1024)
+        except psutil.Error:
+            pass
+    try:
+        resident = int(Path("/proc/self/statm").read_text().split()[1])
+        return resident * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, IndexError, ValueError, AttributeError):
+        return None
+
+
+def _hwm_mb() -> float | None:
+    """Pico de RSS (VmHWM) desde el último reinicio; solo Linux."""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except (OSError, IndexError, ValueError):
+        pass
+    return None
+
+
+def _reset_hwm() -> bool:
+    """Reinicia VmHWM al RSS actual (Linux >= 4.0). Afecta también a ru_maxrss."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+class _PeakTracker:
+    """
+    Pico de RSS de cada etapa abierta. En Linux se reinicia VmHWM al
+    abrir una etapa y se lee al cerrarla; antes de cada reinicio se anota
+    el VmHWM en las etapas ya abiertas, así que las etapas anidadas no les
+    borran el pico. Donde no hay VmHWM, un hilo muestrea el RSS cada
+    RSS_SAMPLE_INTERVAL mientras haya alguna etapa abierta (un pico más
+    corto que el periodo puede no verse).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open = {}        # id de la etapa -> pico [MB]
+        self._next_id = 0
+        self._hwm = None       # None: sin probar todavía
+        self._sampler = None
+
+    def _fold(self, value):
+        if value is None:
+            return
+        for key, peak in self._open.items():
+            self._open[key] = max(peak, value)
+
+    def start(self, rss: float | None) -> int:
+        with self._lock:
+            if self._hwm is not False:
+                self._fold(_hwm_mb())
+                self._hwm = _reset_hwm() and _hwm_mb() is not None
+            key = self._next_id
+            self._next_id += 1
+            self._open[key] = rss if rss is not None else 0.0
+            if not self._hwm and (self._sampler is None or not self._sampler.is_alive()):
+                self._sampler = threading.Thread(target=self._sample, name="trace-rss", daemon=True)
+                self._sampler.start()
+            return key
+
+    def stop(self, key: int, rss: float | None) -> float | None:
+        with self._lock:
+            if self._hwm:
+                self._fold(_hwm_mb())
+            self._fold(rss)
+            peak = self._open.pop(key)
+        return peak or None
+
+    def _sample(self):
+        while True:
+            rss = _rss_mb()
+            with self._lock:
+                if not self._open:
+                    self._sampler = None
+                    return
+                self._fold(rss)
+            time.sleep(RSS_SAMPLE_INTERVAL)
+
+
+_peaks = _PeakTracker()
+
+
+def _children_cpu() -> float | None:
+    """CPU de los subprocesos ya terminados (GMAT, pools de procesos)."""
+    if resource is None:
+        return None
+    ru = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return ru.ru_utime + ru.ru_stime
+
+
+def _snapshot() -> dict:
+    read, written = _io_bytes()
+    return {
+        "wall": time.perf_counter(),
+        "cpu": time.process_time(),
+        "cpu_children": _children_cpu(),
+        "read": read,
+        "written": written,
+        "rss": _rss_mb(),
+    }
+
+
+def _delta(a, b):
+    return None if a is None or b is None else b - a
+
+
+# ---------- salida ----------
+
+def _emit(rec: dict):
+    with _lock:
+        _records.append(rec)
+        del _records[:-MAX_RECORDS]
+
+    target = os.environ.get(TRACE_ENV, "").strip()
+    if not target:
+        return
+    if target == "-":
+        print(json.dumps(rec, ensure_ascii=False))
+        return
+
+    path = Path(target)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if path.suffix == ".json":
+        # Formato "JSON Array" de Chrome trace: el "]" final es opcional,
+        # así que se puede ir añadiendo eventos sin reescribir el fichero
+        event = {
+            "name": rec["name"],
+            "ph": "X",
+            "ts": rec["ts"] * 1e6,
+            "dur": rec["wall_s"] * 1e6,
+            "pid": rec["pid"],
+            "tid": rec["tid"],
+            "args": {k: v for k, v in rec.items() if k not in ("name", "ts", "pid", "tid")},
+        }
+        line = json.dumps(event, ensure_ascii=False) + ",\n"
+        with _lock, path.open("a", encoding="utf-8") as f:
+            if f.tell() == 0:
+                f.write("[\n")
+            f.write(line)
+    else:
+        with _lock, path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+def records() -> list:
+    """Últimas etapas registradas en este proceso."""
+    with _lock:
+        return list(_records)
+
+
+# ---------- API ----------
+
+class Span:
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = dict(attrs)
+
+    def set(self, **attrs):
+        """Añade atributos (p.ej. rows=...) que se guardan al cerrar la etapa."""
+        self.attrs.update(attrs)
+
+
+def _dump_profile(name: str, prof: cProfile.Profile):
+    out_dir = Path(os.environ.get("AM1_PROFILE_DIR", OUTPUT_DIR))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / f"profile_{name}.prof"
+    prof.dump_stats(out)
+
+    buf = io.StringIO()
+    pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(20)
+    print(f"cProfile de '{name}' guardado en: {out}")
+    print(buf.getvalue())
+
+
+@contextmanager
+def span(name: str, **attrs):
+    sp = Span(name, attrs)
+
+    prof = None
+    if os.environ.get(PROFILE_ENV, "").strip() == name:
+        prof = cProfile.Profile()
+
+    ts = time.time()
+    start = _snapshot()
+    peak_key = _peaks.start(start["rss"])
+    if prof is not None:
+        prof.enable()
+    error = None
+    try:
+        yield sp
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if prof is not None:
+            prof.disable()
+        end = _snapshot()
+        rss_peak = _peaks.stop(peak_key, end["rss"])
+
+        rec = {
+            "name": name,
+            "ts": ts,
+            "wall_s": round(end["wall"] - start["wall"], 6),
+            "cpu_s": round(end["cpu"] - start["cpu"], 6),
+            "cpu_children_s": _delta(start["cpu_children"], end["cpu_children"]),
+            "rss_peak_mb": rss_peak,
+            "rss_delta_mb": _delta(start["rss"], end["rss"]),
+            "read_bytes": _delta(start["read"], end["read"]),
+            "written_bytes": _delta(start["written"], end["written"]),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if error is not None:
+            rec["error"] = error
+        rec.update(sp.attrs)
+        _emit(rec)
+
+        if prof is not None:
+            _dump_profile(name, prof)
+
+
+def traced(name: str | None = None, rows: bool = False):
+    """
+    Decorador: ejecuta la función dentro de span(name). Con rows=True se
+    guarda además len() del resultado (p.ej. filas del DataFrame).
+    """
+    def deco(fn):
+        stage = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage) as sp:
+                result = fn(*args, **kwargs)
+                if rows and result is not None:
+                    try:
+                        sp.set(rows=len(result))
+                    except TypeError:
+                        pass
+                return result
+        return wrapper
+    return deco
@@ -19,6 +19,9 @@ INPUT_DIR  = DATA_DIR / "input"
 GMAT_DIR   = DATA_DIR / "gmat"
 OUTPUT_DIR = DATA_DIR / "output"
 PLOTS_DIR  = DATA_DIR / "plots"
+CACHE_DIR  = DATA_DIR / "cache"
+SCRATCH_DIR = DATA_DIR / "scratch"
+BATCH_DIR   = DATA_DIR / "batch"
 
 
 def ensure_dirs():
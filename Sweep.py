@@ -0,0 +1,89 @@
+"""
+Barrido paramétrico sin interfaz gráfica (ver SOURCES/sweep.py).
+
+Cada punto del barrido es datos_guardados.txt con uno o varios campos
+cambiados; se ejecutan todos en paralelo y los resultados quedan en
+
+    DATA/batch/sweep_<fecha>/{sweep.npz, summary.json}
+
+(y puntos/p_<i>/ con el script y el report de cada punto con --keep-reports).
+
+Uso (desde la raíz del proyecto):
+    python Sweep.py barrido.json -j 4
+    python Sweep.py -p "IMPULSIVE BURN.Delta V Element 1=0:0.2:5" -p "SPACECRAFT.SMA=7000,8000,9000"
+    python Sweep.py -p "SPACECRAFT.INC=0:90:4" -p "SPACECRAFT.RAAN=0:270:4" --zip --engine native
+
+barrido.json:
+    {"base": "DATA/input/datos_guardados.txt", "mode": "product",
+     "params": {"IMPULSIVE BURN.Tiempo burn": {"start": 0.1, "stop": 0.9, "num": 9}}}
+"""
+from datetime import datetime
+from pathlib import Path
+import argparse
+import multiprocessing
+import os
+import sys
+
+from SOURCES.sweep import load_spec, run_sweep
+from SOURCES.utils import BATCH_DIR
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Barrido paramétrico sobre los campos de datos_guardados.txt.")
+    parser.add_argument("spec", nargs="?", type=Path, default=None,
+                        help="fichero JSON con base, mode y params")
+    parser.add_argument("-p", "--param", action="append", default=[], metavar="SECCIÓN.Campo=VALORES",
+                        help="parámetro a barrer: 'a:b:n' (linspace) o 'v1,v2,...' (se puede repetir)")
+    parser.add_argument("--base", type=Path, default=None,
+                        help="config base (por defecto la del JSON o DATA/input/datos_guardados.txt)")
+    parser.add_argument("--zip", action="store_true",
+                        help="emparejar los valores en vez de todas las combinaciones")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="nº de puntos en paralelo")
+    parser.add_argument("-o", "--out", type=Path, default=None,
+                        help="carpeta de salida (por defecto DATA/batch/sweep_<fecha>)")
+    parser.add_argument("--engine", choices=["auto", "analytic", "gmat", "native"], default=None,
+                        help="motor a usar (por defecto AM1_ENGINE o auto)")
+    parser.add_argument("--samples", type=int, default=200,
+                        help="instantes de la rejilla común de tiempos")
+    parser.add_argument("--keep-reports", action="store_true",
+                        help="conservar el script y el report de cada punto (motor GMAT)")
+    args = parser.parse_args(argv)
+
+    try:
+        spec = load_spec(args.spec) if args.spec else {"params": {}}
+        for item in args.param:
+            name, sep, values = item.partition("=")
+            if not sep:
+                raise ValueError(f"Parámetro sin valores: {item!r} (SECCIÓN.Campo=VALORES)")
+            spec["params"][name.strip()] = values.strip()
+        if args.base:
+            spec["base"] = str(args.base)
+        if args.zip:
+            spec["mode"] = "zip"
+        if not spec["params"]:
+            parser.error("indica un fichero de barrido o al menos un -p")
+
+        out_dir = args.out or BATCH_DIR / datetime.now().strftime("sweep_%Y%m%d_%H%M%S")
+
+        def progress(done, total):
+            if done == total or done % max(1, total // 10) == 0:
+                print(f"  {done}/{total}")
+
+        summary = run_sweep(spec, out_dir, args.engine, max(1, args.workers),
+                            args.samples, args.keep_reports, progress)
+    except (OSError, ValueError) as e:
+        print("❌", e)
+        return 2
+
+    for err in summary["errors"][:10]:
+        print(f"❌ punto {tuple(err['index'])}: {err['error']}")
+    print(f"Resumen: {summary['n_points'] - summary['n_error']} ok, {summary['n_error']} con error, "
+          f"{summary['timings']['total']:.2f} s -> {out_dir / 'sweep.npz'}")
+    return 0 if summary["n_error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
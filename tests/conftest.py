@@ -0,0 +1,38 @@
+"""
+Utilidades comunes de los tests (python -m pytest -q desde la raíz).
+
+Los tests no necesitan GMAT: las configs salen de
+BENCHMARKS/synthetic.write_datos_guardados y GMAT se sustituye por los
+falsos de BENCHMARKS/fake_gmat cuando hace falta.
+"""
+from pathlib import Path
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "BENCHMARKS"))
+
+from synthetic import write_datos_guardados  # noqa: E402
+
+
+@pytest.fixture
+def datos(tmp_path):
+    """Fábrica de datos_guardados.txt: datos({sección: {clave: valor}}) -> ruta."""
+    counter = iter(range(10**6))
+
+    def make(overrides=None, name=None):
+        path = tmp_path / (name or f"datos_{next(counter)}.txt")
+        return write_datos_guardados(path, overrides)
+    return make
+
+
+@pytest.fixture
+def config(datos):
+    """Fábrica de configs de parse_gui_txt: config({sección: {clave: valor}}) -> dict."""
+    from SOURCES.Transpiler import parse_gui_txt
+
+    def make(overrides=None):
+        return parse_gui_txt(datos(overrides))
+    return make
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from SOURCES.Transpiler import normalize_config
+from SOURCES.batch_propagator import propagate_batch, propagate_configs
+from SOURCES.propagator import BODIES, propagate_segment
+from SOURCES.sweep import _native_batch, with_fields
+
+# J2 con una precisión moderada: rápido y con pasos distintos por nave
+J2 = {"PROPAGATE": {"Precision (accuracy)": "1e-6"}}
+
+
+def _variants(base, n):
+    return [with_fields(base, {("spacecraft", "x"): 7000.0 + 40.0 * i,
+                               ("spacecraft", "vz"): 0.2 * i}) for i in range(n)]
+
+
+def test_batch_member_independent_of_batch(config):
+    cfgs = _variants(config(J2), 5)
+    t_out = np.linspace(0.0, 1.0, 50)
+    _, together, steps = propagate_configs(cfgs, t_out=t_out, return_steps=True)
+    for i, cfg in enumerate(cfgs):
+        _, alone, alone_steps = propagate_configs([cfg], t_out=t_out, return_steps=True)
+        assert alone_steps[0] == steps[i]
+        np.testing.assert_allclose(together[i], alone[0], rtol=0, atol=1e-6)
+    # Cada nave lleva su propio paso
+    assert len(set(steps.tolist())) > 1
+
+
+def test_sweep_result_independent_of_chunking(config):
+    cfgs = _variants(config(J2), 6)
+    t_grid = np.linspace(0.0, normalize_config(cfgs[0])["dur_days"], 40)
+    whole = _native_batch(cfgs, t_grid)
+    split = _native_batch(cfgs[:2], t_grid) + [_native_batch([c], t_grid)[0] for c in cfgs[2:]]
+    for (rows_a, final_a, hist_a), (rows_b, final_b, hist_b) in zip(whole, split):
+        assert rows_a == rows_b
+        np.testing.assert_allclose(final_a, final_b, rtol=0, atol=1e-6)
+        np.testing.assert_allclose(hist_a, hist_b, rtol=0, atol=1e-6)
+
+
+def test_adaptive_matches_propagate_segment():
+    fm = {"mu": BODIES["Earth"]["mu"], "radius": BODIES["Earth"]["radius"], "j2": 1.08263e-3}
+    settings = {"integrator": "RungeKutta89", "init_step": 60.0, "accuracy": 1e-10,
+                "min_step": 1e-3, "max_step": 300.0, "max_step_attempts": 50}
+    state0 = np.array([7000.0, 0.0, 0.0, 0.0, 7.5, 1.0])
+    _, states = propagate_segment(state0, 0.0, 10800.0, fm, settings)
+    out = propagate_batch(state0[None], [0.0, 0.125], fm, method="adaptive", step=60.0,
+                          accuracy=1e-10, min_step=1e-3, max_step=300.0)
+    np.testing.assert_allclose(out[0, -1], states[-1], rtol=0, atol=1e-4)
+
+
+def test_fixed_dv_per_member_and_burn_at_output():
+    fm = {"mu": BODIES["Earth"]["mu"], "radius": BODIES["Earth"]["radius"], "j2": 0.0}
+    states = np.array([[7000.0, 0.0, 0.0, 0.0, 7.5, 0.0]] * 2)
+    dv = np.array([[0.0, 0.0, 0.0], [0.1, 0.0, 0.0]])
+    out = propagate_batch(states, [0.0, 0.1], fm, method="fixed", step=30.0,
+                          burns=[(0.0, "MJ2000Eq", dv)])
+    # El burn en un instante de salida se guarda ya aplicado
+    np.testing.assert_allclose(out[:, 0, 3:] - states[:, 3:], dv)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        propagate_batch(np.zeros((1, 6)), [0.0], {}, method="rk45")
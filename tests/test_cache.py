@@ -0,0 +1,123 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from SOURCES import cache as cache_mod
+from SOURCES.cache import REPORT_NAME, ResultCache, cache_key
+
+
+def _report(tmp_path, name="report.txt", size=100):
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_put_get_restore_only_given_plots(tmp_path):
+    c = ResultCache(tmp_path / "cache", max_bytes=10**6)
+    plots = tmp_path / "plots"
+    plots.mkdir()
+    (plots / "a.png").write_bytes(b"a")
+    (plots / "viejo.png").write_bytes(b"b")
+    key = cache_key({"x": 1}, "script", "v1")
+
+    assert c.get(key) is None
+    c.put(key, _report(tmp_path), [plots / "a.png", plots / "no_existe.png"])
+    entry = c.get(key)
+    assert sorted(p.name for p in entry.iterdir()) == [REPORT_NAME, "a.png"]
+
+    out = tmp_path / "out"
+    assert c.restore(entry, out / "r.txt", out / "plots")
+    assert (out / "r.txt").read_bytes() == b"x" * 100
+    assert [p.name for p in (out / "plots").iterdir()] == ["a.png"]
+    assert c.stats()["hits"] == 1 and c.stats()["misses"] == 1
+
+
+def test_lru_eviction(tmp_path):
+    c = ResultCache(tmp_path / "cache", max_bytes=250)
+    for i in range(3):
+        c.put(f"k{i}", _report(tmp_path, size=100))
+        time.sleep(0.01)
+    assert c.get("k0") is None
+    assert c.get("k1") is not None and c.get("k2") is not None
+
+
+def test_dead_owner_lock_is_broken(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_mod, "LOCK_CHECK", 0.01)
+    c = ResultCache(tmp_path / "cache")
+    c.root.mkdir(parents=True)
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    c.lock_path.write_text(f"{proc.pid} abc")
+
+    t0 = time.monotonic()
+    c.put("k", _report(tmp_path))
+    assert time.monotonic() - t0 < 5
+    assert not c.lock_path.exists()
+    assert c.get("k") is not None
+
+
+def test_live_owner_lock_is_respected(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_mod, "LOCK_CHECK", 0.01)
+    monkeypatch.setattr(cache_mod, "LOCK_TIMEOUT", 0.05)
+    c = ResultCache(tmp_path / "cache")
+    c.root.mkdir(parents=True)
+    c.lock_path.write_text(f"{os.getpid()} ajeno")
+
+    done = threading.Event()
+    worker = threading.Thread(target=lambda: (c.put("k", _report(tmp_path)), done.set()))
+    worker.start()
+    time.sleep(0.5)
+    # Pasado LOCK_TIMEOUT se sigue esperando: el dueño está vivo
+    assert not done.is_set()
+    assert c.lock_path.read_text().endswith("ajeno")
+
+    c.lock_path.unlink()
+    worker.join(timeout=5)
+    assert done.is_set()
+
+
+def test_stale_lock_is_broken(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_mod, "LOCK_CHECK", 0.01)
+    monkeypatch.setattr(cache_mod, "LOCK_STALE", 0.1)
+    c = ResultCache(tmp_path / "cache")
+    c.root.mkdir(parents=True)
+    c.lock_path.write_text(f"{os.getpid()} colgado")
+    time.sleep(0.2)
+    c.put("k", _report(tmp_path))
+    assert c.get("k") is not None
+
+
+def test_only_own_lock_is_released(tmp_path):
+    c = ResultCache(tmp_path / "cache")
+    with c._locked():
+        # Otro proceso rompió el bloqueo y tiene ahora el suyo
+        c.lock_path.write_text("999999 otro")
+    assert c.lock_path.read_text() == "999999 otro"
+
+
+def _worker(root, n, offset):
+    c = ResultCache(root, max_bytes=10**7)
+    report = root.parent / f"r_{offset}.txt"
+    report.write_bytes(b"y" * 10)
+    for i in range(n):
+        key = f"k{offset + i}"
+        if c.get(key) is None:
+            c.put(key, report)
+
+
+def test_concurrent_processes_share_index(tmp_path):
+    root = tmp_path / "cache"
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_worker, args=(root, 10, 100 * j)) for j in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+    st = ResultCache(root).stats()
+    assert st["entries"] == 40
+    assert st["misses"] == 40 and st["hits"] == 0
+    assert not (root / "index.lock").exists()
@@ -0,0 +1,38 @@
+import numpy as np
+
+from SOURCES.decimation import apsis_indices, orbit_indices, series_indices
+
+
+def _orbit(n, revs=400, burn_rows=(0.3, 0.6)):
+    """Órbita elíptica de muchas vueltas con dos filas en el instante de cada burn."""
+    t = np.linspace(0.0, 1.0, n)
+    for tb in burn_rows:
+        i = np.searchsorted(t, tb)
+        t = np.insert(t, i, t[i])
+    ang = 2.0 * np.pi * revs * t
+    r = 7000.0 * (1.0 + 0.1 * np.cos(ang))
+    points = np.column_stack([r * np.cos(ang), r * np.sin(ang)])
+    return t, points, r
+
+
+def test_burn_rows_survive_apsis_cap():
+    t, points, r = _orbit(200_000)
+    burns = (t[np.searchsorted(t, 0.3)], t[np.searchsorted(t, 0.6)])
+    # Hay más ápsides (800) que el tope: aun así salen todas las filas de los burns
+    assert len(apsis_indices(r, 1000)) > 500
+
+    for idx in (series_indices(t, [r], burns, r, max_points=1000),
+                orbit_indices(points, t, burns, r, max_points=1000)):
+        assert idx[0] == 0 and idx[-1] == len(t) - 1
+        assert np.all(np.diff(idx) > 0)
+        for tb in burns:
+            same = np.flatnonzero(t == tb)
+            assert len(same) == 2
+            assert np.isin(same, idx).all()
+        assert len(idx) < 3000
+
+
+def test_short_series_untouched():
+    t = np.linspace(0.0, 1.0, 50)
+    np.testing.assert_array_equal(series_indices(t, [t], (0.5,)), np.arange(50))
+    assert len(series_indices(np.empty(0), [np.empty(0)])) == 0
@@ -0,0 +1,132 @@
+"""
+Backend gmatpy (SOURCES/gmat_api.py) con el sustituto
+BENCHMARKS/fake_gmat/gmatpy.py: el worker se arranca de verdad (spawn) y
+las llamadas a LoadScript/RunScript se leen de AM1_FAKE_GMAT_LOG.
+"""
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from SOURCES import gmat_api
+from SOURCES.GMAT_exec import run_gmat
+from SOURCES.Transpiler import build_gmat_script, parse_gui_txt
+
+from conftest import ROOT
+
+FAKE_DIR = ROOT / "BENCHMARKS" / "fake_gmat"
+
+
+@pytest.fixture
+def fake_gmat(monkeypatch, tmp_path):
+    """gmatpy y GmatConsole falsos; devuelve el fichero con las llamadas del worker."""
+    log = tmp_path / "gmatpy.log"
+    monkeypatch.setenv(gmat_api.PATH_ENV, str(FAKE_DIR))
+    monkeypatch.delenv(gmat_api.MODULE_ENV, raising=False)
+    monkeypatch.setenv(gmat_api.BACKEND_ENV, "api")
+    monkeypatch.setenv("AM1_GMAT", str(FAKE_DIR / "GmatConsole.py"))
+    monkeypatch.setenv("AM1_FAKE_GMAT_LOG", str(log))
+    for name in ("AM1_FAKE_GMAT_ROWS", "AM1_FAKE_GMAT_RATE", "AM1_FAKE_GMAT_LATENCY"):
+        monkeypatch.delenv(name, raising=False)
+    # Motor compartido y fallo recordado de cada test, no de los anteriores
+    monkeypatch.setattr(gmat_api, "_engine", None)
+    monkeypatch.setattr(gmat_api, "_failed", None)
+    yield log
+    if gmat_api._engine is not None:
+        gmat_api._engine.close()
+
+
+@pytest.fixture
+def script(datos, tmp_path):
+    def make(overrides=None, name="caso.script"):
+        path = tmp_path / name
+        build_gmat_script(parse_gui_txt(datos(overrides)), path)
+        return path
+    return make
+
+
+def _calls(log):
+    return log.read_text(encoding="utf-8").splitlines() if log.exists() else []
+
+
+def test_warm_engine_skips_reload_of_same_script(fake_gmat, script, tmp_path):
+    path = script()
+    with gmat_api.GmatEngine() as engine:
+        first = gmat_api.run_gmat_api(path, tmp_path / "r1.txt", engine)
+        second = gmat_api.run_gmat_api(path, tmp_path / "r2.txt", engine)
+        calls = _calls(fake_gmat)
+        assert sum(c.startswith("LoadScript") for c in calls) == 1
+        assert calls.count("RunScript") == 2
+        pd.testing.assert_frame_equal(first, second)
+
+        # Otro script: sí se vuelve a cargar
+        other = script({"SPACECRAFT": {"x": "7100"}}, name="otro.script")
+        gmat_api.run_gmat_api(other, tmp_path / "r3.txt", engine)
+        assert sum(c.startswith("LoadScript") for c in _calls(fake_gmat)) == 2
+
+    assert len(first) > 2 and first.shape[1] == 7
+    # El report copiado queda con su sidecar
+    assert (tmp_path / "r1.txt").exists()
+
+
+def test_falls_back_to_console_when_import_fails(fake_gmat, monkeypatch, script, tmp_path):
+    path = script()
+    api_df = run_gmat(path, tmp_path / "api.txt")
+    gmat_api._engine.close()
+    monkeypatch.setattr(gmat_api, "_engine", None)
+
+    monkeypatch.setenv(gmat_api.MODULE_ENV, "no_existe_gmatpy")
+    fake_gmat.unlink()
+    df = run_gmat(path, tmp_path / "console.txt")
+
+    assert gmat_api._failed and "no_existe_gmatpy" in gmat_api._failed
+    assert not gmat_api.api_enabled()
+    assert _calls(fake_gmat) == []
+    # Mismo resultado por los dos caminos, y los dos devuelven la tabla
+    assert isinstance(df, pd.DataFrame)
+    pd.testing.assert_frame_equal(df, api_df)
+
+
+def test_cancel_kills_engine_process(fake_gmat, monkeypatch, script, tmp_path):
+    pytest.importorskip("PySide6")
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    from Main import PipelineExecutor
+    from SOURCES.pipeline import PipelineCancelled
+
+    # Report lento: 100 filas por segundo
+    monkeypatch.setenv("AM1_FAKE_GMAT_ROWS", "100000")
+    monkeypatch.setenv("AM1_FAKE_GMAT_RATE", "100")
+    path = script()
+    executor = PipelineExecutor()
+    outcome = {}
+
+    def run():
+        try:
+            executor._run_gmat_api(path, tmp_path / "report.txt")
+        except BaseException as e:
+            outcome["error"] = e
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    deadline = time.monotonic() + 60
+    while "RunScript" not in _calls(fake_gmat) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    engine = gmat_api._engine
+    assert engine.poll() is None
+    proc = engine._proc
+
+    executor.cancel()
+    worker.join(timeout=30)
+
+    assert not worker.is_alive()
+    assert isinstance(outcome.get("error"), PipelineCancelled)
+    assert not proc.is_alive()
+    assert engine.poll() == 0
+
+    # El motor vuelve a arrancar en la siguiente ejecución
+    monkeypatch.setenv("AM1_FAKE_GMAT_ROWS", "50")
+    monkeypatch.delenv("AM1_FAKE_GMAT_RATE")
+    executor._cancel.clear()
+    df = executor._run_gmat_api(path, tmp_path / "report.txt")
+    assert len(df) > 50
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from SOURCES.Transpiler import field_value
+from SOURCES.montecarlo import (PERCENTILE_METHOD, PERCENTILES, RunningMoments,
+                                StreamingHistogram, sample_config)
+
+
+def _feed(hist, samples):
+    for x in samples:
+        hist.update(x)
+    return hist
+
+
+def _exact(samples, q=PERCENTILES):
+    return np.nanpercentile(samples, q, axis=0, method=PERCENTILE_METHOD)
+
+
+def test_percentiles_within_one_bin():
+    rng = np.random.default_rng(1)
+    # Tres instantes: normal, cola larga y un rango que crece después del warmup
+    samples = np.column_stack([
+        rng.normal(10.0, 2.0, 3000),
+        rng.lognormal(0.0, 1.0, 3000),
+        rng.uniform(0.0, 1.0, 3000) * np.linspace(1.0, 4.0, 3000),
+    ])
+    hist = _feed(StreamingHistogram(3, bins=500, warmup=50), samples)
+    assert hist.clipped.shape == (3,)
+    assert not hist.clipped.any()
+    assert hist.widened[2] > 0
+
+    got = hist.percentiles(PERCENTILES)
+    assert got.shape == (len(PERCENTILES), 3)
+    assert np.all(np.abs(got - _exact(samples)) <= hist.width)
+
+
+def test_exact_before_warmup_and_nan_start():
+    rng = np.random.default_rng(2)
+    samples = rng.normal(size=(300, 2))
+    # El segundo instante es NaN en las primeras muestras (propagación más corta)
+    samples[:200, 1] = np.nan
+    hist = _feed(StreamingHistogram(2, bins=200, warmup=150), samples)
+    assert hist.ready.tolist() == [True, False]
+
+    got = hist.percentiles([5, 50, 95])
+    np.testing.assert_allclose(got[:, 1], _exact(samples[:, 1], [5, 50, 95]))
+    # El rango del segundo instante sale de sus propios datos, no de los NaN
+    hist.update(np.array([0.0, 0.0]))
+    for x in samples[200:250, 1]:
+        hist.update(np.array([0.0, x]))
+    assert hist.ready[1]
+    assert hist.lo[1] > -10.0
+
+
+def test_values_outside_widen_limit_are_clipped():
+    hist = _feed(StreamingHistogram(1, bins=10, warmup=5, max_widen=1),
+                 [np.array([v]) for v in np.linspace(0.0, 1.0, 5)])
+    hist.update(np.array([1e6]))
+    assert hist.clipped.tolist() == [1]
+    # Cuenta en el cubo del extremo
+    assert hist.counts.sum() == 6 and hist.counts[0, -1] >= 1
+    assert hist.max[0] == 1e6
+
+
+def test_odd_bins():
+    with pytest.raises(ValueError):
+        StreamingHistogram(1, bins=11)
+
+
+def test_running_moments_match_numpy():
+    rng = np.random.default_rng(3)
+    samples = rng.normal(size=(200, 4, 3)) * [1.0, 2.0, 3.0]
+    samples[:20, 3] = np.nan
+    moments = RunningMoments(4, 3)
+    for x in samples:
+        moments.update(x)
+
+    assert moments.n.tolist() == [200, 200, 200, 180]
+    np.testing.assert_allclose(moments.mean, np.nanmean(samples, axis=0))
+    for t in range(4):
+        ok = samples[:, t][np.all(np.isfinite(samples[:, t]), axis=1)]
+        np.testing.assert_allclose(moments.cov[t], np.cov(ok, rowvar=False))
+    np.testing.assert_allclose(moments.std, np.nanstd(samples, axis=0, ddof=1))
+
+
+def test_sample_config(config):
+    base = config({"SPACECRAFT": {"x": ""}})
+    spec = {"seed": 7,
+            "fields": {"spacecraft.x": {"sigma": 1.0}, "spacecraft.vy": {"uniform": [-0.1, 0.1]}},
+            "burns": {"magnitude_sigma": 0.01, "pointing_sigma_deg": 1.0}}
+    a = sample_config(base, spec, 0)
+    assert a == sample_config(base, spec, 0)
+    assert a != sample_config(base, spec, 1)
+
+    # Un campo vacío se perturba alrededor de su default (x = 7000), no de 0
+    assert abs(field_value(a, "spacecraft", "x") - 7000.0) < 10.0
+    assert abs(field_value(a, "spacecraft", "vy") - 7.5) <= 0.1
+    # Los burns mantienen su dirección salvo el error de apuntado
+    dv = [field_value(a, "impulsive_burn", f"Delta V Element {i}") for i in (1, 2, 3)]
+    assert dv[0] == pytest.approx(0.1, rel=0.1) and abs(dv[1]) < 0.01
+
+    # Quitar el error de los burns no cambia las muestras de los campos
+    fields_only = sample_config(base, dict(spec, burns={}), 0)
+    assert fields_only["spacecraft"] == a["spacecraft"]
@@ -0,0 +1,43 @@
+import pytest
+
+from SOURCES.cache import ResultCache
+from SOURCES.pipeline import build_pipeline
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return {
+        "report": tmp_path / "out" / "DefaultReportFile.txt",
+        "plots_dir": tmp_path / "plots",
+        "state_path": tmp_path / "out" / "pipeline_state.json",
+        "script_path": tmp_path / "out" / "script.script",
+    }
+
+
+def _ran(results):
+    return {r["stage"] for r in results if r["ran"]}
+
+
+def test_result_cached_even_if_plots_stage_is_skipped(datos, paths, tmp_path, monkeypatch):
+    monkeypatch.setenv("MPLBACKEND", "Agg")
+    cache = ResultCache(tmp_path / "cache")
+    two_body = {"PROPAGATE": {"Grado": "0", "Modelo gravitatorio": "None"}}
+    data_file = datos(two_body, name="datos_guardados.txt")
+
+    first = build_pipeline("native", data_file=data_file, cache=cache, **paths).run()
+    assert {"run", "parse", "plots"} <= _ran(first)
+    assert cache.stats()["entries"] == 1
+
+    # Caché vacía y la misma config con otro texto (se repite "run"): el
+    # report sale igual, así que "plots" no se repite
+    cache.clear()
+    data_file.write_text(data_file.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    second = build_pipeline("native", data_file=data_file, cache=cache, **paths).run()
+    assert "run" in _ran(second) and "plots" not in _ran(second)
+    assert cache.stats()["entries"] == 1
+
+    # La misma config otra vez, sin el estado del pipeline: sale de la caché
+    paths["state_path"].unlink()
+    paths["report"].unlink()
+    build_pipeline("native", data_file=data_file, cache=cache, **paths).run()
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from SOURCES.kepler import kepler_segment, propagate_kepler
+from SOURCES.propagator import (BODIES, _dopri_step, _rk4_step, compare_kepler_numerical,
+                                propagate_config, propagate_segment)
+
+MU = BODIES["Earth"]["mu"]
+TWO_BODY = {"mu": MU, "radius": BODIES["Earth"]["radius"], "j2": 0.0}
+SETTINGS = {"integrator": "RungeKutta89", "init_step": 60.0, "accuracy": 1e-12,
+            "min_step": 1e-3, "max_step": 2700.0, "max_step_attempts": 50}
+
+ELLIPTIC = np.array([7000.0, 0.0, 0.0, 0.0, 8.0, 1.0])
+HYPERBOLIC = np.array([7000.0, 0.0, 0.0, 0.0, 11.5, 0.5])
+
+
+def _energy(states):
+    states = np.atleast_2d(states)
+    r = np.linalg.norm(states[:, :3], axis=1)
+    return 0.5 * np.sum(states[:, 3:] ** 2, axis=1) - MU / r
+
+
+def _period(state):
+    r = np.linalg.norm(state[:3])
+    a = 1.0 / (2.0 / r - state[3:] @ state[3:] / MU)
+    return 2.0 * np.pi * np.sqrt(a**3 / MU)
+
+
+@pytest.mark.parametrize("state0", [ELLIPTIC, HYPERBOLIC], ids=["eliptica", "hiperbolica"])
+def test_kepler_matches_dopri(state0):
+    err = compare_kepler_numerical(state0, 20000.0, TWO_BODY, SETTINGS)
+    assert err["n_points"] > 10
+    assert err["max_pos_err_km"] < 1e-3
+    assert err["max_vel_err_kms"] < 1e-6
+
+
+def test_kepler_is_periodic_and_conserves_energy():
+    period = _period(ELLIPTIC)
+    states = propagate_kepler(ELLIPTIC, np.array([0.0, 0.3 * period, period, 3 * period]), MU)
+    np.testing.assert_allclose(states[0], ELLIPTIC, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(states[2], ELLIPTIC, rtol=0, atol=1e-6)
+    np.testing.assert_allclose(states[3], ELLIPTIC, rtol=0, atol=1e-6)
+    np.testing.assert_allclose(_energy(states), _energy(ELLIPTIC)[0], rtol=1e-12)
+
+
+def test_kepler_segment_samples_and_ends_at_t1():
+    times, states = kepler_segment(ELLIPTIC, 100.0, 1000.0, MU, 300.0)
+    assert times == [100.0, 400.0, 700.0, 1000.0]
+    np.testing.assert_array_equal(states[0], ELLIPTIC)
+    np.testing.assert_allclose(states[-1], propagate_kepler(ELLIPTIC, 900.0, MU)[0])
+
+
+def test_propagate_segment_ends_at_t1_with_accepted_steps():
+    times, states = propagate_segment(ELLIPTIC, 0.0, 5000.0, TWO_BODY, SETTINGS)
+    assert times[0] == 0.0 and times[-1] == pytest.approx(5000.0, abs=1e-9)
+    assert np.all(np.diff(times) > 0)
+    assert np.all(np.diff(times) <= SETTINGS["max_step"])
+    np.testing.assert_allclose(_energy(np.array(states)), _energy(ELLIPTIC)[0], rtol=1e-9)
+
+
+def test_dopri_step_error_estimate():
+    exact = propagate_kepler(ELLIPTIC, 60.0, MU)[0]
+    y5, err = _dopri_step(ELLIPTIC, 60.0, TWO_BODY)
+    assert np.linalg.norm(y5[:3] - exact[:3]) < 1e-6
+    # El estimador (diferencia con el orden 4) acota el error real
+    assert np.linalg.norm(err[:3]) >= np.linalg.norm(y5[:3] - exact[:3])
+    # Orden 5: dividir el paso entre 2 reduce el error ~32 veces
+    _, err_half = _dopri_step(ELLIPTIC, 30.0, TWO_BODY)
+    assert np.linalg.norm(err[:3]) / np.linalg.norm(err_half[:3]) > 16
+
+
+def test_rk4_fixed_step():
+    settings = dict(SETTINGS, integrator="RungeKutta4", init_step=10.0)
+    times, states = propagate_segment(ELLIPTIC, 0.0, 1005.0, TWO_BODY, settings)
+    assert len(times) == 102 and times[-1] == pytest.approx(1005.0)
+    exact = propagate_kepler(ELLIPTIC, 1005.0, MU)[0]
+    np.testing.assert_allclose(states[-1][:3], exact[:3], rtol=0, atol=1e-5)
+    np.testing.assert_allclose(_rk4_step(ELLIPTIC, 10.0, TWO_BODY), states[1])
+
+
+def test_unsupported_integrator():
+    with pytest.raises(ValueError):
+        propagate_segment(ELLIPTIC, 0.0, 60.0, TWO_BODY, dict(SETTINGS, integrator="Euler"))
+
+
+def test_analytic_and_numerical_configs_agree(config):
+    cfg = config({"PROPAGATE": {"Grado": "0", "Modelo gravitatorio": "None",
+                                "Precision (accuracy)": "1e-12"}})
+    columns, numeric = propagate_config(cfg, analytic=False)
+    _, analytic = propagate_config(cfg, analytic=True)
+    assert columns[0] == "Sat.ElapsedDays" and analytic.shape[1] == 7
+    # Mismo final aunque los instantes intermedios sean distintos
+    assert analytic[-1, 0] == numeric[-1, 0] == pytest.approx(1.0)
+    np.testing.assert_allclose(analytic[-1, 1:4], numeric[-1, 1:4], rtol=0, atol=1e-2)
+    # Filas de cada burn: mismo instante y posición, antes y después del ΔV
+    for t_burn in (0.3, 0.6):
+        rows = analytic[np.isclose(analytic[:, 0], t_burn)]
+        assert len(rows) >= 2
+        np.testing.assert_allclose(rows[-1, 1:4], rows[0, 1:4])
+        assert np.linalg.norm(rows[-1, 4:] - rows[0, 4:]) > 0.01
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from SOURCES.propagator import propagate_config, write_report
+from SOURCES.report_parser import (INDEX_EVERY, index_path, load_report_array, parse_report,
+                                   parse_report_parallel, read_window, sidecar_paths)
+
+from synthetic import COLUMNS, write_synthetic_report
+
+
+@pytest.fixture
+def report(tmp_path):
+    """Report con la cabecera repetida a mitad de fichero (como GMAT)."""
+    path = tmp_path / "report.txt"
+    write_synthetic_report(path, 25_000, header_every=5_000)
+    return path
+
+
+@pytest.fixture
+def orbit_report(config, tmp_path):
+    """Report de una misión de dos cuerpos con burns: tiempos ordenados y repetidos."""
+    cfg = config({"PROPAGATE": {"Grado": "0", "Modelo gravitatorio": "None"}})
+    columns, data = propagate_config(cfg, sample_step=20.0)
+    path = tmp_path / "orbit.txt"
+    write_report(path, columns, data)
+    return path, columns, data
+
+
+def test_parse_drops_repeated_headers(report):
+    columns, data = parse_report(report)
+    assert columns == COLUMNS
+    assert data.shape == (25_000, 7)
+    assert np.all(np.isfinite(data))
+
+
+def test_parallel_equals_serial(report):
+    columns, serial = parse_report(report, chunk_bytes=64 * 1024)
+    # Trozos pequeños: varios por worker y cabeceras a mitad de trozo
+    par_columns, parallel = parse_report_parallel(report, workers=2, chunk_bytes=64 * 1024)
+    assert par_columns == columns
+    np.testing.assert_array_equal(parallel, serial)
+    np.testing.assert_array_equal(parse_report(report)[1], serial)
+
+
+def test_sidecar_is_reused_until_report_changes(report):
+    columns, data = load_report_array(report)
+    npy, meta = sidecar_paths(report)
+    assert npy.exists() and meta.exists()
+
+    again_columns, again = load_report_array(report)
+    assert isinstance(again, np.memmap)
+    assert again_columns == columns
+    np.testing.assert_array_equal(again, data)
+
+    # El report cambia: el sidecar ya no vale y se regenera
+    with report.open("ab") as f:
+        f.write(("".join(f"{v:<26}" for v in [1.0] * 7) + "\n").encode())
+    _, grown = load_report_array(report)
+    assert not isinstance(grown, np.memmap)
+    assert len(grown) == len(data) + 1
+
+
+def test_read_window_equals_slice(orbit_report):
+    path, columns, data = orbit_report
+    assert len(data) > 2 * INDEX_EVERY
+    full_columns, full = parse_report(path)
+    assert full_columns == columns
+
+    for t0, t1 in [(0.0, 0.05), (0.29, 0.31), (0.3, 0.3), (0.55, 1.0), (2.0, 3.0)]:
+        window_columns, window = read_window(path, t0, t1)
+        assert window_columns == columns
+        expected = full[(full[:, 0] >= t0) & (full[:, 0] <= t1)]
+        np.testing.assert_array_equal(window, expected)
+    assert index_path(path).exists()
+
+    # Las filas del burn (mismo instante) salen todas
+    _, burn = read_window(path, 0.3, 0.3)
+    assert len(burn) >= 2
+
+
+def test_missing_report(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        parse_report(tmp_path / "no_existe.txt")
+    with pytest.raises(FileNotFoundError):
+        read_window(tmp_path / "no_existe.txt", 0.0, 1.0)
@@ -0,0 +1,67 @@
+import threading
+
+from SOURCES.run_queue import RunQueue, config_key
+
+
+def test_duplicates_are_coalesced():
+    q = RunQueue(maxsize=3)
+    assert q.submit("a", 1) == "encolado"
+    assert q.submit("a", 2) == "agrupado"
+    assert q.depth() == 1
+
+    # La que está en curso también agrupa
+    assert q.take() == 1
+    assert q.submit("a", 3) == "agrupado"
+    assert q.depth() == 1
+    q.done()
+    assert q.depth() == 0
+    assert q.submit("a", 4) == "encolado"
+
+
+def test_full_queue_evicts_oldest_pending():
+    q = RunQueue(maxsize=2)
+    assert q.submit("a", "A") == "encolado"
+    assert q.submit("b", "B") == "encolado"
+    assert q.submit("c", "C") == "sustituido"
+    assert q.depth() == 2
+    assert [q.take(), q.take()] == ["B", "C"]
+
+
+def test_clear_keeps_current():
+    q = RunQueue()
+    for key in "abc":
+        q.submit(key, key.upper())
+    assert q.take() == "A"
+    assert q.clear() == 2
+    assert q.depth() == 1
+    assert q.submit("a", "A") == "agrupado"
+    q.done()
+    assert q.depth() == 0
+
+
+def test_take_blocks_until_submit_and_close_wakes_it():
+    q = RunQueue()
+    got = []
+    taken = threading.Event()
+
+    def consume():
+        got.append(q.take())
+        taken.set()
+        got.append(q.take())
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    q.submit("a", "A")
+    assert taken.wait(timeout=5)
+    q.close()
+    consumer.join(timeout=5)
+    assert not consumer.is_alive()
+    assert got == ["A", None]
+    # Cerrada: lo pendiente se descarta
+    q.submit("b", "B")
+    assert q.take() is None
+
+
+def test_config_key():
+    assert config_key("x: 1") == config_key("x: 1")
+    assert config_key("x: 1") != config_key("x: 2")
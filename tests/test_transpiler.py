@@ -0,0 +1,56 @@
+import pytest
+
+from SOURCES.Transpiler import ScriptTemplate, build_gmat_script, field_value
+from SOURCES.sweep import with_fields
+
+
+def _built(cfg, tmp_path):
+    path = tmp_path / "build.script"
+    build_gmat_script(cfg, path)
+    return path.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("values", [
+    {},
+    {("spacecraft", "x"): 7123.456},
+    {("spacecraft", "vy"): 7.61, ("spacecraft", "vz"): -0.25},
+    {("impulsive_burn", "Delta V Element 1"): 0.125},
+    {("impulsive_burn_2", "Delta V Element 3"): 0.01},
+    {("propagate", "Precision (accuracy)"): 1e-9, ("propagate", "Paso maximo"): 600},
+], ids=["base", "x", "v", "dv1", "dv2", "pasos"])
+def test_direct_fields_fill_slots(config, tmp_path, values):
+    base = config()
+    template = ScriptTemplate(base)
+    cfg = with_fields(base, values)
+    assert template.render(cfg) == _built(cfg, tmp_path)
+    assert (template.rendered, template.rebuilt) == (1, 0)
+
+
+@pytest.mark.parametrize("values", [
+    {("impulsive_burn", "Tiempo burn"): 0.4},
+    {("time", "Fecha final"): "03/01/2030"},
+    # Un burn que se desactiva cambia la secuencia de la misión
+    {("impulsive_burn_2", "Delta V Element 1"): 0.0},
+], ids=["tiempo_burn", "fecha", "burn_off"])
+def test_other_fields_rebuild(config, tmp_path, values):
+    base = config()
+    template = ScriptTemplate(base)
+    cfg = with_fields(base, values)
+    assert template.render(cfg) == _built(cfg, tmp_path)
+    assert (template.rendered, template.rebuilt) == (0, 1)
+
+
+def test_write_matches_build(config, tmp_path):
+    base = config({"SPACECRAFT": {"vz": ""}})
+    cfg = with_fields(base, {("spacecraft", "x"): 6900.0})
+    path = ScriptTemplate(base).write(cfg, tmp_path / "t.script")
+    assert path.read_text(encoding="utf-8") == _built(cfg, tmp_path)
+
+
+def test_field_value_defaults(config):
+    cfg = config({"SPACECRAFT": {"x": "", "vy": "abc", "vz": "1.5"}})
+    assert field_value(cfg, "spacecraft", "x") == 7000.0
+    assert field_value(cfg, "spacecraft", "vy") == 7.5
+    assert field_value(cfg, "spacecraft", "vz") == 1.5
+    assert field_value(cfg, "impulsive_burn", "Tiempo burn") == 0.3
+    assert field_value(cfg, "no_existe", "campo") == 0.0